@@ -60,6 +60,11 @@ export default function Home() {
             setIsParsing(false);
             wsService.disconnect();
           }, 500);
+        } else if (message.type === 'busy') {
+          toast.error(`${message.message}. Please try again in ${message.retryAfter}s.`);
+          setAppState('landing');
+          setIsParsing(false);
+          wsService.disconnect();
         } else if (message.type === 'error') {
           toast.error(`Error: ${message.message}`);
           console.error('Backend error:', message.message);
@@ -146,6 +151,10 @@ export default function Home() {
           setJobKeywords(data.jobKeywords);
           setAppState('results');
           wsService.disconnect();
+        } else if (message.type === 'busy') {
+          toast.error(`${message.message}. Please try again in ${message.retryAfter}s.`);
+          setAppState('job-description');
+          wsService.disconnect();
         } else if (message.type === 'error') {
           toast.error(`Error: ${message.message}`);
           console.error('Backend error:', message.message);
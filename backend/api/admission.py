@@ -0,0 +1,165 @@
+import os
+import math
+import asyncio
+import threading
+from collections import Counter
+from typing import Optional
+from fastapi import WebSocket, WebSocketDisconnect
+from api.upload_limits import MAX_UPLOAD_BYTES
+
+# Per-process limits; with serve.py each worker process enforces its own
+MAX_WS_SESSIONS = int(os.getenv('MAX_WS_SESSIONS', 200))
+MAX_WS_SESSIONS_PER_CLIENT = int(os.getenv('MAX_WS_SESSIONS_PER_CLIENT', 4))
+MAX_ACTIVE_REQUESTS = int(os.getenv('MAX_ACTIVE_REQUESTS', 16))
+
+# Addresses of reverse proxies whose X-Forwarded-For header is trusted (comma-separated).
+# Without one, a client could pick a new address per connection and escape the per-client cap
+TRUSTED_PROXIES = {ip.strip() for ip in os.getenv('TRUSTED_PROXIES', '').split(',') if ip.strip()}
+
+# Seconds a socket may sit without sending a request before it is closed
+WS_IDLE_TIMEOUT = float(os.getenv('WS_IDLE_TIMEOUT', 300))
+
+# Seconds a single frame may take to reach a client before it counts as stalled
+WS_SEND_TIMEOUT = float(os.getenv('WS_SEND_TIMEOUT', 15))
+
+# Close code for refused sessions (RFC 6455 "Try Again Later")
+TRY_AGAIN_LATER = 1013
+
+def websocket_server_settings() -> dict:
+    """uvicorn WebSocket settings: heartbeat pings and bounded inbound buffers"""
+    return {
+        # Protocol-level pings detect dead peers that never send a close frame
+        "ws_ping_interval": float(os.getenv("WS_PING_INTERVAL", 20)),
+        "ws_ping_timeout": float(os.getenv("WS_PING_TIMEOUT", 20)),
+        # Largest frame: a base64-encoded upload plus the JSON envelope
+        "ws_max_size": MAX_UPLOAD_BYTES * 4 // 3 + 64 * 1024,
+        # Inbound frames buffered per connection before reads apply backpressure
+        "ws_max_queue": 4,
+    }
+
+def busy_message(message: str, retry_after: int) -> dict:
+    return {"type": "busy", "message": message, "retryAfter": retry_after}
+
+class AdmissionController:
+    """Admission control for WebSocket sessions and the requests they run
+
+    Sessions are capped per process and per client address, and at most
+    `max_active_requests` parse/optimize requests run at once. Work over the
+    limit is refused immediately with a "busy" message and a retryAfter
+    estimate instead of being queued, so admitted requests keep the latency
+    of a lightly loaded server.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_WS_SESSIONS,
+        max_sessions_per_client: int = MAX_WS_SESSIONS_PER_CLIENT,
+        max_active_requests: int = MAX_ACTIVE_REQUESTS
+    ):
+        self.max_sessions = max_sessions
+        self.max_sessions_per_client = max_sessions_per_client
+        self.max_active_requests = max_active_requests
+        self._lock = threading.Lock()
+        self._sessions = Counter()
+        self._active_requests = 0
+        self._rejected = 0
+        self._avg_request_seconds = 10.0  # Prior until real requests have been timed
+
+    @staticmethod
+    def client_id(websocket: WebSocket) -> str:
+        """Client address: the peer, or the address a trusted proxy forwarded for it"""
+        peer = websocket.client.host if websocket.client else 'unknown'
+        forwarded = websocket.headers.get('x-forwarded-for')
+        if peer not in TRUSTED_PROXIES or not forwarded:
+            return peer
+        # Each proxy appends the address it received from, so the last untrusted hop is the client
+        for address in reversed([hop.strip() for hop in forwarded.split(',')]):
+            if address and address not in TRUSTED_PROXIES:
+                return address
+        return peer
+
+    def open_session(self, client: str) -> Optional[str]:
+        """Register a session; returns the reason it was refused, or None if admitted"""
+        with self._lock:
+            if sum(self._sessions.values()) >= self.max_sessions:
+                self._rejected += 1
+                return "Server is at its connection limit"
+            if self._sessions[client] >= self.max_sessions_per_client:
+                self._rejected += 1
+                return "Too many open connections from your address"
+            self._sessions[client] += 1
+            return None
+
+    def close_session(self, client: str):
+        with self._lock:
+            self._sessions[client] -= 1
+            if self._sessions[client] <= 0:
+                del self._sessions[client]
+
+    def start_request(self) -> bool:
+        with self._lock:
+            if self._active_requests >= self.max_active_requests:
+                self._rejected += 1
+                return False
+            self._active_requests += 1
+            return True
+
+    def finish_request(self, seconds: float):
+        with self._lock:
+            self._active_requests -= 1
+            # Exponential moving average of request duration, for retryAfter
+            self._avg_request_seconds = 0.8 * self._avg_request_seconds + 0.2 * seconds
+
+    def retry_after(self) -> int:
+        """Seconds until a request slot is likely to free up"""
+        with self._lock:
+            # Active requests finish spread over one average duration
+            seconds = self._avg_request_seconds / max(1, self.max_active_requests)
+        return max(1, min(60, math.ceil(seconds)))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": sum(self._sessions.values()),
+                "maxSessions": self.max_sessions,
+                "activeRequests": self._active_requests,
+                "maxActiveRequests": self.max_active_requests,
+                "rejected": self._rejected,
+                "avgRequestSeconds": round(self._avg_request_seconds, 2),
+            }
+
+# Shared by both WebSocket endpoints of this process
+admission = AdmissionController()
+
+class SendTimeoutMiddleware:
+    """Bound how long a WebSocket send may wait on a slow client
+
+    Server transports only buffer up to their write high-water mark and then
+    make `send` wait, so a client that stops reading would otherwise hold its
+    request slot (and the result payload) indefinitely. A send that takes
+    longer than `timeout` marks the connection stalled: it and every later
+    send raise WebSocketDisconnect, which ends the session.
+    """
+
+    def __init__(self, app, timeout: float = WS_SEND_TIMEOUT):
+        self.app = app
+        self.timeout = timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "websocket":
+            return await self.app(scope, receive, send)
+
+        stalled = False
+
+        async def bounded_send(message):
+            nonlocal stalled
+            if stalled:
+                raise WebSocketDisconnect(1006)
+            try:
+                await asyncio.wait_for(send(message), self.timeout)
+            except asyncio.TimeoutError:
+                stalled = True
+                print(f"⚠️ WebSocket send stalled for {self.timeout}s, dropping slow client")
+                raise WebSocketDisconnect(1006)
+
+        await self.app(scope, receive, bounded_send)
@@ -1,93 +1,295 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from services.parser_service import FileParserService
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Header, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from services.parser_service import FileParserService, STORED_PARSE_SOURCES
+from services.completeness import analyze_completeness
 from services.ai_service import AIService
-from models.schemas import OptimizeRequest, OptimizeResponse
+from services.model_router import route_stats
+from services.token_planner import plan_stats
+from services.job_analysis_service import job_description_hash
+from services.export_service import ExportService, RenderedDocument, content_disposition
+from services.history_store import history_store, file_hash, resume_hash, load_history, save_history, HISTORY_KINDS
+from api.admission import admission
+from utils.profiling import profile_request, profile_stage, profiling_requested, load_profile
+from models.schemas import OptimizeRequest, OptimizeResponse, ParseResponse, AnalyzeJobRequest, JobAnalysis, CoverLetterVariants, CoverLetterVariantsRequest, HistoryRecords, ExportRequest, BulkExportRequest
 
 router = APIRouter()
 
 # Initialize services (these will be created once when the module loads)
 parser_service = FileParserService()
 ai_service = AIService()
+export_service = ExportService()
 
-@router.post("/api/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
-    """Parse uploaded resume file into JSON"""
-    try:
-        content = await file.read()
-        content_type = file.content_type
+@router.post("/api/parse-resume", response_model=ParseResponse)
+async def parse_resume(
+    file: UploadFile = File(...),
+    session_id: Optional[str] = Header(None, alias="X-Session-Id"),
+    refresh: bool = Query(False),
+    profile: Optional[str] = Query(None),
+    profile_header: Optional[str] = Header(None, alias="X-Profile")
+):
+    """Parse uploaded resume file into JSON
 
-        resume, extracted_text = parser_service.parse_file(content, content_type)
+    `?profile=1` (or an `X-Profile: 1` header) profiles the request; the
+    profile ID comes back in the X-Profile-Id response header. `?refresh=1`
+    parses again instead of returning the session's stored result.
+    """
+    async with profile_request('parse', profiling_requested(profile or profile_header)) as profiling:
+        headers = _profile_headers(profiling)
+        try:
+            # The same document was parsed for this session before: return that result
+            document_hash = await asyncio.to_thread(file_hash, file.file) if session_id else None
+            previous = None if refresh else await load_history(session_id, 'parse', file_hash=document_hash)
+            if previous:
+                return Response(content=previous, media_type="application/json", headers=headers)
 
-        return {
-            "resume": resume.model_dump(),
-            "extractedText": extracted_text,
-            "warnings": _detect_data_loss(resume, extracted_text)
-        }
+            # The upload is already spooled (to disk past 1 MB) and size-capped by
+            # UploadLimitMiddleware; hand the parser the file instead of a bytes copy
+            file.file.seek(0)
+            resume, extracted_text, source = await parser_service.parse_file(file.file, file.content_type, refresh=refresh)
 
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to parse resume: {str(e)}")
+            with profile_stage('completeness'):
+                completeness = analyze_completeness(resume, extracted_text)
 
-def _detect_data_loss(resume, extracted_text: str) -> list[str]:
-    """Detect potential data loss during parsing"""
-    warnings = []
+            # Serialize once with pydantic-core rather than via jsonable_encoder
+            with profile_stage('serialize'):
+                payload = ParseResponse.model_construct(
+                    resume=resume,
+                    extractedText=extracted_text,
+                    warnings=[issue.message for issue in completeness.issues],
+                    completeness=completeness
+                ).model_dump_json()
+            if source in STORED_PARSE_SOURCES:
+                await save_history(session_id, 'parse', payload, file_hash=document_hash, resume_hash=resume_hash(resume))
+            return Response(content=payload, media_type="application/json", headers=headers)
 
-    # Count bullet points in original text
-    bullet_count = extracted_text.count('•') + extracted_text.count('-')
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to parse resume: {str(e)}", headers=headers)
 
-    # Count description items in parsed resume (use attribute access for Pydantic models)
-    try:
-        parsed_bullets = sum(len(exp.description) for exp in resume.experience if hasattr(exp, 'description') and exp.description)
-    except Exception as e:
-        print(f"Warning: Could not count parsed bullets: {e}")
-        parsed_bullets = 0
+@router.post("/api/optimize", response_model=OptimizeResponse)
+async def optimize_resume(
+    request: OptimizeRequest,
+    session_id: Optional[str] = Header(None, alias="X-Session-Id"),
+    profile: Optional[str] = Query(None),
+    profile_header: Optional[str] = Header(None, alias="X-Profile")
+):
+    """Optimize resume (non-WebSocket version for fallback); profiled like /api/parse-resume"""
+    async with profile_request('optimize', profiling_requested(profile or profile_header)) as profiling:
+        headers = _profile_headers(profiling)
+        try:
+            # Incremental reuse only applies to a result optimized for the same job description
+            incremental = bool(request.previousResume) and ai_service.can_optimize_incrementally(
+                request.previousOptimizedResume, request.jobDescription
+            )
+            if incremental:
+                # Incremental mode: only re-optimize what changed since the previous run
+                optimized_resume, keywords = await ai_service.optimize_resume_incremental(
+                    request.resume,
+                    request.jobDescription,
+                    request.previousResume,
+                    request.previousOptimizedResume
+                )
+            else:
+                optimized_resume, keywords = await ai_service.optimize_resume(
+                    request.resume,
+                    request.jobDescription
+                )
 
-    if bullet_count > parsed_bullets * 1.5 and bullet_count > 5:
-        warnings.append(f"⚠️ Possible data loss: Found {bullet_count} bullet points in original but only {parsed_bullets} parsed")
+            variants = None
+            if incremental and request.previousCoverLetter:
+                # The previous letter only still fits when the resume was re-optimized incrementally
+                cover_letter = request.previousCoverLetter
+            else:
+                cover_letter, variants = await ai_service.generate_cover_letters(
+                    request.resume,
+                    request.jobDescription,
+                    request.jobTitle or "the position",
+                    request.company or "your company",
+                    tones=request.coverLetterTones
+                )
+
+            with profile_stage('serialize'):
+                payload = OptimizeResponse.model_construct(
+                    optimizedResume=optimized_resume,
+                    coverLetter=cover_letter,
+                    jobKeywords=keywords,
+                    coverLetterVariants=variants
+                ).model_dump_json()
+            await save_history(
+                session_id, 'optimize', payload,
+                resume_hash=resume_hash(request.resume),
+                job_hash=job_description_hash(request.jobDescription)
+            )
+            return Response(content=payload, media_type="application/json", headers=headers)
 
-    # Check for common resume sections (use attribute access)
-    required_sections = ['experience', 'education', 'skills']
-    for section in required_sections:
-        try:
-            section_data = getattr(resume, section, None)
-            if section.lower() in extracted_text.lower() and (not section_data or len(section_data) == 0):
-                warnings.append(f"⚠️ '{section}' section found in text but not parsed")
         except Exception as e:
-            print(f"Warning: Could not check section {section}: {e}")
+            raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}", headers=headers)
+
+def _profile_headers(profiling) -> Optional[dict]:
+    return {"X-Profile-Id": profiling.id} if profiling else None
 
-    # Check text length - if parsed resume is very short compared to original
+@router.post("/api/analyze-job", response_model=JobAnalysis)
+async def analyze_job(request: AnalyzeJobRequest):
+    """Analyze a job description once; later optimize calls for it reuse the cached result"""
     try:
-        parsed_text_length = len(str(resume.model_dump()))
-        if len(extracted_text) > 500 and parsed_text_length < len(extracted_text) * 0.3:
-            warnings.append(f"⚠️ Parsed resume seems incomplete ({parsed_text_length} chars vs {len(extracted_text)} chars in original)")
+        return _json_response(await ai_service.job_analyzer.analyze(request.jobDescription))
     except Exception as e:
-        print(f"Warning: Could not check text length: {e}")
-
-    return warnings
+        raise HTTPException(status_code=500, detail=f"Job analysis failed: {str(e)}")
 
-@router.post("/api/optimize", response_model=OptimizeResponse)
-async def optimize_resume(request: OptimizeRequest):
-    """Optimize resume (non-WebSocket version for fallback)"""
+@router.post("/api/cover-letter-variants", response_model=CoverLetterVariants)
+async def cover_letter_variants(request: CoverLetterVariantsRequest, session_id: Optional[str] = Header(None, alias="X-Session-Id")):
+    """Generate one cover letter per tone in a single call (cached per resume and job)"""
     try:
-        optimized_resume, keywords = await ai_service.optimize_resume(
-            request.resume,
-            request.jobDescription
-        )
-
-        cover_letter = await ai_service.generate_cover_letter(
+        variants = await ai_service.generate_cover_letter_variants(
             request.resume,
             request.jobDescription,
             request.jobTitle or "the position",
-            request.company or "your company"
+            request.company or "your company",
+            tones=request.tones
         )
-
-        return OptimizeResponse(
-            optimizedResume=optimized_resume,
-            coverLetter=cover_letter,
-            jobKeywords=keywords
+        if not variants:
+            raise ValueError("the model wrote none of the requested tones")
+        payload = CoverLetterVariants.model_construct(variants=variants).model_dump_json()
+        await save_history(
+            session_id, 'cover_letter', payload,
+            resume_hash=resume_hash(request.resume),
+            job_hash=job_description_hash(request.jobDescription)
         )
-
+        return Response(content=payload, media_type="application/json")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Cover letter generation failed: {str(e)}")
+
+def _json_response(payload) -> Response:
+    """Return an already-validated model as JSON without re-validating it"""
+    return Response(content=payload.model_dump_json(), media_type="application/json")
+
+@router.get("/api/history", response_model=HistoryRecords)
+async def list_history(
+    kind: Optional[str] = None,
+    fileHash: Optional[str] = None,
+    resumeHash: Optional[str] = None,
+    jobHash: Optional[str] = None,
+    limit: int = 20,
+    session_id: Optional[str] = Header(None, alias="X-Session-Id")
+):
+    """Stored results of this session, newest first (metadata only)"""
+    if not session_id:
+        raise HTTPException(status_code=400, detail="X-Session-Id header is required")
+    if history_store is None:
+        raise HTTPException(status_code=404, detail="History is disabled")
+    if kind and kind not in HISTORY_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown history kind: {kind}")
+    records = await asyncio.to_thread(
+        history_store.find, session_id, kind,
+        file_hash=fileHash, resume_hash=resumeHash, job_hash=jobHash, limit=max(1, min(limit, 100))
+    )
+    return _json_response(HistoryRecords.model_construct(records=records))
+
+@router.get("/api/history/{record_id}")
+async def get_history(record_id: str, session_id: Optional[str] = Header(None, alias="X-Session-Id")):
+    """A stored ParseResponse, OptimizeResponse or CoverLetterVariants, exactly as first returned"""
+    payload = None
+    if session_id and history_store is not None:
+        payload = await asyncio.to_thread(history_store.get, session_id, record_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="History record not found")
+    return Response(content=payload, media_type="application/json")
+
+@router.delete("/api/history")
+async def delete_history(session_id: Optional[str] = Header(None, alias="X-Session-Id")):
+    """Delete every stored result of this session"""
+    if not session_id:
+        raise HTTPException(status_code=400, detail="X-Session-Id header is required")
+    deleted = await asyncio.to_thread(history_store.delete, session_id) if history_store is not None else 0
+    return {"deleted": deleted}
+
+@router.delete("/api/history/{record_id}")
+async def delete_history_record(record_id: str, session_id: Optional[str] = Header(None, alias="X-Session-Id")):
+    """Delete one stored result of this session"""
+    deleted = 0
+    if session_id and history_store is not None:
+        deleted = await asyncio.to_thread(history_store.delete, session_id, record_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="History record not found")
+    return {"deleted": deleted}
+
+@router.post("/api/export")
+async def export_document(request: ExportRequest, if_none_match: Optional[str] = Header(None)):
+    """Render a resume or cover letter as Markdown, plain text or DOCX"""
+    try:
+        rendered = await asyncio.to_thread(export_service.render, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _document_response(rendered, if_none_match)
+
+@router.get("/api/export/{key}")
+async def download_export(key: str, if_none_match: Optional[str] = Header(None)):
+    """Re-download a rendered document by the content address in its ETag"""
+    rendered = await asyncio.to_thread(export_service.load, key)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Export not found, render it again with POST /api/export")
+    return _document_response(rendered, if_none_match)
+
+@router.post("/api/export/bulk")
+async def export_bulk(request: BulkExportRequest):
+    """Zip of many rendered documents, streamed as each one is rendered"""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No documents to export")
+    if len(request.items) > ExportService.MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {ExportService.MAX_BULK_ITEMS} documents per export")
+    # Validate up front: once streaming has started, an error can no longer become a 400
+    for index, item in enumerate(request.items):
+        try:
+            ExportService.validate(item)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Item {index}: {e}")
+    return StreamingResponse(
+        export_service.stream_zip(request.items),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="documents.zip"'}
+    )
+
+def _document_response(rendered: RenderedDocument, if_none_match: Optional[str]) -> Response:
+    # The key is a content address, so it is a strong ETag and the content never changes
+    etag = f'"{rendered.key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    headers["Content-Disposition"] = content_disposition(rendered.filename)
+    return Response(content=rendered.content, media_type=rendered.media_type, headers=headers)
+
+@router.get("/api/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """Stage timings and allocations of a profiled request"""
+    return _profile_response(profile_id, speedscope=False)
+
+@router.get("/api/profiles/{profile_id}/speedscope")
+async def get_profile_speedscope(profile_id: str):
+    """Stack samples of a profiled request; open the file at https://www.speedscope.app"""
+    return _profile_response(profile_id, speedscope=True)
+
+def _profile_response(profile_id: str, speedscope: bool) -> Response:
+    payload = load_profile(profile_id, speedscope=speedscope)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    headers = {"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'} if speedscope else None
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+@router.get("/api/model-routes")
+async def model_routes():
+    """Per-route model latency and success rate, for tuning the model routing"""
+    return {"routes": route_stats.snapshot()}
+
+@router.get("/api/token-plans")
+async def token_plans():
+    """Preflight token plans per task and strategy, with measured / estimated token ratios"""
+    return {"plans": plan_stats.snapshot()}
+
+@router.get("/api/admission")
+async def admission_stats():
+    """WebSocket sessions, active requests and rejections for this worker process"""
+    return admission.snapshot()
 
 @router.get("/api/health")
 async def health_check():
@@ -0,0 +1,65 @@
+import os
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+# Largest resume upload accepted, over REST or WebSocket
+MAX_UPLOAD_BYTES = int(float(os.getenv('MAX_UPLOAD_MB', 10)) * 1024 * 1024)
+
+class UploadTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it as-is instead of turning it into a 400
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+
+class UploadLimitMiddleware:
+    """Reject request bodies over `max_bytes` while they are still streaming in
+
+    FastAPI parses a multipart form before the endpoint runs, so a size
+    check inside the endpoint would only happen after the whole upload was
+    received. This middleware refuses an oversized Content-Length up front
+    and counts body chunks as they arrive, aborting with 413 as soon as the
+    limit is crossed (chunked uploads have no Content-Length).
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES, paths: tuple = ("/api/parse-resume",)):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            return await self._reject(scope, receive, send)
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        async def tracked_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except UploadTooLarge:
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope, receive, send):
+        error = UploadTooLarge(self.max_bytes)
+        response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+        await response(scope, receive, send)
@@ -1,9 +1,35 @@
-import json
+import time
 import asyncio
+import functools
 from fastapi import WebSocket, WebSocketDisconnect
 from services.ai_service import AIService
-from services.parser_service import FileParserService
-from models.schemas import Resume, OptimizeRequest
+from services.parser_service import FileParserService, STORED_PARSE_SOURCES
+from services.completeness import analyze_completeness
+from api.upload_limits import MAX_UPLOAD_BYTES
+from api.admission import admission, busy_message, WS_IDLE_TIMEOUT, TRY_AGAIN_LATER
+from services.job_queue import JobBroker, relay_job_events
+from services.job_analysis_service import job_description_hash
+from services.history_store import file_hash, resume_hash, load_history, save_history
+from models.schemas import Resume, OptimizedResume, CoverLetter, OptimizeResponse, ParseResponse
+from utils.ws_encoding import encode_json_result
+from utils.profiling import profile_request, profiling_requested
+
+def profiled(kind: str):
+    """Profile a handler when its message sets `profile`
+
+    The profile ID is sent first as a {"type": "profile"} message, since
+    the result message ends the exchange. Queued jobs are profiled in the
+    worker that runs them.
+    """
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def run(self, websocket: WebSocket, data: dict):
+            async with profile_request(kind, profiling_requested(data.get('profile'))) as profiling:
+                if profiling:
+                    await websocket.send_json({"type": "profile", "profileId": profiling.id})
+                await handler(self, websocket, data)
+        return run
+    return decorate
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time updates"""
@@ -12,17 +38,27 @@ class WebSocketManager:
         self.ai_service = AIService()
         self.parser_service = FileParserService()  # Now properly initialized with AI capabilities
 
+    @profiled('optimize')
     async def handle_optimize(self, websocket: WebSocket, data: dict):
         """Handle resume optimization with REAL-TIME AI progress updates"""
         try:
             # Stage 1: Parse and validate (10%)
             await self.send_progress(websocket, "analyzing", 10, "📄 Validating resume data...")
 
-            resume = Resume(**data['resume'])
+            resume = Resume.model_validate(data['resume'])
             job_description = data['jobDescription']
             job_title = data.get('jobTitle', 'the position')
             company = data.get('company', 'your company')
 
+            # Incremental mode: only re-optimize what changed since the previous run
+            # for the same job description
+            previous_optimized = data.get('previousOptimizedResume')
+            if data.get('previousResume') and previous_optimized and self.ai_service.can_optimize_incrementally(
+                OptimizedResume.model_validate(previous_optimized), job_description
+            ):
+                await self._handle_incremental_optimize(websocket, resume, data)
+                return
+
             await asyncio.sleep(0.3)
 
             # Stage 2: Extracting job keywords (20%)
@@ -57,11 +93,12 @@ class WebSocketManager:
             # Stage 5: AI Cover Letter Generation (83% → 96%)
             await self.send_progress(websocket, "generating", 84, "📝 Preparing cover letter generation...")
 
-            cover_letter = await self.ai_service.generate_cover_letter(
+            cover_letter, variants = await self.ai_service.generate_cover_letters(
                 optimized_resume,  # Use the optimized resume!
                 job_description,
                 job_title,
                 company,
+                tones=data.get('coverLetterTones'),
                 progress_callback=cover_letter_progress_callback
             )
 
@@ -74,22 +111,176 @@ class WebSocketManager:
             # Complete (100%)
             await self.send_progress(websocket, "complete", 100, "🎉 All done! Your optimized documents are ready!")
 
-            # Send final results
+            # Send final results (serialized once, sent as a pre-encoded text frame)
+            payload = OptimizeResponse.model_construct(
+                optimizedResume=optimized_resume,
+                coverLetter=cover_letter,
+                jobKeywords=keywords,
+                coverLetterVariants=variants
+            ).model_dump_json()
+            await websocket.send_text(encode_json_result(payload))
+            await save_history(
+                data.get('sessionId'), 'optimize', payload,
+                resume_hash=resume_hash(resume),
+                job_hash=job_description_hash(job_description)
+            )
+
+        except Exception as e:
             await websocket.send_json({
-                "type": "result",
-                "data": {
-                    "optimizedResume": json.loads(optimized_resume.model_dump_json()),
-                    "coverLetter": json.loads(cover_letter.model_dump_json()),
-                    "jobKeywords": keywords
-                }
+                "type": "error",
+                "message": str(e)
             })
 
+    async def _handle_incremental_optimize(self, websocket: WebSocket, resume: Resume, data: dict):
+        """Re-optimize edited sections, reusing the previous result for the rest"""
+        async def progress_callback(progress, message):
+            await self.send_progress(websocket, "optimizing", progress, message)
+
+        await self.send_progress(websocket, "analyzing", 30, "🔍 Comparing with your previous optimization...")
+
+        optimized_resume, keywords = await self.ai_service.optimize_resume_incremental(
+            resume,
+            data['jobDescription'],
+            Resume.model_validate(data['previousResume']),
+            OptimizedResume.model_validate(data['previousOptimizedResume']),
+            progress_callback=progress_callback
+        )
+
+        variants = None
+        if data.get('previousCoverLetter'):
+            cover_letter = CoverLetter.model_validate(data['previousCoverLetter'])
+        else:
+            async def cover_letter_progress_callback(progress, message):
+                await self.send_progress(websocket, "generating", progress, message)
+
+            cover_letter, variants = await self.ai_service.generate_cover_letters(
+                optimized_resume,
+                data['jobDescription'],
+                data.get('jobTitle', 'the position'),
+                data.get('company', 'your company'),
+                tones=data.get('coverLetterTones'),
+                progress_callback=cover_letter_progress_callback
+            )
+
+        await self.send_progress(websocket, "complete", 100, "🎉 All done! Your optimized documents are ready!")
+
+        payload = OptimizeResponse.model_construct(
+            optimizedResume=optimized_resume,
+            coverLetter=cover_letter,
+            jobKeywords=keywords,
+            coverLetterVariants=variants
+        ).model_dump_json()
+        await websocket.send_text(encode_json_result(payload))
+        await save_history(
+            data.get('sessionId'), 'optimize', payload,
+            resume_hash=resume_hash(resume),
+            job_hash=job_description_hash(data['jobDescription'])
+        )
+
+    async def serve(self, websocket: WebSocket, request_type: str, make_handler):
+        """Run a WebSocket session under admission control
+
+        Sessions over the per-process or per-client limit get a "busy"
+        message and are closed with 1013. Each request must obtain one of the
+        process's request slots or is answered with "busy" and retryAfter;
+        the socket stays open so the client can retry. Sockets idle for
+        WS_IDLE_TIMEOUT seconds are closed (protocol-level pings are
+        configured on the server, see main.py).
+
+        Args:
+            websocket: The not yet accepted WebSocket
+            request_type: Message type this endpoint serves ('parse' or 'optimize')
+            make_handler: Function mapping a request message to its handler coroutine
+        """
+        client = admission.client_id(websocket)
+        refusal = admission.open_session(client)
+        await websocket.accept()
+        if refusal:
+            await websocket.send_json(busy_message(refusal, admission.retry_after()))
+            await websocket.close(code=TRY_AGAIN_LATER)
+            return
+
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(websocket.receive_json(), WS_IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    await websocket.close(code=1000, reason="Idle timeout")
+                    return
+
+                if data.get('type') != request_type:
+                    continue
+
+                if not admission.start_request():
+                    await websocket.send_json(busy_message("Server is busy", admission.retry_after()))
+                    continue
+
+                started = time.monotonic()
+                try:
+                    # Cancelled if the client disconnects mid-request
+                    await self.run_until_disconnect(websocket, make_handler(data))
+                finally:
+                    admission.finish_request(time.monotonic() - started)
+        finally:
+            admission.close_session(client)
+
+    async def run_until_disconnect(self, websocket: WebSocket, handler):
+        """Run a handler coroutine while watching the socket for a disconnect
+
+        Nothing reads from the socket while a request is in flight, so without
+        this a closed client would go unnoticed until the final send. On
+        disconnect the handler task is cancelled, which aborts its in-flight
+        AI request, and WebSocketDisconnect is raised to the endpoint.
+        """
+        handler_task = asyncio.create_task(handler)
+        try:
+            while True:
+                receive_task = asyncio.create_task(websocket.receive())
+                done, _ = await asyncio.wait({handler_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+
+                if receive_task in done:
+                    message = receive_task.result()
+                    if message['type'] == 'websocket.disconnect':
+                        raise WebSocketDisconnect(message.get('code', 1000))
+                    # One request at a time per socket: refuse, don't queue
+                    await websocket.send_json(busy_message(
+                        "A request is already running on this connection",
+                        admission.retry_after()
+                    ))
+                else:
+                    receive_task.cancel()
+
+                if handler_task in done:
+                    return handler_task.result()
+        finally:
+            if not handler_task.done():
+                handler_task.cancel()
+                try:
+                    await handler_task
+                except asyncio.CancelledError:
+                    pass
+
+    async def handle_queued(self, websocket: WebSocket, broker: JobBroker, kind: str, data: dict):
+        """Enqueue a parse/optimize job and relay the worker's messages to the client"""
+        try:
+            job_id = await asyncio.to_thread(broker.enqueue, kind, data)
+            await self.send_progress(websocket, "queued", 2, "⏳ Request queued for processing...")
+            try:
+                await relay_job_events(broker, websocket, job_id)
+            except asyncio.CancelledError:
+                # Client went away: tell the worker to drop the job (purged later).
+                # Off the event loop, and shielded so a second cancel cannot skip it
+                await asyncio.shield(asyncio.to_thread(broker.cancel, job_id))
+                raise
+            # Relayed to the end: the payload and events are no longer needed
+            await asyncio.to_thread(broker.delete, job_id)
         except Exception as e:
             await websocket.send_json({
                 "type": "error",
                 "message": str(e)
             })
 
+    @profiled('parse')
     async def handle_parse(self, websocket: WebSocket, data: dict):
         """Handle resume parsing with REAL-TIME progress updates"""
         try:
@@ -99,9 +290,22 @@ class WebSocketManager:
 
             # Get file content
             import base64
+            if len(data['fileContent']) * 3 // 4 > MAX_UPLOAD_BYTES:
+                raise ValueError(f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
             file_content = base64.b64decode(data['fileContent'])
             file_type = data['fileType']
 
+            # The same document was parsed for this session before: send that result,
+            # unless the client asks for a fresh parse
+            session_id = data.get('sessionId')
+            refresh = bool(data.get('refresh'))
+            document_hash = file_hash(file_content) if session_id else None
+            previous = None if refresh else await load_history(session_id, 'parse', file_hash=document_hash)
+            if previous:
+                await self.send_progress(websocket, "complete", 100, "🎉 Loaded your previously parsed resume!")
+                await websocket.send_text(encode_json_result(previous))
+                return
+
             # Stage 2: Extracting text (15%)
             if file_type == 'application/pdf':
                 await self.send_progress(websocket, "extracting", 15, "📄 Extracting text from PDF...")
@@ -111,44 +315,16 @@ class WebSocketManager:
                 await self.send_progress(websocket, "extracting", 15, "📄 Reading document text...")
 
             # Create progress callback for parsing
-            # We'll use a sync wrapper that schedules the async call properly
-            progress_queue = []
-
-            def sync_progress_callback(progress, message):
-                """Sync callback that stores progress updates"""
-                progress_queue.append((progress, message))
-
-            async def send_queued_progress():
-                """Periodically send queued progress updates"""
-                while True:
-                    if progress_queue:
-                        progress, message = progress_queue.pop(0)
-                        await self.send_progress(websocket, "parsing", progress, message)
-                    await asyncio.sleep(0.1)
-
-            # Start the progress sender task
-            progress_task = asyncio.create_task(send_queued_progress())
-
-            try:
-                # Parse the file with progress updates (15% → 90%)
-                resume, extracted_text = await asyncio.to_thread(
-                    self.parser_service.parse_file,
-                    file_content,
-                    file_type,
-                    sync_progress_callback
-                )
-            finally:
-                # Cancel the progress sender task
-                progress_task.cancel()
-                try:
-                    await progress_task
-                except asyncio.CancelledError:
-                    pass
-
-                # Send any remaining queued progress
-                while progress_queue:
-                    progress, message = progress_queue.pop(0)
-                    await self.send_progress(websocket, "parsing", progress, message)
+            async def parse_progress_callback(progress, message):
+                await self.send_progress(websocket, "parsing", progress, message)
+
+            # Parse the file with progress updates (15% → 90%)
+            resume, extracted_text, source = await self.parser_service.parse_file(
+                file_content,
+                file_type,
+                progress_callback=parse_progress_callback,
+                refresh=refresh
+            )
 
             # Stage 3: Validating (92%)
             await self.send_progress(websocket, "validating", 92, "✅ Validating extracted data...")
@@ -158,20 +334,21 @@ class WebSocketManager:
             await self.send_progress(websocket, "validating", 95, "🔍 Checking for data completeness...")
             await asyncio.sleep(0.2)
 
-            warnings = self._detect_data_loss(resume, extracted_text)
+            completeness = analyze_completeness(resume, extracted_text)
 
             # Complete (100%)
             await self.send_progress(websocket, "complete", 100, "🎉 Resume parsing complete!")
 
-            # Send final results
-            await websocket.send_json({
-                "type": "result",
-                "data": {
-                    "resume": json.loads(resume.model_dump_json()),
-                    "extractedText": extracted_text,
-                    "warnings": warnings
-                }
-            })
+            # Send final results (serialized once, sent as a pre-encoded text frame)
+            payload = ParseResponse.model_construct(
+                resume=resume,
+                extractedText=extracted_text,
+                warnings=[issue.message for issue in completeness.issues],
+                completeness=completeness
+            ).model_dump_json()
+            await websocket.send_text(encode_json_result(payload))
+            if source in STORED_PARSE_SOURCES:
+                await save_history(session_id, 'parse', payload, file_hash=document_hash, resume_hash=resume_hash(resume))
 
         except Exception as e:
             import traceback
@@ -181,43 +358,6 @@ class WebSocketManager:
                 "message": str(e)
             })
 
-    def _detect_data_loss(self, resume, extracted_text: str) -> list:
-        """Detect potential data loss during parsing"""
-        warnings = []
-
-        # Count bullet points in original text
-        bullet_count = extracted_text.count('•') + extracted_text.count('-')
-
-        # Count description items in parsed resume
-        try:
-            parsed_bullets = sum(len(exp.description) for exp in resume.experience if hasattr(exp, 'description') and exp.description)
-        except Exception as e:
-            print(f"Warning: Could not count parsed bullets: {e}")
-            parsed_bullets = 0
-
-        if bullet_count > parsed_bullets * 1.5 and bullet_count > 5:
-            warnings.append(f"⚠️ Possible data loss: Found {bullet_count} bullet points in original but only {parsed_bullets} parsed")
-
-        # Check for common resume sections
-        required_sections = ['experience', 'education', 'skills']
-        for section in required_sections:
-            try:
-                section_data = getattr(resume, section, None)
-                if section.lower() in extracted_text.lower() and (not section_data or len(section_data) == 0):
-                    warnings.append(f"⚠️ '{section}' section found in text but not parsed")
-            except Exception as e:
-                print(f"Warning: Could not check section {section}: {e}")
-
-        # Check text length
-        try:
-            parsed_text_length = len(str(resume.model_dump()))
-            if len(extracted_text) > 500 and parsed_text_length < len(extracted_text) * 0.3:
-                warnings.append(f"⚠️ Parsed resume seems incomplete ({parsed_text_length} chars vs {len(extracted_text)} chars in original)")
-        except Exception as e:
-            print(f"Warning: Could not check text length: {e}")
-
-        return warnings
-
     async def send_progress(self, websocket: WebSocket, stage: str, progress: int, message: str):
         """Send progress update to frontend"""
         await websocket.send_json({
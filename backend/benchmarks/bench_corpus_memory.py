@@ -0,0 +1,105 @@
+"""Memory benchmark: resume corpora as Pydantic models vs ResumeCorpus
+
+Generates `--count` distinct resumes (unique names, contact details and
+bullets; skills, companies and dates drawn from shared vocabularies, as in
+a real corpus), and measures traced heap per resume when they are held as a
+list of `Resume` models and as a `ResumeCorpus`. Each resume is validated
+from its own JSON, as it would be after parsing, so no strings are shared
+between models by accident. A sample is round-tripped to check that the
+corpus is lossless.
+
+Run from backend/:  python -m benchmarks.bench_corpus_memory --count 100000
+"""
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from models.schemas import Resume
+from services.resume_corpus import ResumeCorpus
+from benchmarks.fixtures import BULLETS, SKILLS
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Johnson", "Lee", "Garcia", "Smith", "Patel", "Nguyen", "Kim", "Brown", "Davis", "Lopez"]
+COMPANIES = [f"Company {i}" for i in range(500)]
+POSITIONS = ["Software Engineer", "Senior Software Engineer", "Staff Engineer", "Engineering Manager", "Data Engineer"]
+CITIES = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Remote"]
+
+def resume_json(index: int, rng: random.Random) -> str:
+    """JSON of a distinct, realistically sized resume"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+    jobs = rng.randint(2, 5)
+    return json.dumps({
+        "contact": {
+            "name": name,
+            "email": f"user{index}@example.com",
+            "phone": f"(555) {index % 1000:03d}-{index % 10000:04d}",
+            "location": rng.choice(CITIES),
+            "linkedin": f"linkedin.com/in/user{index}",
+        },
+        "summary": f"Engineer #{index} with {rng.randint(2, 20)} years of experience. " + rng.choice(BULLETS),
+        "experience": [
+            {
+                "id": f"exp{job + 1}",
+                "company": rng.choice(COMPANIES),
+                "position": rng.choice(POSITIONS),
+                "location": rng.choice(CITIES),
+                "startDate": f"Jan {2023 - 2 * job}",
+                "endDate": "Present" if job == 0 else f"Dec {2024 - 2 * job}",
+                # Bullets are rewritten per person, so each is a distinct string
+                "description": [f"{rng.choice(BULLETS)} (r{index}.{job}.{b})" for b in range(rng.randint(3, 6))],
+            }
+            for job in range(jobs)
+        ],
+        "education": [{
+            "id": "edu1",
+            "institution": f"University {rng.randint(1, 200)}",
+            "degree": "Bachelor of Science",
+            "field": "Computer Science",
+            "location": rng.choice(CITIES),
+            "startDate": "2011",
+            "endDate": "2015",
+        }],
+        "skills": [
+            {"category": category, "items": rng.sample(items, rng.randint(2, len(items)))}
+            for category, items in SKILLS.items()
+        ],
+    })
+
+def measure(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, current, seconds
+
+def main(args):
+    rng = random.Random(42)
+    documents = [resume_json(i, rng) for i in range(args.count)]
+    text_bytes = sum(len(doc) for doc in documents)
+    print(f"{args.count} resumes, {text_bytes / args.count:.0f} bytes of JSON each on average")
+
+    models, model_bytes, model_seconds = measure(lambda: [Resume.model_validate_json(doc) for doc in documents])
+    print(f"  Pydantic models: {model_bytes / args.count:8.0f} bytes/resume ({model_bytes / 1e6:7.1f} MB, built in {model_seconds:.1f}s)")
+
+    # Build the corpus from the models, then drop them, so only the corpus is counted
+    corpus, corpus_bytes, corpus_seconds = measure(lambda: ResumeCorpus.from_resumes(models))
+    print(f"  ResumeCorpus:    {corpus_bytes / args.count:8.0f} bytes/resume ({corpus_bytes / 1e6:7.1f} MB, built in {corpus_seconds:.1f}s)")
+    print(f"  {model_bytes / corpus_bytes:.1f}x smaller")
+
+    sample = rng.sample(range(args.count), min(1000, args.count))
+    assert all(corpus[i].model_dump() == models[i].model_dump() for i in sample), "corpus round trip changed a resume"
+    started = time.perf_counter()
+    for i in sample:
+        corpus[i]
+    print(f"  Round trip of {len(sample)} sampled resumes OK, {(time.perf_counter() - started) / len(sample) * 1e6:.0f} µs per resume")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare memory of Pydantic resumes and ResumeCorpus")
+    parser.add_argument("--count", type=int, default=100000)
+    main(parser.parse_args())
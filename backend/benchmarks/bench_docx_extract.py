@@ -0,0 +1,147 @@
+"""DOCX extraction benchmark: python-docx paragraphs vs the streaming extractor
+
+Builds template-heavy resumes with python-docx the way resume templates
+lay them out. Name and contact details sit in the page header, each job's
+company, title and dates sit in a table row, skills sit in a two-column
+table, and the summary sits in a text box (DrawingML with a VML fallback,
+as Word writes it). Each document is extracted with the previous
+approach (`docx.Document(...).paragraphs` concatenated) and with
+`extract_docx_text`. The report gives median time per document for
+growing sizes, the share of known snippets each extraction recovers
+(header, tables, text box, body bullets), and the traced heap peak on
+the largest document. tracemalloc does not see libxml2's own allocations.
+python-docx keeps its whole element tree there, so its peak is a lower
+bound. The streaming parser drops each block as soon as it is read.
+
+Run from backend/:  python -m benchmarks.bench_docx_extract --repeat 10
+"""
+import io
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+import docx
+from docx.oxml import parse_xml
+from benchmarks.fixtures import BULLETS, SKILLS
+from services.docx_extractor import extract_docx_text
+
+NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+def text_box_run(text: str):
+    """A run holding a text box, written twice as Word does (DrawingML choice, VML fallback)"""
+    content = f'<w:txbxContent><w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p></w:txbxContent>'
+    return parse_xml(
+        f'<w:r {NAMESPACES}><mc:AlternateContent>'
+        f'<mc:Choice Requires="wps"><w:drawing><wp:inline><wp:extent cx="5486400" cy="914400"/><wp:docPr id="1" name="Summary"/>'
+        f'<a:graphic><a:graphicData uri="http://schemas.microsoft.com/office/word/2010/wordprocessingShape">'
+        f'<wps:wsp><wps:txbx>{content}</wps:txbx><wps:bodyPr/></wps:wsp></a:graphicData></a:graphic></wp:inline></w:drawing></mc:Choice>'
+        f'<mc:Fallback><w:pict><v:shape style="width:432pt;height:72pt"><v:textbox>{content}</v:textbox></v:shape></w:pict></mc:Fallback>'
+        f'</mc:AlternateContent></w:r>'
+    )
+
+def build_resume(jobs: int, rng: random.Random) -> tuple:
+    """A template-style .docx and the snippets a complete extraction must contain"""
+    document = docx.Document()
+    name, email, phone = "Alex Johnson", "alex.johnson@example.com", "(555) 123-4567"
+    header = document.sections[0].header
+    header.paragraphs[0].text = name
+    header.add_paragraph(f"{email} | {phone} | San Francisco, CA")
+    document.sections[0].footer.paragraphs[0].text = "References available on request"
+
+    summary = "Full-stack engineer with nine years building web platforms and developer tooling."
+    document.add_heading("Summary", level=1)
+    document.add_paragraph()._p.append(text_box_run(summary))
+
+    document.add_heading("Experience", level=1)
+    bullets = []
+    for job in range(jobs):
+        row = document.add_table(rows=1, cols=3).rows[0].cells
+        row[0].text, row[1].text, row[2].text = f"Company {job}", "Senior Engineer", f"Jan {2020 - job} - Dec {2021 - job}"
+        for bullet in rng.sample(BULLETS, 4):
+            bullets.append(f"{bullet} (job {job})")
+            document.add_paragraph(bullets[-1], style='List Bullet')
+
+    document.add_heading("Skills", level=1)
+    table = document.add_table(rows=0, cols=2)
+    for category, items in SKILLS.items():
+        cells = table.add_row().cells
+        cells[0].text, cells[1].text = category, ", ".join(items)
+
+    document.add_heading("Education", level=1)
+    document.add_paragraph("State University | Bachelor of Science | Computer Science")
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    snippets = {
+        'header': [name, email, phone],
+        'text box': [summary],
+        'tables': [f"Company {job}" for job in range(jobs)] + [", ".join(items) for items in SKILLS.values()],
+        'body': bullets,
+        'footer': ["References available on request"],
+    }
+    return buffer.getvalue(), snippets
+
+def python_docx_text(data: bytes) -> str:
+    """The extraction parser_service used before: body paragraphs only"""
+    doc = docx.Document(io.BytesIO(data))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+def streaming_text(data: bytes) -> str:
+    return extract_docx_text(io.BytesIO(data))
+
+def median_ms(fn, data: bytes, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(data)
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+def recall(text: str, snippets: dict) -> dict:
+    return {part: sum(snippet in text for snippet in found) / len(found) for part, found in snippets.items()}
+
+def peak_kb(fn, data: bytes) -> float:
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def main(args):
+    rng = random.Random(42)
+    print(f"Median extraction time (of {args.repeat}):")
+    print(f"{'jobs':>6} {'size KB':>8} {'python-docx':>12} {'streaming':>10} {'speedup':>8}")
+    largest = None
+    for jobs in args.jobs:
+        data, snippets = build_resume(jobs, rng)
+        old, new = median_ms(python_docx_text, data, args.repeat), median_ms(streaming_text, data, args.repeat)
+        print(f"{jobs:>6} {len(data) / 1024:>8.0f} {old:>10.1f}ms {new:>8.1f}ms {old / new:>7.1f}x")
+        largest = (jobs, data, snippets)
+
+    jobs, data, snippets = largest
+    print(f"Share of known snippets recovered ({jobs} jobs):")
+    for label, fn in (("python-docx", python_docx_text), ("streaming", streaming_text)):
+        text = fn(data)
+        parts = ', '.join(f"{part} {share:.0%}" for part, share in recall(text, snippets).items())
+        print(f"  {label:<12} {parts}; summary appears {text.count(snippets['text box'][0])}x")
+
+    print(f"Traced heap peak ({jobs} jobs, {len(data) / 1024:.0f} KB):")
+    print(f"  python-docx  {peak_kb(python_docx_text, data):8.0f} KB")
+    print(f"  streaming    {peak_kb(streaming_text, data):8.0f} KB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare python-docx and streaming DOCX text extraction")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--jobs", type=int, nargs='+', default=[3, 10, 50, 500], help="Experience entries per document")
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""Lookup latency of the SQLite history store as it grows
+
+Fills a fresh database with `--records` parse/optimize records spread over
+`--owners` sessions (payloads of realistic size), then times the lookups the
+API makes: newest parse result by file hash, newest optimization by resume
+and job hash, listing a session's records, and loading a payload by ID.
+
+Run from backend/:  python -m benchmarks.bench_history_store --records 300000
+"""
+import os
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from services.history_store import SQLiteHistoryStore
+
+def fill(store: SQLiteHistoryStore, records: int, owners: int, payload_size: int):
+    """Bulk-insert synthetic records in one transaction; returns one sample key per record"""
+    payload = "x" * payload_size
+    now = time.time()
+    keys = []
+    store.find("", limit=1)  # The store creates its schema on first use
+    conn = sqlite3.connect(store.db_path, isolation_level=None)
+    conn.execute("BEGIN")
+    for i in range(records):
+        owner = f"session-{i % owners}"
+        kind = 'parse' if i % 3 == 0 else 'optimize'
+        keys.append((owner, kind, f"file-{i}", f"resume-{i // 3}", f"job-{i % 97}", f"id-{i}"))
+        conn.execute(
+            "INSERT INTO history (id, owner, kind, file_hash, resume_hash, job_hash, created_at, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (f"id-{i}", owner, kind, f"file-{i}" if kind == 'parse' else None, f"resume-{i // 3}",
+             f"job-{i % 97}" if kind == 'optimize' else None, now + i * 1e-3, payload)
+        )
+    conn.execute("COMMIT")
+    conn.close()
+    return keys
+
+def timed(fn, samples) -> str:
+    durations = []
+    for sample in samples:
+        started = time.perf_counter()
+        fn(*sample)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    p99 = durations[int(len(durations) * 0.99) - 1]
+    return f"p50 {statistics.median(durations):6.2f} ms   p99 {p99:6.2f} ms"
+
+def main(args):
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteHistoryStore(os.path.join(directory, "history.db"))
+
+        started = time.perf_counter()
+        keys = fill(store, args.records, args.owners, args.payload_kb * 1024)
+        print(f"Inserted {args.records} records in {time.perf_counter() - started:.1f}s")
+
+        samples = random.sample(keys, min(args.lookups, len(keys)))
+        print(f"  parse by file hash:        {timed(lambda o, k, f, r, j, i: store.latest(o, 'parse', file_hash=f), samples)}")
+        print(f"  optimize by resume + job:  {timed(lambda o, k, f, r, j, i: store.latest(o, 'optimize', resume_hash=r, job_hash=j), samples)}")
+        print(f"  list session records:      {timed(lambda o, k, f, r, j, i: store.find(o, limit=20), samples)}")
+        print(f"  payload by ID:             {timed(lambda o, k, f, r, j, i: store.get(o, i), samples)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure history store lookup latency")
+    parser.add_argument("--records", type=int, default=300000)
+    parser.add_argument("--owners", type=int, default=20000)
+    parser.add_argument("--payload-kb", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=2000)
+    main(parser.parse_args())
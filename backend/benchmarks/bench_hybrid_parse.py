@@ -0,0 +1,155 @@
+"""Hybrid parse benchmark: LLM tokens and latency, full AI parse vs hybrid
+
+Generates a sample corpus of resumes with known contents in four layouts,
+from template-like to free-form: markdown with "Company | Position |
+Location" lines, plain text with capitalized headings and dates inline, a
+mixed layout (unheaded summary, free-form education) and a narrative one.
+Each is run through the hybrid planner. The report covers how many
+sections stay local and the LLM tokens the full and hybrid parses would
+use. Input tokens come from the actual prompts. Output tokens come from
+the JSON of the fields the LLM must return. The report also checks that
+every section accepted locally matches the known resume exactly.
+
+Latency is modelled rather than measured, so the numbers do not depend
+on network conditions. It is local parse time plus, when the LLM is
+called, time to first token plus output tokens at `--output-tps`. Output
+decoding dominates LLM latency for parsing.
+
+Run from backend/:  python -m benchmarks.bench_hybrid_parse --count 200
+"""
+import os
+import json
+import time
+import random
+import argparse
+import statistics
+from models.schemas import Resume
+from benchmarks.fixtures import BULLETS, SKILLS, NAMES, COMPANIES, POSITIONS, CITIES, SCHOOLS, MONTHS
+from utils.tokens import count_tokens
+
+os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+from services.parser_service import FileParserService
+
+LAYOUTS = ('markdown', 'caps', 'mixed', 'narrative')
+
+def sample(rng: random.Random) -> Resume:
+    """A resume with known contents"""
+    name = rng.choice(NAMES)
+    jobs = rng.randint(2, 4)
+    year = 2024
+    experience = []
+    for job in range(jobs):
+        start = year - rng.randint(1, 4)
+        experience.append({
+            "id": f"exp{job + 1}",
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "location": rng.choice(CITIES),
+            "startDate": f"{rng.choice(MONTHS)} {start}",
+            "endDate": "Present" if job == 0 else f"{rng.choice(MONTHS)} {year}",
+            "description": rng.sample(BULLETS, rng.randint(2, 5)),
+        })
+        year = start
+    return Resume(
+        contact={"name": name, "email": f"{name.split()[0].lower()}@example.com", "phone": "(555) 123-4567", "location": rng.choice(CITIES)},
+        summary=f"Software engineer with {rng.randint(3, 15)} years building web platforms and developer tooling.",
+        experience=experience,
+        education=[{
+            "id": "edu1", "institution": rng.choice(SCHOOLS), "degree": "Bachelor of Science", "field": "Computer Science",
+            "location": "", "startDate": str(year - 4), "endDate": str(year),
+        }],
+        skills=[{"category": category, "items": rng.sample(items, rng.randint(3, len(items)))} for category, items in SKILLS.items()],
+    )
+
+def render(resume: Resume, layout: str) -> str:
+    """Resume text in one of the corpus layouts"""
+    c = resume.contact
+    edu = resume.education[0]
+    skills = [f"{group.category}: {', '.join(group.items)}" for group in resume.skills]
+    if layout == 'markdown':
+        lines = [f"# {c.name}", f"{c.email} | {c.phone} | {c.location}", "", "## Summary", resume.summary, "", "## Experience"]
+        for exp in resume.experience:
+            lines += [f"{exp.company} | {exp.position} | {exp.location}", f"{exp.startDate} - {exp.endDate}", *(f"- {b}" for b in exp.description), ""]
+        lines += ["## Education", f"{edu.institution} | {edu.degree} | {edu.field}", f"{edu.startDate} - {edu.endDate}", "", "## Skills", *skills]
+    elif layout == 'caps':
+        lines = [c.name, f"{c.location} | {c.email} | {c.phone}", "", "PROFESSIONAL SUMMARY", resume.summary, "", "WORK EXPERIENCE"]
+        for exp in resume.experience:
+            lines += [f"{exp.company} | {exp.position} | {exp.location} | {exp.startDate} - {exp.endDate}", *(f"• {b}" for b in exp.description)]
+        lines += ["", "EDUCATION", f"{edu.institution} | {edu.degree} | {edu.field} | {edu.startDate} - {edu.endDate}", "", "TECHNICAL SKILLS", *skills]
+    elif layout == 'mixed':
+        lines = [c.name, f"{c.email} · {c.phone} · {c.location}", resume.summary, "", "Experience"]
+        for exp in resume.experience:
+            lines += [f"{exp.company} | {exp.position} | {exp.location}", f"{exp.startDate} – {exp.endDate}", *(f"• {b}" for b in exp.description)]
+        lines += ["", "Education", f"{edu.degree} in {edu.field}, {edu.institution}, {edu.startDate}–{edu.endDate}", "", "Skills", *skills]
+    else:
+        lines = [c.name, f"{c.location} · {c.email} · {c.phone}", resume.summary, "", "EXPERIENCE"]
+        for exp in resume.experience:
+            lines += [f"{exp.position} at {exp.company} in {exp.location} ({exp.startDate} to {exp.endDate}). " + " ".join(f"{b}." for b in exp.description)]
+        lines += ["", "EDUCATION", f"{edu.degree} in {edu.field} from {edu.institution} ({edu.startDate}–{edu.endDate})",
+                  "", "SKILLS", " · ".join(item for group in resume.skills for item in group.items)]
+    return "\n".join(lines) + "\n"
+
+def message_tokens(messages: list) -> int:
+    return sum(count_tokens(message['content']) for message in messages)
+
+def field_tokens(resume: Resume, fields) -> int:
+    return count_tokens(json.dumps(resume.model_dump(include=set(fields))))
+
+def main(args):
+    rng = random.Random(42)
+    parser = FileParserService()
+    rows = []
+    for i in range(args.count):
+        layout = LAYOUTS[i % len(LAYOUTS)]
+        truth = sample(rng)
+        text = render(truth, layout)
+
+        started = time.perf_counter()
+        plan = parser.plan_hybrid_parse(text)
+        local_seconds = time.perf_counter() - started
+
+        full_in = message_tokens(parser._ai_parse_messages(text))
+        full_out = field_tokens(truth, Resume.model_fields)
+        if plan.full:
+            hybrid_in, hybrid_out = full_in, full_out
+        elif plan.fields:
+            hybrid_in, hybrid_out = message_tokens(parser._hybrid_messages(plan)), field_tokens(truth, plan.fields)
+        else:
+            hybrid_in = hybrid_out = 0
+
+        # Sections kept local must match the known resume exactly
+        kept = [field for field in Resume.model_fields if field not in plan.fields] if not plan.full else []
+        wrong = [field for field in kept if getattr(plan.resume, field) != getattr(truth, field)]
+
+        rows.append({
+            'layout': layout, 'full': plan.full, 'llm': plan.full or bool(plan.fields), 'kept': len(kept), 'wrong': wrong,
+            'full_in': full_in, 'full_out': full_out, 'hybrid_in': hybrid_in, 'hybrid_out': hybrid_out,
+            'full_latency': args.ttft + full_out / args.output_tps,
+            'hybrid_latency': local_seconds + ((args.ttft + hybrid_out / args.output_tps) if hybrid_out else 0),
+        })
+
+    print(f"{args.count} resumes, modelled LLM latency {args.ttft}s + output at {args.output_tps} tokens/s")
+    print(f"{'layout':<10} {'no LLM':>7} {'partial':>8} {'full':>5} {'local sections':>15} {'wrong':>6}")
+    for layout in LAYOUTS:
+        group = [r for r in rows if r['layout'] == layout]
+        print(f"{layout:<10} {sum(not r['llm'] for r in group):>7} {sum(r['llm'] and not r['full'] for r in group):>8} "
+              f"{sum(r['full'] for r in group):>5} {sum(r['kept'] for r in group) / len(group):>15.1f} {sum(len(r['wrong']) for r in group):>6}")
+
+    for mode in ('full', 'hybrid'):
+        tokens_in = statistics.mean(r[f'{mode}_in'] for r in rows)
+        tokens_out = statistics.mean(r[f'{mode}_out'] for r in rows)
+        latencies = sorted(r[f'{mode}_latency'] for r in rows)
+        print(f"  {mode:<7} avg {tokens_in:6.0f} input + {tokens_out:5.0f} output tokens, "
+              f"latency p50 {statistics.median(latencies):5.2f}s, mean {statistics.mean(latencies):5.2f}s")
+    saved = 1 - sum(r['hybrid_in'] + r['hybrid_out'] for r in rows) / sum(r['full_in'] + r['full_out'] for r in rows)
+    print(f"  hybrid uses {saved:.0%} fewer LLM tokens")
+    mistakes = [(r['layout'], r['wrong']) for r in rows if r['wrong']]
+    if mistakes:
+        print(f"  ⚠️ {len(mistakes)} resumes kept a wrongly parsed section locally, e.g. {mistakes[0]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare LLM tokens and latency of full AI parsing and hybrid parsing")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--ttft", type=float, default=0.6, help="Seconds to first token of an LLM call")
+    parser.add_argument("--output-tps", type=float, default=80, help="LLM output tokens per second")
+    main(parser.parse_args())
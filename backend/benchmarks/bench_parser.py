@@ -0,0 +1,354 @@
+"""Parser benchmark suite: speed and field-level accuracy of FileParserService
+
+Builds a fixture corpus of synthetic resumes with content modelled on
+src/data/sampleResume.ts. Each is rendered as PDF, DOCX and Markdown, at
+sizes from 1 to 15 pages. The 1-page one is a regular resume; longer ones
+have more jobs with more bullets each, like an academic CV. Every
+document is put through the parser's stages, timed as the median of
+`--repeat` runs:
+
+- extract: text extraction plus normalization, as in `parse_file`
+- regex: the local regex parser
+- ai: `_parse_with_ai` against a stubbed model that answers instantly
+  with the document's ground truth. This is the parser's own overhead on
+  the AI path (token planning, schema validation, completeness check),
+  without the LLM. `--llm-latency` adds a fixed delay per call.
+
+Regex and AI results are scored field by field against the ground-truth
+Resume. Contact fields, entry fields (company, dates, ...) and summary
+must match exactly; bullets and skills count by share of items recovered.
+
+Results are compared with the stored baseline (benchmarks/baselines/
+bench_parser.json), and the run exits with status 1 on a regression: a
+stage slower by more than `--time-tolerance` (and `--min-delta-ms`), or
+accuracy lower by more than `--accuracy-tolerance`. Timings are specific
+to the machine that recorded the baseline. Re-record it with
+`--save-baseline` after an intended change, or when moving to another
+machine.
+
+Run from backend/:  python -m benchmarks.bench_parser --repeat 5
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import statistics
+import textwrap
+import contextlib
+from types import SimpleNamespace
+from typing import Dict, List
+import docx
+from models.schemas import Resume
+from benchmarks.fixtures import SKILLS, NAMES, COMPANIES, POSITIONS, CITIES, SCHOOLS, MONTHS
+from utils.tokens import count_tokens
+
+os.environ.setdefault('OPENAI_API_KEY', 'benchmark')
+from services import parser_service
+from services.parser_service import FileParserService
+from services.shared_state import InMemoryCache
+from services.text_normalizer import normalize_text
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'bench_parser.json')
+
+FORMATS = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'md': 'text/markdown',
+}
+
+# PDF layout: US Letter, 10pt Helvetica on a 13pt line, 0.75in margins
+LINES_PER_PAGE = 52
+PDF_WRAP_CHARS = 95
+
+VERBS = ["Built", "Designed", "Led", "Automated", "Migrated", "Optimized", "Shipped", "Maintained"]
+THINGS = ["the billing service", "a React design system", "the data pipeline", "GraphQL APIs",
+          "CI/CD pipelines", "the search backend", "PostgreSQL schemas", "an internal CLI"]
+OUTCOMES = ["cutting latency by {n}%", "serving {n}K monthly users", "reducing costs by {n}%",
+            "for {n} engineering teams", "raising test coverage to {n}%"]
+
+def corpus_resume(rng: random.Random, pages: int) -> Resume:
+    """Ground truth of a resume that renders to about `pages` PDF pages"""
+    jobs = 2 + 2 * pages
+    # Lines left for experience after contact, summary, education and skills; each job has a blank, entry and date line
+    bullets = max(2, (pages * LINES_PER_PAGE - 24) // jobs - 3)
+    name = rng.choice(NAMES)
+    month = 12 * 2024 + 5
+    experience = []
+    for job in range(jobs):
+        start = month - rng.randint(8, 14)
+        phrases = set()
+        while len(phrases) < bullets:
+            phrases.add(f"{rng.choice(VERBS)} {rng.choice(THINGS)}, {rng.choice(OUTCOMES).format(n=rng.randint(2, 95))}")
+        experience.append({
+            "id": f"exp{job + 1}",
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "location": rng.choice(CITIES),
+            "startDate": f"{MONTHS[start % 12 % len(MONTHS)]} {start // 12}",
+            "endDate": "Present" if job == 0 else f"{MONTHS[month % 12 % len(MONTHS)]} {month // 12}",
+            "description": sorted(phrases, key=lambda phrase: rng.random()),
+        })
+        month = start
+    year = month // 12
+    return Resume(
+        contact={
+            "name": name,
+            "email": f"{name.split()[0].lower()}.{name.split()[1].lower()}@email.com",
+            "phone": "(555) 123-4567",
+            "location": rng.choice(CITIES),
+            "linkedin": f"linkedin.com/in/{name.replace(' ', '').lower()}",
+        },
+        summary=f"Software engineer with {2024 - year} years of experience building web applications. "
+                "Proficient in JavaScript, TypeScript and Python, with a focus on performance and reliability.",
+        experience=experience,
+        education=[{
+            "id": "edu1", "institution": rng.choice(SCHOOLS), "degree": "Bachelor of Science", "field": "Computer Science",
+            "location": "", "startDate": str(year - 4), "endDate": str(year),
+        }],
+        skills=[{"category": category, "items": items} for category, items in SKILLS.items()],
+    )
+
+def text_lines(resume: Resume, bullet: str = "• ", heading: str = "") -> List[str]:
+    """The resume as lines of text; Markdown passes its heading and bullet markers"""
+    c = resume.contact
+    lines = [f"{'# ' if heading else ''}{c.name}", f"{c.email} | {c.phone} | {c.location}", c.linkedin,
+             "", f"{heading}Summary", resume.summary, "", f"{heading}Experience"]
+    for exp in resume.experience:
+        lines += ["", f"{exp.company} | {exp.position} | {exp.location}", f"{exp.startDate} - {exp.endDate}",
+                  *(f"{bullet}{b}" for b in exp.description)]
+    edu = resume.education[0]
+    lines += ["", f"{heading}Education", f"{edu.institution} | {edu.degree} | {edu.field}", f"{edu.startDate} - {edu.endDate}",
+              "", f"{heading}Skills", *(f"{group.category}: {', '.join(group.items)}" for group in resume.skills)]
+    return lines
+
+def _pdf_string(text: str) -> bytes:
+    return b'(' + text.encode('cp1252').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def render_pdf(resume: Resume) -> bytes:
+    """A text PDF with one line per text line (long ones wrapped), paginated like a word processor would"""
+    lines = [piece for line in text_lines(resume) for piece in (textwrap.wrap(line, PDF_WRAP_CHARS) or [''])]
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    kids = []
+    for i, page_lines in enumerate(pages):
+        content_id, page_id = 4 + 2 * i, 5 + 2 * i
+        stream = b"BT /F1 10 Tf 13 TL 54 738 Td " + b" ".join(_pdf_string(line) + b" Tj T*" for line in page_lines) + b" ET"
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, objects[number]))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for number in sorted(objects):
+        out.write(b"%010d 00000 n \n" % offsets[number])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def render_docx(resume: Resume) -> bytes:
+    """A .docx with heading styles and Word list bullets"""
+    document = docx.Document()
+    for line in text_lines(resume, bullet="• "):
+        if line in ("Summary", "Experience", "Education", "Skills"):
+            document.add_heading(line, level=1)
+        elif line.startswith("• "):
+            document.add_paragraph(line[2:], style='List Bullet')
+        elif line:
+            document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def render_md(resume: Resume) -> bytes:
+    return ("\n".join(text_lines(resume, bullet="- ", heading="## ")) + "\n").encode()
+
+RENDERERS = {'pdf': render_pdf, 'docx': render_docx, 'md': render_md}
+
+def _same(a, b) -> float:
+    return float(' '.join(str(a or '').split()).lower() == ' '.join(str(b or '').split()).lower())
+
+def _recovered(truth: List[str], parsed: List[str]) -> float:
+    if not truth:
+        return 1.0
+    found = {' '.join(item.split()).lower() for item in parsed}
+    return sum(' '.join(item.split()).lower() in found for item in truth) / len(truth)
+
+def accuracy(parsed: Resume, truth: Resume) -> Dict[str, float]:
+    """Field-level accuracy per section and overall (mean of every field check)"""
+    checks = {'contact': [], 'summary': [], 'experience': [], 'education': [], 'skills': []}
+    for field in ('name', 'email', 'phone', 'location', 'linkedin'):
+        checks['contact'].append(_same(getattr(parsed.contact, field), getattr(truth.contact, field)))
+    checks['summary'].append(_same(parsed.summary, truth.summary))
+    # Entries are compared in order; a missing entry fails all its fields
+    for i, exp in enumerate(truth.experience):
+        got = parsed.experience[i] if i < len(parsed.experience) else None
+        for field in ('company', 'position', 'location', 'startDate', 'endDate'):
+            checks['experience'].append(_same(getattr(got, field), getattr(exp, field)) if got else 0.0)
+        checks['experience'].append(_recovered(exp.description, got.description) if got else 0.0)
+    for i, edu in enumerate(truth.education):
+        got = parsed.education[i] if i < len(parsed.education) else None
+        for field in ('institution', 'degree', 'field', 'startDate', 'endDate'):
+            checks['education'].append(_same(getattr(got, field), getattr(edu, field)) if got else 0.0)
+    checks['skills'].append(_recovered([item for group in truth.skills for item in group.items],
+                                       [item for group in parsed.skills for item in group.items]))
+    scores = {section: round(statistics.mean(values), 4) for section, values in checks.items()}
+    scores['overall'] = round(statistics.mean(value for values in checks.values() for value in values), 4)
+    return scores
+
+class StubOpenAI:
+    """Stands in for AsyncOpenAI: answers every parse request with the current document's ground truth"""
+
+    def __init__(self, latency: float = 0.0):
+        self.truth = None
+        self.latency = latency
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        schema = (request.get('response_format') or {}).get('json_schema', {}).get('name')
+        # Resume and ResumeSections (chunked parses) share field names; repair calls get no fixes
+        content = self.truth.model_dump_json() if schema in ('Resume', 'ResumeSections') else json.dumps({"fixes": {}})
+        usage = SimpleNamespace(
+            prompt_tokens=sum(count_tokens(message['content']) for message in request['messages']),
+            completion_tokens=count_tokens(content)
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+def median_ms(fn, repeat: int):
+    """Median duration of `fn()` and its last result"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), result
+
+def run(args) -> dict:
+    rng = random.Random(42)
+    parser = FileParserService()
+    stub = StubOpenAI(args.llm_latency / 1000)
+    parser.client.client = stub
+    # Every AI run must reach the (stubbed) model
+    parser_service.parse_cache = InMemoryCache(max_size=0)
+    loop = asyncio.new_event_loop()
+
+    results = []
+    for pages in args.pages:
+        truth = corpus_resume(rng, pages)
+        stub.truth = truth
+        for fmt in args.formats:
+            data = RENDERERS[fmt](truth)
+            if args.corpus_dir:
+                os.makedirs(args.corpus_dir, exist_ok=True)
+                with open(os.path.join(args.corpus_dir, f"resume_{pages}p.{fmt}"), 'wb') as f:
+                    f.write(data)
+                with open(os.path.join(args.corpus_dir, f"resume_{pages}p.json"), 'w') as f:
+                    f.write(truth.model_dump_json(indent=2))
+
+            # The parser logs every step; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                extract_ms, text = median_ms(lambda: normalize_text(parser._extract_text(data, FORMATS[fmt]))[0], args.repeat)
+                regex_ms, regex_resume = median_ms(lambda: parser._parse_text_to_resume(text), args.repeat)
+                ai_ms, ai_resume = median_ms(lambda: loop.run_until_complete(parser._parse_with_ai(text)), args.repeat)
+
+            results.append({
+                'format': fmt,
+                'pages': pages,
+                'bytes': len(data),
+                'chars': len(text),
+                'extractMs': round(extract_ms, 3),
+                'regexParseMs': round(regex_ms, 3),
+                'aiParseMs': round(ai_ms, 3),
+                'accuracy': {'regex': accuracy(regex_resume, truth), 'ai': accuracy(ai_resume, truth)},
+            })
+    loop.close()
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'llmLatencyMs': args.llm_latency,
+        'results': results,
+    }
+
+def compare(report: dict, baseline: dict, time_tolerance: float, min_delta_ms: float, accuracy_tolerance: float) -> List[str]:
+    """Regressions of `report` against `baseline`, as messages"""
+    previous = {(r['format'], r['pages']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        key = (result['format'], result['pages'])
+        before = previous.get(key)
+        if before is None:
+            continue
+        label = f"{result['format']} {result['pages']}p"
+        for stage in ('extractMs', 'regexParseMs', 'aiParseMs'):
+            if result[stage] > before[stage] * (1 + time_tolerance) and result[stage] - before[stage] >= min_delta_ms:
+                regressions.append(f"{label} {stage}: {before[stage]:.1f} → {result[stage]:.1f} ms")
+        for mode in ('regex', 'ai'):
+            for section, score in result['accuracy'][mode].items():
+                was = before['accuracy'][mode].get(section)
+                if was is not None and score < was - accuracy_tolerance:
+                    regressions.append(f"{label} {mode} {section} accuracy: {was:.3f} → {score:.3f}")
+    return regressions
+
+def main(args):
+    report = run(args)
+
+    print(f"Median of {args.repeat} runs (ms); accuracy is field-level, regex / ai")
+    print(f"{'format':<6} {'pages':>5} {'KB':>6} {'extract':>8} {'regex':>7} {'ai':>7}  "
+          f"{'contact':>11} {'summary':>11} {'experience':>11} {'education':>11} {'skills':>11} {'overall':>11}")
+    for r in report['results']:
+        regex, ai = r['accuracy']['regex'], r['accuracy']['ai']
+        scores = ' '.join(f"{regex[s]:>5.2f}/{ai[s]:<5.2f}" for s in ('contact', 'summary', 'experience', 'education', 'skills', 'overall'))
+        print(f"{r['format']:<6} {r['pages']:>5} {r['bytes'] / 1024:>6.0f} {r['extractMs']:>8.1f} {r['regexParseMs']:>7.1f} {r['aiParseMs']:>7.1f}  {scores}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline}; record one with --save-baseline")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.time_tolerance, args.min_delta_ms, args.accuracy_tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"✅ No regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FileParserService speed and accuracy against a stored baseline")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", type=int, nargs='+', default=[1, 2, 4, 8, 15])
+    parser.add_argument("--formats", nargs='+', choices=list(FORMATS), default=list(FORMATS))
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Milliseconds the stubbed model takes per call")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="Allowed slowdown of a stage (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Smallest slowdown reported, below which timings are noise")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.01)
+    parser.add_argument("--corpus-dir", help="Also write the generated documents and their ground truth here")
+    main(parser.parse_args())
@@ -0,0 +1,80 @@
+"""Memory benchmark: ingesting concurrent resume uploads
+
+Compares the previous `await file.read()` handling against handing the
+parser the spooled upload, for a batch of concurrent large uploads, and
+reports Python heap peak per request (tracemalloc). Both endpoints read the
+document the same way the parser does; the PDF/DOCX libraries themselves
+are left out so only the ingestion path is measured.
+
+Run from backend/:  python -m benchmarks.bench_upload_memory --size-mb 20 --concurrency 5
+"""
+import io
+import os
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import tracemalloc
+import httpx
+from fastapi import FastAPI, UploadFile, File
+from api.upload_limits import UploadLimitMiddleware
+
+def consume(stream) -> str:
+    # Stand-in for the parser: read the document in chunks
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def create_app(max_bytes: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_bytes=max_bytes, paths=("/previous", "/current"))
+
+    @app.post("/previous")
+    async def previous(file: UploadFile = File(...)):
+        content = await file.read()
+        return {"sha256": await asyncio.to_thread(consume, io.BytesIO(content))}
+
+    @app.post("/current")
+    async def current(file: UploadFile = File(...)):
+        file.file.seek(0)
+        return {"sha256": await asyncio.to_thread(consume, file.file)}
+
+    return app
+
+async def measure(app: FastAPI, path: str, upload_path: str, concurrency: int) -> float:
+    """Peak traced heap (MB) while `concurrency` uploads are in flight"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def upload():
+            with open(upload_path, "rb") as f:
+                response = await client.post(path, files={"file": ("resume.pdf", f, "application/pdf")})
+            response.raise_for_status()
+
+        tracemalloc.start()
+        await asyncio.gather(*(upload() for _ in range(concurrency)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+async def main(args):
+    size = int(args.size_mb * 1024 * 1024)
+    app = create_app(max_bytes=size * 2)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as f:
+        f.write(os.urandom(size))
+        upload_path = f.name
+
+    try:
+        print(f"{args.concurrency} concurrent uploads of {args.size_mb} MB")
+        for path in ("/previous", "/current"):
+            peak = await measure(app, path, upload_path, args.concurrency)
+            print(f"{path[1:]:>8}: peak {peak:7.1f} MB total, {peak / args.concurrency:6.1f} MB per request")
+    finally:
+        os.unlink(upload_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-request memory of upload ingestion")
+    parser.add_argument("--size-mb", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,127 @@
+"""Validation micro-benchmark: dict round trips vs JSON-mode validation
+
+Times the per-request Pydantic work of an optimization on a 10-job resume
+(6 bullets per job), comparing each step's alternatives:
+
+- LLM response: `json.loads` then `model_validate(dict)`, vs
+  `model_validate_json` on the raw response text, one pass in pydantic-core
+- building the OptimizedResume: `OptimizedResume(**resume.model_dump(), ...)`
+  re-validates the resume that was just validated. Passing the validated
+  sections as models (`**dict(resume)`) keeps them as they are, and is
+  compared with `model_construct`, which skips validation altogether
+- the change list: `ResumeChange(...)` per change vs `model_construct`
+- the whole path, from response text to the serialized OptimizeResponse
+
+With pydantic 2.5 (pydantic-core 2.14) neither shortcut pays off on its
+own. JSON-mode validation is slower than the stdlib C decoder plus
+dict validation, and `model_construct` runs in Python, so it is slower
+than validating a small model, or a model whose fields are already
+models, in pydantic-core. The services keep validating and drop the
+dump-and-revalidate round trip, which is where the time went.
+
+Run from backend/:  python -m benchmarks.bench_validation --repeat 2000
+"""
+import json
+import time
+import argparse
+import statistics
+from benchmarks.fixtures import sample_optimized_resume, sample_cover_letter
+from models.schemas import OptimizationResult, OptimizedResume, OptimizeResponse, ResumeChange
+
+def optimization_response(jobs: int) -> str:
+    """Raw text of a structured-output optimization response"""
+    optimized = sample_optimized_resume(jobs=jobs)
+    return json.dumps({
+        "optimizedResume": optimized.model_dump(include={'contact', 'summary', 'experience', 'education', 'skills'}),
+        "matchedKeywords": optimized.matchedKeywords,
+        "matchScore": optimized.matchScore,
+        "potentialScore": optimized.potentialScore,
+        "skillGaps": [gap.model_dump() for gap in optimized.skillGaps],
+    })
+
+def change_fields(jobs: int) -> list:
+    """Keyword arguments of a realistic change list: every bullet reworded"""
+    return [
+        {"section": "Experience", "type": "modified", "description": f"Reworded bullet {b + 1} at Company {job}",
+         "before": "Developed web applications", "after": "Built and scaled web applications"}
+        for job in range(jobs) for b in range(6)
+    ]
+
+def build(result: OptimizationResult, changes: list, sections) -> OptimizedResume:
+    return OptimizedResume(
+        **sections(result.optimizedResume),
+        changes=changes,
+        matchScore=result.matchScore,
+        matchedKeywords=result.matchedKeywords,
+        skillGaps=result.skillGaps,
+        potentialScore=result.potentialScore
+    )
+
+def build_constructed(result: OptimizationResult, changes: list) -> OptimizedResume:
+    return OptimizedResume.model_construct(
+        **dict(result.optimizedResume),
+        changes=changes,
+        matchScore=result.matchScore,
+        matchedKeywords=result.matchedKeywords,
+        skillGaps=result.skillGaps,
+        potentialScore=result.potentialScore
+    )
+
+def dumped(resume) -> dict:
+    return resume.model_dump()
+
+def timed_us(fn, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(durations)
+
+def main(args):
+    content = optimization_response(args.jobs)
+    change_kwargs = change_fields(args.jobs)
+    result = OptimizationResult.model_validate_json(content)
+    cover_letter = sample_cover_letter()
+
+    def before():
+        optimized = build(OptimizationResult.model_validate(json.loads(content)), [ResumeChange(**c) for c in change_kwargs], dumped)
+        return OptimizeResponse(optimizedResume=optimized, coverLetter=cover_letter, jobKeywords=optimized.matchedKeywords).model_dump_json()
+
+    def after():
+        optimized = build(OptimizationResult.model_validate(json.loads(content)), [ResumeChange(**c) for c in change_kwargs], dict)
+        return OptimizeResponse(optimizedResume=optimized, coverLetter=cover_letter, jobKeywords=optimized.matchedKeywords).model_dump_json()
+
+    assert before() == after(), "fast path changed the serialized response"
+
+    steps = [
+        ("LLM response -> OptimizationResult", [
+            ("json.loads + model_validate", lambda: OptimizationResult.model_validate(json.loads(content))),
+            ("model_validate_json", lambda: OptimizationResult.model_validate_json(content)),
+        ]),
+        ("OptimizationResult -> OptimizedResume", [
+            ("**model_dump()", lambda: build(result, [], dumped)),
+            ("**dict(model)", lambda: build(result, [], dict)),
+            ("model_construct", lambda: build_constructed(result, [])),
+        ]),
+        (f"{len(change_kwargs)} ResumeChanges", [
+            ("ResumeChange(...)", lambda: [ResumeChange(**c) for c in change_kwargs]),
+            ("model_construct", lambda: [ResumeChange.model_construct(**c) for c in change_kwargs]),
+        ]),
+        ("response text -> response JSON", [("before", before), ("after", after)]),
+    ]
+
+    print(f"{args.jobs}-job resume, {len(content) / 1024:.1f} KB response, median of {args.repeat}")
+    for step, variants in steps:
+        print(step)
+        baseline = None
+        for label, fn in variants:
+            us = timed_us(fn, args.repeat)
+            baseline = baseline or us
+            print(f"  {label:<30} {us:9.1f} µs {baseline / us:6.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Pydantic validation paths of an optimization")
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,92 @@
+"""Throughput scaling of serve.py with worker count, with the LLM stubbed
+
+Starts benchmarks.fake_openai with zero latency, so request handling is
+CPU-bound on the backend, then runs benchmarks.load_test against
+serve.py for each worker count and reports throughput and scaling
+efficiency. Worker counts above the number of cores cannot scale.
+
+Run from backend/:
+    python -m benchmarks.bench_worker_scaling --workers 1,2,4 --requests 400
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import httpx
+
+def wait_until_up(url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def run_load(args, workers: int, fake_url: str, workdir: str) -> dict:
+    port = args.port + workers
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"{fake_url}/v1",
+        "ENV": "production",
+        "LLM_RECORD_MODE": "off",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port),
+         "--shared-state-db", os.path.join(workdir, f"state-{workers}.db")],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(f"http://localhost:{port}/api/health")
+        output = os.path.join(workdir, f"load-{workers}.json")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.load_test", "--url", f"http://localhost:{port}",
+             "--scenario", args.scenario, "--concurrency", str(args.concurrency),
+             "--requests", str(args.requests), "--output", output],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        server.terminate()
+        server.wait()
+
+def main(args):
+    worker_counts = [int(count) for count in args.workers.split(',')]
+    fake_url = f"http://localhost:{args.port}"
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_openai", "--port", str(args.port), "--latency", "fixed:0"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(f"{fake_url}/stats")
+        with tempfile.TemporaryDirectory() as workdir:
+            results = [(workers, run_load(args, workers, fake_url, workdir)) for workers in worker_counts]
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    print(f"{args.scenario}, concurrency {args.concurrency}, {args.requests} requests, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'speedup':>8} {'efficiency':>10}")
+    base = results[0][1]["throughputPerSec"] / results[0][0]
+    for workers, report in results:
+        speedup = report["throughputPerSec"] / base
+        print(f"{workers:>8} {report['throughputPerSec']:>8} {report['p50Ms']:>8} {report['p95Ms']:>8} "
+              f"{speedup:>8.2f} {speedup / workers:>10.0%}")
+        if report["failures"]:
+            print(f"         ⚠️ {report['failures']} failed requests")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure throughput scaling with uvicorn worker count")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--scenario", choices=["ws-parse", "ws-optimize", "rest-optimize"], default="rest-optimize")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--port", type=int, default=8200, help="Fake OpenAI port; servers use the following ports")
+    main(parser.parse_args())
@@ -0,0 +1,57 @@
+"""Micro-benchmark: encoding a large optimize `result` WebSocket message
+
+Compares the previous dump → json.loads → send_json path against
+utils.ws_encoding.encode_result, and reports the permessage-deflate size.
+
+Run from backend/:  python -m benchmarks.bench_ws_payload
+"""
+import json
+import timeit
+import zlib
+from benchmarks.fixtures import sample_optimized_resume, sample_cover_letter
+from models.schemas import OptimizeResponse
+from utils.ws_encoding import encode_result
+
+def encode_previous(optimized_resume, cover_letter, keywords) -> str:
+    # What handle_optimize + websocket.send_json used to do
+    return json.dumps({
+        "type": "result",
+        "data": {
+            "optimizedResume": json.loads(optimized_resume.model_dump_json()),
+            "coverLetter": json.loads(cover_letter.model_dump_json()),
+            "jobKeywords": keywords,
+            # Only set when several cover-letter tones were requested
+            "coverLetterVariants": None
+        }
+    }, separators=(",", ":"), ensure_ascii=False)
+
+def encode_current(optimized_resume, cover_letter, keywords) -> str:
+    return encode_result(OptimizeResponse.model_construct(
+        optimizedResume=optimized_resume,
+        coverLetter=cover_letter,
+        jobKeywords=keywords
+    ))
+
+def main():
+    optimized_resume = sample_optimized_resume(jobs=15, bullets=8)
+    cover_letter = sample_cover_letter()
+    keywords = optimized_resume.matchedKeywords
+
+    assert json.loads(encode_previous(optimized_resume, cover_letter, keywords)) == \
+        json.loads(encode_current(optimized_resume, cover_letter, keywords))
+
+    payload = encode_current(optimized_resume, cover_letter, keywords).encode()
+    # permessage-deflate is raw DEFLATE (no zlib header)
+    compressor = zlib.compressobj(wbits=-15)
+    deflated = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    print(f"Payload: {len(payload):,} bytes, {len(deflated):,} bytes with permessage-deflate "
+          f"({len(deflated) / len(payload):.0%})")
+
+    for name, encode in (("previous", encode_previous), ("encode_result", encode_current)):
+        runs = 2000
+        seconds = min(timeit.repeat(lambda: encode(optimized_resume, cover_letter, keywords), number=runs, repeat=5))
+        print(f"{name:>14}: {seconds / runs * 1e6:8.1f} µs per message")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""OpenAI-compatible stand-in server for benchmarking without real GPT calls
+
+Serves POST /v1/chat/completions with configurable latency, optional SSE
+streaming and injected 429s. Responses come from recorded fixtures (the
+files written by LLM_RECORD_MODE=record) when one matches the request, and
+otherwise are synthesized from the requested structured-output schema.
+
+Run from backend/:
+    python -m benchmarks.fake_openai --port 8100 --latency lognormal:1.5,0.4 --error-rate 0.02
+and start the app with OPENAI_BASE_URL=http://localhost:8100/v1.
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from benchmarks.fixtures import sample_resume, sample_optimized_resume, sample_cover_letter
+from services.llm_client import fixture_key
+
+class LatencyModel:
+    """Latency distribution in seconds: fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA"""
+
+    def __init__(self, spec: str):
+        kind, _, params = spec.partition(':')
+        self.kind = kind
+        self.params = [float(p) for p in params.split(',') if p]
+
+    def sample(self) -> float:
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return random.uniform(*self.params)
+        if self.kind == 'lognormal':
+            median, sigma = self.params
+            return random.lognormvariate(0, sigma) * median
+        raise ValueError(f"Unknown latency distribution: {self.kind}")
+
+def synthesize_content(body: dict) -> str:
+    """Build a schema-valid response for the structured outputs the backend requests"""
+    response_format = body.get('response_format') or {}
+    schema_name = response_format.get('json_schema', {}).get('name')
+
+    if schema_name == 'Resume':
+        return sample_resume().model_dump_json()
+    if schema_name == 'ResumeSections':
+        # Every section filled; the hybrid parser keeps only those it asked for
+        return sample_resume().model_dump_json()
+    if schema_name == 'OptimizationResult':
+        optimized = sample_optimized_resume()
+        resume_fields = sample_resume().model_dump()
+        return json.dumps({
+            "optimizedResume": resume_fields,
+            "matchedKeywords": optimized.matchedKeywords,
+            "matchScore": optimized.matchScore,
+            "potentialScore": optimized.potentialScore,
+            "skillGaps": [g.model_dump() for g in optimized.skillGaps],
+        })
+    if schema_name == 'PartialOptimizationResult':
+        return json.dumps({"summary": None, "experience": [exp.model_dump() for exp in sample_resume().experience], "skills": None})
+    if schema_name == 'JobAnalysis':
+        return json.dumps({
+            "title": "Senior Software Engineer", "seniority": "senior",
+            "requiredSkills": ["TypeScript", "React", "Node.js", "PostgreSQL"],
+            "niceToHaveSkills": ["Docker", "Kubernetes", "AWS"],
+            "keywords": ["REST APIs", "CI/CD"], "responsibilities": ["Build and maintain web services"],
+            "companyContext": None, "hiringManager": None,
+        })
+    if schema_name == 'CoverLetterVariants':
+        letter = sample_cover_letter().model_dump()
+        return json.dumps({"variants": [{"tone": tone, "coverLetter": letter} for tone in ("formal", "concise", "enthusiastic")]})
+    if schema_name == 'CoverLetter':
+        return sample_cover_letter().model_dump_json()
+    # JSON-mode calls (e.g. field repair) get an empty object
+    return json.dumps({"fixes": {}})
+
+def create_app(latency: LatencyModel, error_rate: float = 0.0, fixtures_dir: str = None) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    app.state.requests = 0
+
+    def load_fixture(body: dict):
+        if not fixtures_dir:
+            return None
+        path = os.path.join(fixtures_dir, f"{fixture_key(body)}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)['response']['content']
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+
+        if random.random() < error_rate:
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={"error": {"message": "Rate limit reached (injected)", "type": "requests", "code": "rate_limit_exceeded"}}
+            )
+
+        content = load_fixture(body) or synthesize_content(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        delay = latency.sample()
+
+        if body.get('stream'):
+            async def stream():
+                # Spread the latency over the chunks so time-to-first-token is realistic
+                chunks = [content[i:i + 200] for i in range(0, len(content), 200)] or [""]
+                for chunk in chunks:
+                    await asyncio.sleep(delay / len(chunks))
+                    event = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": body.get('model'),
+                        "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]
+                    }
+                    yield f"data: {json.dumps(event)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        await asyncio.sleep(delay)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": body.get('model'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(json.dumps(body.get('messages'))) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(json.dumps(body.get('messages'))) + len(content)) // 4}
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.requests}
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible server")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:1.5,0.4", help="fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded fixtures to serve when they match")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(LatencyModel(args.latency), args.error_rate, args.fixtures), host="0.0.0.0", port=args.port, log_level="warning")
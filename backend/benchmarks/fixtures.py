@@ -0,0 +1,94 @@
+from models.schemas import Resume, OptimizedResume, ResumeChange, SkillGap, CoverLetter
+
+# Content modelled on src/data/sampleResume.ts
+BULLETS = [
+    "Developed web applications using React and Node.js serving 50K monthly users",
+    "Led migration of legacy REST services to GraphQL, cutting payload sizes by 40%",
+    "Built CI/CD pipelines with GitHub Actions and Docker for 12 microservices",
+    "Improved page load performance by 35% through code splitting and caching",
+    "Mentored 4 junior engineers and ran weekly code review sessions",
+    "Designed PostgreSQL schemas and optimized slow queries with proper indexing",
+    "Implemented feature flags and A/B testing infrastructure with LaunchDarkly",
+    "Collaborated with product and design to ship 20+ customer-facing features",
+]
+
+SKILLS = {
+    "Languages": ["JavaScript", "TypeScript", "Python", "Go", "SQL", "HTML", "CSS"],
+    "Frameworks": ["React", "Next.js", "Node.js", "Express", "FastAPI", "Django"],
+    "Tools": ["Docker", "Kubernetes", "AWS", "Git", "GitHub Actions", "PostgreSQL", "Redis"],
+}
+
+# Variety for generated corpora
+NAMES = ["Alex Johnson", "Sam Lee", "Jordan Garcia", "Taylor Smith", "Morgan Patel", "Casey Nguyen", "Riley Kim"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli"]
+POSITIONS = ["Software Engineer", "Senior Software Engineer", "Staff Engineer", "Backend Engineer", "Engineering Manager"]
+CITIES = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Chicago, IL"]
+SCHOOLS = ["State University", "Tech Institute", "City College", "University of Somewhere"]
+MONTHS = ["Jan", "Mar", "Jun", "Sep", "Nov"]
+
+def sample_resume(jobs: int = 10, bullets: int = 6) -> Resume:
+    """Build a synthetic resume with `jobs` experience entries of `bullets` bullets each"""
+    return Resume(
+        contact={
+            "name": "Alex Johnson",
+            "email": "alex.johnson@email.com",
+            "phone": "(555) 123-4567",
+            "location": "San Francisco, CA",
+            "linkedin": "linkedin.com/in/alexjohnson",
+            "website": "alexjohnson.dev",
+        },
+        summary="Software engineer with 10 years of experience building web applications. "
+                "Proficient in JavaScript, TypeScript and Python, with a focus on performance and reliability.",
+        experience=[
+            {
+                "id": f"exp{i + 1}",
+                "company": f"Company {i + 1}",
+                "position": "Senior Software Engineer" if i < jobs // 2 else "Software Engineer",
+                "location": "San Francisco, CA",
+                "startDate": f"Jan {2023 - 2 * i}",
+                "endDate": "Present" if i == 0 else f"Dec {2024 - 2 * i}",
+                "description": [BULLETS[(i + j) % len(BULLETS)] for j in range(bullets)],
+            }
+            for i in range(jobs)
+        ],
+        education=[
+            {
+                "id": "edu1",
+                "institution": "State University",
+                "degree": "Bachelor of Science",
+                "field": "Computer Science",
+                "location": "California",
+                "startDate": "2011",
+                "endDate": "2015",
+                "gpa": "3.5",
+                "achievements": ["Dean's List", "ACM Programming Contest finalist"],
+            }
+        ],
+        skills=[{"category": category, "items": items} for category, items in SKILLS.items()],
+    )
+
+def sample_optimized_resume(jobs: int = 10, bullets: int = 6) -> OptimizedResume:
+    """Build a synthetic OptimizedResume on top of sample_resume"""
+    resume = sample_resume(jobs, bullets)
+    return OptimizedResume(
+        **resume.model_dump(),
+        changes=[
+            ResumeChange(section="Experience", type="modified", description=f"Enhanced bullets for {exp.company}")
+            for exp in resume.experience
+        ],
+        matchScore=72,
+        matchedKeywords=[item for items in SKILLS.values() for item in items],
+        skillGaps=[
+            SkillGap(skill="Terraform", importance="important", learningPath="HashiCorp tutorials", estimatedTime="2-3 weeks")
+        ],
+        potentialScore=88,
+    )
+
+def sample_cover_letter() -> CoverLetter:
+    return CoverLetter(
+        greeting="Dear Hiring Manager,",
+        opening="I am excited to apply for the Senior Software Engineer role.",
+        body=[BULLETS[0] + ". " + BULLETS[1] + ".", BULLETS[2] + ". " + BULLETS[3] + "."],
+        closing="Thank you for your consideration.",
+        signature="Sincerely,\nAlex Johnson",
+    )
@@ -0,0 +1,132 @@
+"""Load test for /ws/parse, /ws/optimize and /api/optimize
+
+Drives the running backend at a fixed concurrency and reports latency
+percentiles and throughput. Point the backend at benchmarks.fake_openai
+(OPENAI_BASE_URL) or replay fixtures (LLM_RECORD_MODE=replay) so runs are
+reproducible and free.
+
+Run from backend/:
+    python -m benchmarks.load_test --scenario ws-optimize --concurrency 20 --requests 200
+"""
+import json
+import time
+import base64
+import random
+import asyncio
+import argparse
+import statistics
+import httpx
+import websockets
+from benchmarks.fixtures import sample_resume
+
+JOB_DESCRIPTION = (
+    "Senior Software Engineer. We are looking for an engineer with 5+ years of experience in "
+    "TypeScript, React, Node.js and PostgreSQL. Experience with Docker, Kubernetes and AWS is a plus."
+)
+
+def percentile(sorted_values: list, pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def run_ws(url: str, message: dict):
+    """Returns True/False for success/failure, or ('busy', retryAfter) if admission control refused it"""
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            await ws.send(json.dumps(message))
+            while True:
+                reply = json.loads(await ws.recv())
+                if reply['type'] == 'result':
+                    return True
+                if reply['type'] == 'error':
+                    return False
+                if reply['type'] == 'busy':
+                    return ('busy', reply['retryAfter'])
+    except websockets.ConnectionClosed as e:
+        if e.rcvd and e.rcvd.code == 1013:
+            return ('busy', 1)
+        raise
+
+async def run_rest_optimize(client: httpx.AsyncClient, base_url: str, message: dict) -> bool:
+    response = await client.post(f"{base_url}/api/optimize", json=message, timeout=300)
+    return response.status_code == 200
+
+def build_request(scenario: str, base_url: str, client: httpx.AsyncClient):
+    ws_base = base_url.replace('http', 'ws', 1)
+    resume = sample_resume(jobs=random.randint(2, 8))
+    # Make every request distinct so parse/optimize result caches don't short-circuit it
+    resume.summary += f" Ref {random.getrandbits(32):08x}."
+
+    if scenario == 'ws-parse':
+        markdown = "\n".join(
+            [f"# {resume.contact.name}", resume.contact.email, "## Experience"]
+            + [f"{e.company} | {e.position} | {e.location}\n{e.startDate} - {e.endDate}\n" + "\n".join(f"- {d}" for d in e.description)
+               for e in resume.experience]
+        )
+        message = {"type": "parse", "fileContent": base64.b64encode(markdown.encode()).decode(), "fileType": "text/markdown"}
+        return lambda: run_ws(f"{ws_base}/ws/parse", message)
+
+    optimize = {"resume": resume.model_dump(), "jobDescription": JOB_DESCRIPTION, "jobTitle": "Senior Software Engineer", "company": "Acme"}
+    if scenario == 'ws-optimize':
+        return lambda: run_ws(f"{ws_base}/ws/optimize", {"type": "optimize", **optimize})
+    return lambda: run_rest_optimize(client, base_url, optimize)
+
+async def main(args):
+    latencies = []
+    failures = 0
+    rejected = 0
+    remaining = iter(range(args.requests))
+
+    async with httpx.AsyncClient() as client:
+        async def user():
+            nonlocal failures, rejected
+            for _ in remaining:
+                request = build_request(args.scenario, args.url, client)
+                start = time.perf_counter()
+                try:
+                    ok = await request()
+                except Exception as e:
+                    print(f"Request failed: {e}")
+                    ok = False
+                if isinstance(ok, tuple):
+                    # Refused up front; latency is only reported for admitted requests.
+                    # Back off as a well-behaved client would
+                    rejected += 1
+                    await asyncio.sleep(ok[1])
+                    continue
+                latencies.append(time.perf_counter() - start)
+                failures += not ok
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    report = {
+        "scenario": args.scenario,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "failures": failures,
+        "rejectedBusy": rejected,
+        "throughputPerSec": round(len(latencies) / elapsed, 2),
+        "p50Ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95Ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99Ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "meanMs": round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the resume optimizer backend")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=["ws-parse", "ws-optimize", "rest-optimize"], default="ws-optimize")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible request mixes")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    asyncio.run(main(args))
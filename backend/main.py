@@ -4,6 +4,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from api.routes import router
 from api.websocket import WebSocketManager
+from api.upload_limits import UploadLimitMiddleware
+from api.admission import SendTimeoutMiddleware, websocket_server_settings
+from services.job_queue import get_job_broker
+import asyncio
 import json
 
 # Load environment variables
@@ -30,25 +34,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cap upload size while the body streams in (MAX_UPLOAD_MB)
+app.add_middleware(UploadLimitMiddleware)
+
+# Drop WebSocket clients that stop reading instead of letting them pin a request slot
+app.add_middleware(SendTimeoutMiddleware)
+
 # Include REST API routes
 app.include_router(router)
 
 # WebSocket manager
 ws_manager = WebSocketManager()
 
+# Optional job-queue mode (JOB_QUEUE_MODE=sqlite|memory): parse/optimize
+# jobs are enqueued here and executed by worker processes (see worker.py)
+job_broker = get_job_broker()
+
+@app.on_event("startup")
+async def start_in_process_workers():
+    """In memory mode there are no worker processes, so run workers in this event loop"""
+    if os.getenv('JOB_QUEUE_MODE', 'off').lower() == 'memory':
+        from worker import JobWorker
+        worker = JobWorker(job_broker, ws_manager, concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", 4)))
+        app.state.worker_task = asyncio.create_task(worker.run())
+
 @app.websocket("/ws/parse")
 async def websocket_parse(websocket: WebSocket):
     """WebSocket endpoint for real-time resume parsing"""
-    await websocket.accept()
+    def make_handler(data):
+        if job_broker:
+            return ws_manager.handle_queued(websocket, job_broker, 'parse', data)
+        return ws_manager.handle_parse(websocket, data)
 
     try:
-        while True:
-            # Receive data from frontend
-            data = await websocket.receive_json()
-
-            if data.get('type') == 'parse':
-                # Handle parsing with real-time progress
-                await ws_manager.handle_parse(websocket, data)
+        await ws_manager.serve(websocket, 'parse', make_handler)
 
     except WebSocketDisconnect:
         print("Client disconnected from parse")
@@ -65,16 +84,13 @@ async def websocket_parse(websocket: WebSocket):
 @app.websocket("/ws/optimize")
 async def websocket_optimize(websocket: WebSocket):
     """WebSocket endpoint for real-time resume optimization"""
-    await websocket.accept()
+    def make_handler(data):
+        if job_broker:
+            return ws_manager.handle_queued(websocket, job_broker, 'optimize', data)
+        return ws_manager.handle_optimize(websocket, data)
 
     try:
-        while True:
-            # Receive data from frontend
-            data = await websocket.receive_json()
-
-            if data.get('type') == 'optimize':
-                # Handle optimization with real-time progress
-                await ws_manager.handle_optimize(websocket, data)
+        await ws_manager.serve(websocket, 'optimize', make_handler)
 
     except WebSocketDisconnect:
         print("Client disconnected")
@@ -110,6 +126,10 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
-        log_level="info"
+        # Auto-reload is for development; use serve.py for multi-worker production serving
+        reload=os.getenv("ENV", "development") == "development",
+        log_level="info",
+        # Compress WebSocket frames (large result payloads shrink several-fold)
+        ws_per_message_deflate=os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true",
+        **websocket_server_settings()
     )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class ContactInfo(BaseModel):
     name: str
@@ -42,11 +42,21 @@ class Resume(BaseModel):
     education: List[Education]
     skills: List[Skill]
 
+# Structured-output response of a hybrid parse: only the low-confidence sections, the rest null
+class ResumeSections(BaseModel):
+    contact: Optional[ContactInfo] = None
+    summary: Optional[str] = None
+    experience: Optional[List[Experience]] = None
+    education: Optional[List[Education]] = None
+    skills: Optional[List[Skill]] = None
+
 class ResumeChange(BaseModel):
     section: str
-    type: str  # 'added', 'modified', 'reordered'
+    type: str  # 'added', 'modified', 'reordered', 'removed'
     description: str
     confidence: Optional[str] = 'verified'  # 'verified', 'inferred', 'suggested'
+    before: Optional[str] = None  # Exact original text span, see services/change_diff.py
+    after: Optional[str] = None  # Exact optimized text span
 
 class SkillGap(BaseModel):
     skill: str
@@ -60,6 +70,31 @@ class OptimizedResume(Resume):
     matchedKeywords: List[str]
     skillGaps: Optional[List[SkillGap]] = []
     potentialScore: Optional[int] = None  # Score user could achieve after learning gaps
+    jobHash: Optional[str] = None  # job_description_hash of the posting it was optimized for
+
+class JobAnalysis(BaseModel):
+    title: Optional[str] = None
+    seniority: str
+    requiredSkills: List[str]
+    niceToHaveSkills: List[str]
+    keywords: List[str]
+    responsibilities: List[str]
+    companyContext: Optional[str] = None
+    hiringManager: Optional[str] = None
+
+# Structured-output response of the optimization call
+class OptimizationResult(BaseModel):
+    optimizedResume: Resume
+    matchedKeywords: List[str]
+    matchScore: int
+    potentialScore: Optional[int] = None
+    skillGaps: List[SkillGap]
+
+# Structured-output response of an incremental (changed sections only) optimization
+class PartialOptimizationResult(BaseModel):
+    summary: Optional[str] = None
+    experience: List[Experience]
+    skills: Optional[List[Skill]] = None
 
 class CoverLetter(BaseModel):
     greeting: str
@@ -68,13 +103,82 @@ class CoverLetter(BaseModel):
     closing: str
     signature: str
 
+class CoverLetterVariant(BaseModel):
+    tone: str  # e.g. 'formal', 'concise', 'enthusiastic'
+    coverLetter: CoverLetter
+
+# Structured-output response of the multi-variant cover letter call
+class CoverLetterVariants(BaseModel):
+    variants: List[CoverLetterVariant]
+
+class CoverLetterVariantsRequest(BaseModel):
+    resume: Resume  # The optimized resume
+    jobDescription: str
+    jobTitle: Optional[str] = None
+    company: Optional[str] = None
+    tones: Optional[List[str]] = None
+
 class OptimizeRequest(BaseModel):
     resume: Resume
     jobDescription: str
     jobTitle: Optional[str] = None
     company: Optional[str] = None
+    # Incremental mode: the resume and results of the previous run for the same job
+    previousResume: Optional[Resume] = None
+    previousOptimizedResume: Optional[OptimizedResume] = None
+    previousCoverLetter: Optional[CoverLetter] = None
+    # Variants mode: one cover letter per tone from a single generation call
+    coverLetterTones: Optional[List[str]] = None
+
+class AnalyzeJobRequest(BaseModel):
+    jobDescription: str
+
+class CompletenessIssue(BaseModel):
+    code: str  # 'bullets_missing', 'section_missing', 'section_incomplete', 'content_missing'
+    section: str
+    message: str
+    coverage: Optional[float] = None
+
+class CompletenessReport(BaseModel):
+    coverage: Dict[str, float]  # Share of each text section's words found in the parsed resume
+    issues: List[CompletenessIssue]
+
+class ParseResponse(BaseModel):
+    resume: Resume
+    extractedText: str
+    warnings: List[str]  # Messages of completeness.issues
+    completeness: Optional[CompletenessReport] = None
 
 class OptimizeResponse(BaseModel):
     optimizedResume: OptimizedResume
     coverLetter: CoverLetter
     jobKeywords: List[str]
+    coverLetterVariants: Optional[List[CoverLetterVariant]] = None
+
+class Job(BaseModel):
+    id: str
+    kind: str  # 'parse', 'optimize'
+    payload: dict
+    status: str = 'queued'  # 'queued', 'running', 'completed', 'failed', 'cancelled'
+    attempts: int = 0  # Times the job has been claimed (more than once after a worker died)
+
+class HistoryRecord(BaseModel):
+    id: str
+    kind: str  # 'parse', 'optimize', 'cover_letter'
+    createdAt: float
+    fileHash: Optional[str] = None  # sha256 of the uploaded document (parse records)
+    resumeHash: Optional[str] = None  # sha256 of the resume that was optimized
+    jobHash: Optional[str] = None  # job_description_hash of the posting
+
+class HistoryRecords(BaseModel):
+    records: List[HistoryRecord]
+
+class ExportRequest(BaseModel):
+    document: str  # 'resume', 'cover_letter'
+    format: str  # 'md', 'txt', 'docx'
+    resume: Optional[Resume] = None  # An OptimizedResume is accepted; only Resume fields are rendered
+    coverLetter: Optional[CoverLetter] = None
+    fileName: Optional[str] = None
+
+class BulkExportRequest(BaseModel):
+    items: List[ExportRequest]
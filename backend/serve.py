@@ -0,0 +1,47 @@
+"""Production entry point: several uvicorn worker processes with shared state
+
+`python main.py` runs a single auto-reloading development server. This
+runs N workers (default: one per core, or WEB_CONCURRENCY) without the
+reload watcher. Caches and the LLM rate budget live in a SQLite WAL
+database (SHARED_STATE_DB) so they are shared by all workers instead of
+duplicated per process; use JOB_QUEUE_MODE=sqlite to share the job
+registry the same way.
+
+Run from backend/:
+    python serve.py --workers 4
+"""
+import os
+import argparse
+import uvicorn
+from dotenv import load_dotenv
+from services.shared_state import SQLiteCache
+from api.admission import websocket_server_settings
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--shared-state-db", default=os.getenv("SHARED_STATE_DB", "shared_state.db"))
+    args = parser.parse_args()
+
+    if args.workers > 1 and os.getenv("JOB_QUEUE_MODE", "off").lower() == "memory":
+        print("⚠️ JOB_QUEUE_MODE=memory keeps a separate job queue in each worker; use sqlite to share it")
+
+    # Worker processes inherit the environment, so they all open the same store
+    os.environ["SHARED_STATE_DB"] = args.shared_state_db
+    # Create the schema once before the workers race to do it
+    SQLiteCache(args.shared_state_db, "startup")
+
+    print(f"🚀 Starting {args.workers} worker(s) on {args.host}:{args.port} (shared state: {args.shared_state_db})")
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+        ws_per_message_deflate=os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true",
+        **websocket_server_settings()
+    )
@@ -1,9 +1,34 @@
 import os
-import json
 import re
-from openai import OpenAI
-from typing import Tuple, List
-from models.schemas import Resume, OptimizedResume, CoverLetter, ResumeChange
+import json
+import asyncio
+import hashlib
+from typing import Tuple, List, Optional
+from models.schemas import Resume, OptimizedResume, CoverLetter, CoverLetterVariant, CoverLetterVariants, OptimizationResult, PartialOptimizationResult, JobAnalysis
+from services.llm_client import LLMClient
+from services.model_router import ModelRouter
+from services.incremental_service import diff_resume, merge_optimized, rescore
+from services.change_diff import diff_resumes
+from services.skill_taxonomy import skill_taxonomy
+from services.job_analysis_service import JobAnalysisService, job_digest, job_description_hash
+from services.shared_state import get_cache
+from services.token_planner import TokenPlanner, TokenPlan
+from utils.profiling import profile_stage
+from utils.tokens import count_tokens
+
+# Optimization results keyed by (resume, job); shared across workers when SHARED_STATE_DB is set
+optimize_cache = get_cache('optimize')
+cover_letter_cache = get_cache('cover_letters')
+
+DEFAULT_COVER_LETTER_TONES = ("formal", "concise", "enthusiastic")
+
+# Guidance for the built-in tones; any other tone name is passed through as-is
+TONE_GUIDANCE = {
+    "formal": "Polished and traditional business register, measured and respectful.",
+    "concise": "Short and direct: 3 paragraphs at most, no filler, every sentence earns its place.",
+    "enthusiastic": "Warm and energetic, showing genuine excitement about the role, without hype or exaggeration.",
+    "conversational": "Friendly and natural, as if written to a future colleague, still professional.",
+}
 
 class AIService:
     """Service for AI-powered resume optimization using OpenAI"""
@@ -12,8 +37,10 @@ class AIService:
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-4-turbo-preview"  # or "gpt-3.5-turbo" for faster/cheaper
+        self.client = LLMClient(api_key)
+        self.router = ModelRouter()  # Per-task model selection, see services/model_router.py
+        self.job_analyzer = JobAnalysisService(self.client, self.router)
+        self.token_planner = TokenPlanner(self.router)  # Preflight size check, see services/token_planner.py
 
     async def optimize_resume(self, resume: Resume, job_description: str, progress_callback=None) -> Tuple[OptimizedResume, List[str]]:
         """Aggressively optimize and transform resume to match job description perfectly
@@ -25,15 +52,70 @@ class AIService:
         """
 
         resume_json = resume.model_dump_json(indent=2)
+        job_hash = job_description_hash(job_description)
+
+        cache_key = hashlib.sha256((resume_json + job_hash).encode()).hexdigest()
+        cached = await optimize_cache.aget(cache_key)
+        if cached is not None:
+            if progress_callback:
+                await progress_callback(82, "⚡ Same resume and job optimized before, reusing result...")
+            optimized_resume = OptimizedResume.model_validate_json(cached)
+            optimized_resume.jobHash = job_hash
+            return optimized_resume, optimized_resume.matchedKeywords
+
+        if progress_callback:
+            await progress_callback(65, "🔍 Analyzing job requirements...")
+
+        # Cached per posting, so repeat runs against the same job skip this call
+        with profile_stage('job_analysis'):
+            job_analysis = await self.job_analyzer.analyze(job_description)
 
         # Send initial progress
         if progress_callback:
             await progress_callback(70, "Preparing AI optimization prompt...")
 
+        messages = self._optimize_messages(resume_json, job_analysis)
+        plan = self.token_planner.plan('optimize', messages, OptimizationResult, source_text=resume_json)
+
+        if progress_callback:
+            await progress_callback(72, "Analyzing resume structure and job requirements...")
+
+        # Call OpenAI API (this is the long operation)
+        if progress_callback:
+            await progress_callback(75, "🤖 AI is analyzing your experience and skills...")
+
+        with profile_stage('optimize'), self.token_planner.track(plan):
+            if plan.strategy == 'chunked':
+                optimized_resume = await self._optimize_chunked(resume, job_analysis, plan)
+            else:
+                optimized_resume = await self.router.run(
+                    'optimize',
+                    lambda model: self.client.complete_structured(
+                        model=model,
+                        messages=messages,
+                        temperature=0.3,  # Lower temperature for more conservative, factual optimization
+                        response_model=OptimizationResult
+                    ),
+                    validate=lambda result: self._build_optimized_resume(resume, result),
+                    check=lambda optimized: self._detect_dropped_entries(resume, optimized),
+                    models=plan.models
+                )
+
+        # Lets a later incremental run check it targets the same posting
+        optimized_resume.jobHash = job_hash
+        await optimize_cache.aput(cache_key, optimized_resume.model_dump_json())
+
+        if progress_callback:
+            await progress_callback(82, "AI has finished! Parsing optimized resume...")
+
+        return optimized_resume, optimized_resume.matchedKeywords
+
+    def _optimize_messages(self, resume_json: str, job_analysis: JobAnalysis) -> list:
+        """Chat messages of a full optimization of the resume JSON"""
         prompt = f"""You are an ETHICAL resume optimization expert. Your goal is to help the candidate present their ACTUAL experience and skills in the most professional and compelling way, while maintaining complete honesty.
 
-🎯 TARGET JOB DESCRIPTION:
-{job_description}
+🎯 TARGET JOB (analyzed from the job description):
+{job_digest(job_analysis)}
 
 📄 CURRENT RESUME:
 {resume_json}
@@ -91,12 +173,6 @@ class AIService:
 - Keep education exactly as provided
 - Be honest about match score even if it's lower
 
-🎯 CONFIDENCE LEVELS FOR CHANGES:
-Mark each change with appropriate confidence:
-- "verified": Based directly on resume content (rephrasing, reorganizing)
-- "inferred": Reasonably implied from their work (e.g., if they deployed Docker containers, Docker is a skill)
-- "suggested": NOT used for optimization - only for skillGaps section
-
 🚨 REQUIRED RESPONSE FIELDS:
 Return ONLY valid JSON with ALL required fields:
 {{
@@ -126,12 +202,6 @@ Return ONLY valid JSON with ALL required fields:
       }}
     ]
   }},
-  "changes": [
-    {{"section": "Summary", "type": "modified", "description": "Rewritten to emphasize [specific relevant aspects]", "confidence": "verified"}},
-    {{"section": "Skills", "type": "modified", "description": "Added [skill] based on work with [specific project/technology mentioned]", "confidence": "inferred"}},
-    {{"section": "Experience", "type": "modified", "description": "Enhanced bullets to highlight [specific relevant work]", "confidence": "verified"}},
-    ...
-  ],
   "matchedKeywords": ["All keywords from job that genuinely appear in their experience"],
   "matchScore": 72,  // HONEST score - don't inflate!
   "potentialScore": 88,  // What they could achieve after learning skill gaps
@@ -154,55 +224,204 @@ Return ONLY valid JSON with ALL required fields:
 
 🎯 GOAL: Help the candidate present their best authentic self. Optimize presentation while maintaining complete honesty. Provide a realistic path to becoming a stronger candidate."""
 
-        if progress_callback:
-            await progress_callback(72, "Analyzing resume structure and job requirements...")
+        return [
+            {"role": "system", "content": "You are an ETHICAL resume optimization expert who helps candidates present their actual experience professionally. You NEVER fabricate skills or achievements. You focus on articulating what they've genuinely done using professional language. You provide honest match scores and helpful skill gap analysis. Always return valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
 
-        # Call OpenAI API (this is the long operation)
-        if progress_callback:
-            await progress_callback(75, "🤖 AI is analyzing your experience and skills...")
+    async def _optimize_chunked(self, resume: Resume, job_analysis: JobAnalysis, plan: TokenPlan) -> OptimizedResume:
+        """Optimize a resume too long for one call
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an ETHICAL resume optimization expert who helps candidates present their actual experience professionally. You NEVER fabricate skills or achievements. You focus on articulating what they've genuinely done using professional language. You provide honest match scores and helpful skill gap analysis. Always return valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,  # Lower temperature for more conservative, factual optimization
-            response_format={"type": "json_object"}
+        The full optimization (summary, skills, scores, skill gaps) runs on
+        the resume with as many of its first experience entries as fit. The
+        remaining entries are rewritten concurrently in batches with the
+        section prompt. Keywords are then re-checked against the whole
+        result, and changes are diffed against the whole original.
+        """
+        model = plan.models[0]
+        base_tokens = count_tokens(resume.model_copy(update={'experience': []}).model_dump_json(indent=2), model)
+        instructions = self.token_planner.count_request(self._optimize_messages('', job_analysis), OptimizationResult, model)
+        head_budget = self.token_planner.chunk_tokens(plan, instructions) - base_tokens
+        head_count = len(_batches([count_tokens(exp.model_dump_json(indent=2), model) for exp in resume.experience], head_budget)[0])
+        head_resume = resume.model_copy(update={'experience': resume.experience[:head_count]})
+        rest = resume.experience[head_count:]
+
+        situation = "This is part of a resume too long to optimize in one pass; its other entries are optimized separately."
+        section_instructions = self.token_planner.count_request(
+            self._sections_messages({"experience": []}, job_analysis, situation), PartialOptimizationResult, model
+        )
+        batch_budget = self.token_planner.chunk_tokens(plan, section_instructions)
+        batches = _batches([count_tokens(json.dumps(exp.model_dump(), indent=2), model) for exp in rest], batch_budget) if rest else []
+        print(f"   Optimizing {head_count} entries with the full prompt and {len(rest)} in {len(batches)} batches")
+
+        head, *partials = await asyncio.gather(
+            self.router.run(
+                'optimize',
+                lambda model: self.client.complete_structured(
+                    model=model,
+                    messages=self._optimize_messages(head_resume.model_dump_json(indent=2), job_analysis),
+                    temperature=0.3,
+                    response_model=OptimizationResult
+                ),
+                validate=lambda result: self._build_optimized_resume(head_resume, result),
+                check=lambda optimized: self._detect_dropped_entries(head_resume, optimized),
+                models=plan.models
+            ),
+            *(
+                self._optimize_sections({"experience": [rest[i].model_dump() for i in batch]}, job_analysis, situation, plan.models)
+                for batch in batches
+            )
         )
 
+        # Entries a batch did not return keep their original text
+        rewritten = {exp.id: exp for partial in partials for exp in partial.experience}
+        merged = Resume(
+            contact=head.contact,
+            summary=head.summary,
+            experience=head.experience + [rewritten.get(exp.id, exp) for exp in rest],
+            education=head.education,
+            skills=head.skills
+        )
+        optimized_resume = rescore(head, merged)
+        optimized_resume.changes = diff_resumes(resume, merged)
+        return optimized_resume
+
+    @staticmethod
+    def can_optimize_incrementally(previous_optimized: Optional[OptimizedResume], job_description: str) -> bool:
+        """Whether `previous_optimized` was built for this job description and can be reused"""
+        return previous_optimized is not None and previous_optimized.jobHash == job_description_hash(job_description)
+
+    async def optimize_resume_incremental(
+        self,
+        resume: Resume,
+        job_description: str,
+        previous_resume: Resume,
+        previous_optimized: OptimizedResume,
+        progress_callback=None
+    ) -> Tuple[OptimizedResume, List[str]]:
+        """Re-optimize only the sections that changed since the previous run
+
+        Experience entries are diffed by `id` against the resume the previous
+        result was built from. Unchanged entries reuse the previous optimized
+        output, only edited ones go to the AI, and matchScore is recomputed
+        locally. If the previous result was built for a different job
+        description (see `can_optimize_incrementally`), the whole resume is
+        optimized again.
+
+        Args:
+            resume: The edited resume
+            job_description: The target job description
+            previous_resume: The resume the previous result was optimized from
+            previous_optimized: The previous optimized result
+            progress_callback: Optional async function to call with (progress%, message)
+        """
+        if not self.can_optimize_incrementally(previous_optimized, job_description):
+            print("🔁 Previous result was optimized for another job description, optimizing from scratch")
+            return await self.optimize_resume(resume, job_description, progress_callback=progress_callback)
+
+        diff = diff_resume(previous_resume, resume, previous_optimized)
+        partial = PartialOptimizationResult(experience=[])
+
+        if diff.needs_ai:
+            changed_entries = [exp for exp in resume.experience if exp.id in diff.changed_experience_ids]
+            sections = {"experience": [exp.model_dump() for exp in changed_entries]}
+            if diff.summary_changed:
+                sections["summary"] = resume.summary
+            if diff.skills_changed:
+                sections["skills"] = [skill.model_dump() for skill in resume.skills]
+
+            if progress_callback:
+                await progress_callback(60, f"🤖 Re-optimizing {len(changed_entries)} edited entries...")
+
+            job_analysis = await self.job_analyzer.analyze(job_description)
+
+            partial = await self._optimize_sections(
+                sections, job_analysis, "The candidate edited part of a resume that was already optimized for this job."
+            )
+
         if progress_callback:
-            await progress_callback(82, "AI has finished! Parsing optimized resume...")
+            await progress_callback(80, "📊 Recalculating match score...")
 
-        result = json.loads(response.choices[0].message.content)
+        merged = merge_optimized(resume, previous_optimized, diff, partial.summary, partial.skills, partial.experience)
+        optimized_resume = rescore(previous_optimized, merged)
+        optimized_resume.changes = diff_resumes(resume, merged)
+        optimized_resume.jobHash = previous_optimized.jobHash
 
-        # Validate that AI provided required fields
-        if 'matchScore' not in result:
-            raise ValueError("AI response missing matchScore - this is required for accurate matching")
+        return optimized_resume, optimized_resume.matchedKeywords
 
-        if 'matchedKeywords' not in result or not result.get('matchedKeywords'):
-            raise ValueError("AI response missing matchedKeywords - this is required for keyword analysis")
+    def _sections_messages(self, sections: dict, job_analysis: JobAnalysis, situation: str) -> list:
+        """Chat messages optimizing only the given sections; `situation` says why they are sent alone"""
+        prompt = f"""You are an ETHICAL resume optimization expert. {situation} Optimize ONLY the sections below.
+
+🎯 TARGET JOB (analyzed from the job description):
+{job_digest(job_analysis)}
+
+✏️ SECTIONS TO OPTIMIZE:
+{json.dumps(sections, indent=2)}
 
-        # Extract keywords from job description
-        keywords = result.get('matchedKeywords', [])
+📋 RULES:
+- Rewrite bullets to emphasize job-relevant aspects of their ACTUAL work, using strong action verbs
+- Never add skills, metrics or technologies that are not evidenced in the text
+- Keep every entry's id, company, position, location and dates exactly as provided
+- Return every experience entry listed above (same ids); return "summary" and "skills" only if they were provided, otherwise null
 
-        # Ensure skillGaps defaults to empty list if not provided
-        skill_gaps = result.get('skillGaps', [])
-        potential_score = result.get('potentialScore', None)
+Return ONLY valid JSON."""
+        return [
+            {"role": "system", "content": "You are an ETHICAL resume optimization expert who helps candidates present their actual experience professionally. You NEVER fabricate skills or achievements. Always return valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
 
-        # Build OptimizedResume with AI-computed values
-        from models.schemas import SkillGap
+    async def _optimize_sections(
+        self,
+        sections: dict,
+        job_analysis: JobAnalysis,
+        situation: str,
+        models: Optional[List[str]] = None
+    ) -> PartialOptimizationResult:
+        messages = self._sections_messages(sections, job_analysis, situation)
+        return await self.router.run(
+            'optimize',
+            lambda model: self.client.complete_structured(
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                response_model=PartialOptimizationResult
+            ),
+            models=models
+        )
 
-        optimized_resume = OptimizedResume(
-            **result['optimizedResume'],
-            changes=[ResumeChange(**change) for change in result.get('changes', [])],
-            matchScore=result['matchScore'],
-            matchedKeywords=result['matchedKeywords'],
-            skillGaps=[SkillGap(**gap) for gap in skill_gaps] if skill_gaps else [],
-            potentialScore=potential_score
+    def _build_optimized_resume(self, resume: Resume, result: OptimizationResult) -> OptimizedResume:
+        """Flatten a validated optimization response into an OptimizedResume
+
+        The change list is diffed locally against the original resume rather
+        than generated by the model.
+        """
+        if not result.matchedKeywords:
+            raise ValueError("AI response missing matchedKeywords - this is required for keyword analysis")
+
+        with profile_stage('diff'):
+            changes = diff_resumes(resume, result.optimizedResume)
+
+        # The validated sections are passed as models, not dumped to dicts
+        # and validated again: pydantic keeps model instances as they are
+        return OptimizedResume(
+            **dict(result.optimizedResume),
+            changes=changes,
+            matchScore=result.matchScore,
+            # "JS", "JavaScript" and "Javascript" count as one matched keyword
+            matchedKeywords=skill_taxonomy.canonicalize_all(result.matchedKeywords),
+            skillGaps=result.skillGaps,
+            potentialScore=result.potentialScore
         )
 
-        return optimized_resume, keywords
+    def _detect_dropped_entries(self, resume: Resume, optimized: OptimizedResume) -> List[str]:
+        """Report experience/education entries the model dropped while optimizing"""
+        problems = []
+        if len(optimized.experience) < len(resume.experience):
+            problems.append(f"Optimized resume has {len(optimized.experience)} of {len(resume.experience)} experience entries")
+        if len(optimized.education) < len(resume.education):
+            problems.append(f"Optimized resume has {len(optimized.education)} of {len(resume.education)} education entries")
+        return problems
 
     async def generate_cover_letter(
         self,
@@ -222,19 +441,81 @@ Return ONLY valid JSON with ALL required fields:
             progress_callback: Optional async function for progress updates
         """
 
-        resume_json = resume.model_dump_json(indent=2)
+        # Usually already cached by the optimization run for the same posting
+        job_analysis = await self.job_analyzer.analyze(job_description)
 
         if progress_callback:
             await progress_callback(85, "Preparing cover letter prompt...")
 
-        prompt = f"""You are a professional cover letter writer who helps candidates create honest, compelling cover letters based on their actual experience and qualifications.
+        def messages_for(resume: Resume) -> list:
+            prompt = self._cover_letter_brief(resume, job_analysis, job_title, company) + f"""Return ONLY valid JSON:
+{{
+  "greeting": "Dear Hiring Manager," (or the hiring manager's name if given above),
+  "opening": "Professional opening expressing genuine interest and relevant background...",
+  "body": [
+    "Body paragraph 1: Specific real achievements from resume relevant to the role...",
+    "Body paragraph 2: Genuine explanation of why this role interests them and how their experience aligns...",
+    "Body paragraph 3 (optional): Contribution they can make and willingness to grow..."
+  ],
+  "closing": "Professional closing expressing interest in further discussion...",
+  "signature": "Sincerely,\\n{resume.contact.name}"
+}}
+
+🎯 GOAL: Write an honest, professional cover letter that accurately represents the candidate's qualifications and genuine interest in the role."""
+            return [
+                {"role": "system", "content": "You are a professional cover letter writer who creates honest, well-written cover letters based on candidates' actual experience. You NEVER exaggerate or fabricate achievements. You write genuinely and professionally. Always return valid JSON."},
+                {"role": "user", "content": prompt}
+            ]
+
+        if progress_callback:
+            await progress_callback(88, "🤖 AI is crafting your compelling cover letter...")
+
+        messages = messages_for(resume)
+        plan = self.token_planner.plan('cover_letter', messages, CoverLetter)
+        if plan.strategy == 'chunked':
+            messages = messages_for(self._fit_resume(resume, plan, messages_for, CoverLetter))
+
+        with self.token_planner.track(plan):
+            cover_letter = await self.router.run(
+                'cover_letter',
+                lambda model: self.client.complete_structured(
+                    model=model,
+                    messages=messages,
+                    temperature=0.5,  # Moderate temperature for professional, grounded writing
+                    response_model=CoverLetter
+                ),
+                models=plan.models
+            )
+
+        if progress_callback:
+            await progress_callback(95, "Cover letter generated! Finalizing...")
+
+        return cover_letter
+
+    def _fit_resume(self, resume: Resume, plan: TokenPlan, messages_for, response_model, outputs: int = 1) -> Resume:
+        """The resume with as many of its first (most recent) experience entries as fit one request of the plan
+
+        A cover letter cannot be written in parts, so this is its chunked strategy.
+        """
+        model = plan.models[0]
+        instructions = self.token_planner.count_request(messages_for(resume.model_copy(update={'experience': []})), response_model, model)
+        budget = self.token_planner.chunk_tokens(plan, instructions, outputs)
+        count = len(_batches([count_tokens(exp.model_dump_json(indent=2), model) for exp in resume.experience], budget)[0])
+        print(f"   Sending the {count} most recent of {len(resume.experience)} experience entries")
+        return resume.model_copy(update={'experience': resume.experience[:count]})
+
+    def _cover_letter_brief(self, resume: Resume, job_analysis: JobAnalysis, job_title: str, company: str) -> str:
+        """Cover-letter instructions shared by single and multi-variant generation"""
+        resume_json = resume.model_dump_json(indent=2)
+
+        return f"""You are a professional cover letter writer who helps candidates create honest, compelling cover letters based on their actual experience and qualifications.
 
 🎯 TARGET POSITION:
 Job Title: {job_title}
 Company: {company}
 
-📋 JOB DESCRIPTION:
-{job_description}
+📋 JOB REQUIREMENTS (analyzed from the job description):
+{job_digest(job_analysis)}
 
 👤 CANDIDATE'S OPTIMIZED RESUME:
 {resume_json}
@@ -291,40 +572,140 @@ Paragraph 3 (Optional) - Growth & Contribution:
 - Don't claim expertise they don't have
 - Keep it genuine and professional
 
-Return ONLY valid JSON:
-{{
-  "greeting": "Dear Hiring Manager," (or specific name if in job description),
-  "opening": "Professional opening expressing genuine interest and relevant background...",
-  "body": [
-    "Body paragraph 1: Specific real achievements from resume relevant to the role...",
-    "Body paragraph 2: Genuine explanation of why this role interests them and how their experience aligns...",
-    "Body paragraph 3 (optional): Contribution they can make and willingness to grow..."
-  ],
-  "closing": "Professional closing expressing interest in further discussion...",
-  "signature": "Sincerely,\\n{resume.contact.name}"
-}}
+"""
 
-🎯 GOAL: Write an honest, professional cover letter that accurately represents the candidate's qualifications and genuine interest in the role."""
+    async def generate_cover_letter_variants(
+        self,
+        resume: Resume,
+        job_description: str,
+        job_title: str = "the position",
+        company: str = "your company",
+        tones: Optional[List[str]] = None,
+        progress_callback=None
+    ) -> List[CoverLetterVariant]:
+        """Generate one cover letter per tone in a single call
+
+        The resume and job digest are sent once for all variants, and the
+        result is cached per (resume, job, tones) so switching between
+        variants, or asking again, does not call the model.
+
+        Args:
+            resume: The optimized resume
+            job_description: The target job description
+            job_title: The job title
+            company: The company name
+            tones: Tones to write, in order (default: formal, concise, enthusiastic)
+            progress_callback: Optional async function for progress updates
+
+        Returns the variants the model wrote, in the requested order. If it
+        skipped some tones on every routed model, the list is shorter than
+        `tones` (possibly empty) and is not cached.
+        """
+        tones = list(tones or DEFAULT_COVER_LETTER_TONES)
+
+        cache_key = hashlib.sha256(json.dumps(
+            [resume.model_dump_json(), job_description_hash(job_description), job_title, company, tones]
+        ).encode()).hexdigest()
+        cached = await cover_letter_cache.aget(cache_key)
+        if cached is not None:
+            if progress_callback:
+                await progress_callback(95, "⚡ Reusing your cover letter variants...")
+            return CoverLetterVariants.model_validate_json(cached).variants
+
+        job_analysis = await self.job_analyzer.analyze(job_description)
 
         if progress_callback:
-            await progress_callback(88, "🤖 AI is crafting your compelling cover letter...")
+            await progress_callback(85, f"Preparing {len(tones)} cover letter variants...")
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a professional cover letter writer who creates honest, well-written cover letters based on candidates' actual experience. You NEVER exaggerate or fabricate achievements. You write genuinely and professionally. Always return valid JSON."},
+        tone_lines = "\n".join(f'- "{tone}": {TONE_GUIDANCE.get(tone, f"Written in a {tone} tone.")}' for tone in tones)
+
+        def messages_for(resume: Resume) -> list:
+            prompt = self._cover_letter_brief(resume, job_analysis, job_title, company) + f"""🎭 VARIANTS:
+Write {len(tones)} alternative versions of this cover letter, one for each tone below and in this order. Every version follows all the requirements above; the tone guidance below replaces the TONE section.
+{tone_lines}
+
+Return ONLY valid JSON:
+{{
+  "variants": [
+    {{
+      "tone": "{tones[0]}",
+      "coverLetter": {{
+        "greeting": "Dear Hiring Manager,",
+        "opening": "...",
+        "body": ["...", "..."],
+        "closing": "...",
+        "signature": "Sincerely,\\n{resume.contact.name}"
+      }}
+    }},
+    ...one entry per tone
+  ]
+}}"""
+            return [
+                {"role": "system", "content": "You are a professional cover letter writer who creates honest, well-written cover letters based on candidates' actual experience. You NEVER exaggerate or fabricate achievements. Always return valid JSON."},
                 {"role": "user", "content": prompt}
-            ],
-            temperature=0.5,  # Moderate temperature for professional, grounded writing
-            response_format={"type": "json_object"}
-        )
+            ]
 
         if progress_callback:
-            await progress_callback(95, "Cover letter generated! Finalizing...")
+            await progress_callback(88, "🤖 AI is writing your cover letter variants...")
+
+        def missing_tones(result: CoverLetterVariants) -> List[str]:
+            missing = set(tones) - {variant.tone for variant in result.variants}
+            return [f"Missing cover letter variants: {', '.join(sorted(missing))}"] if missing else []
+
+        messages = messages_for(resume)
+        plan = self.token_planner.plan('cover_letter', messages, CoverLetterVariants, outputs=len(tones))
+        if plan.strategy == 'chunked':
+            messages = messages_for(self._fit_resume(resume, plan, messages_for, CoverLetterVariants, outputs=len(tones)))
+
+        with self.token_planner.track(plan):
+            result = await self.router.run(
+                'cover_letter',
+                lambda model: self.client.complete_structured(
+                    model=model,
+                    messages=messages,
+                    temperature=0.5,
+                    response_model=CoverLetterVariants
+                ),
+                check=missing_tones,
+                models=plan.models
+            )
+
+        # Keep the requested order, one variant per tone
+        by_tone = {variant.tone: variant for variant in result.variants}
+        variants = [by_tone[tone] for tone in tones if tone in by_tone]
+        if len(variants) == len(tones):
+            await cover_letter_cache.aput(cache_key, CoverLetterVariants(variants=variants).model_dump_json())
+        else:
+            # Not cached, so asking again gets a fresh attempt at the missing tones
+            print(f"⚠️ Cover letter variants: got {len(variants)} of {len(tones)} tones, not caching")
 
-        result = json.loads(response.choices[0].message.content)
+        if progress_callback:
+            await progress_callback(95, "Cover letter variants generated! Finalizing...")
 
-        return CoverLetter(**result)
+        return variants
+
+    async def generate_cover_letters(
+        self,
+        resume: Resume,
+        job_description: str,
+        job_title: str = "the position",
+        company: str = "your company",
+        tones: Optional[List[str]] = None,
+        progress_callback=None
+    ) -> Tuple[CoverLetter, Optional[List[CoverLetterVariant]]]:
+        """Cover letter for an optimize request: a single letter, or variants when `tones` is given
+
+        Returns:
+            tuple: (cover_letter, variants) where cover_letter is the first variant in variants mode.
+            If the model wrote none of the tones, a single letter is generated instead and variants is None.
+        """
+        with profile_stage('cover_letter'):
+            if tones:
+                variants = await self.generate_cover_letter_variants(resume, job_description, job_title, company, tones, progress_callback)
+                if variants:
+                    return variants[0].coverLetter, variants
+                print(f"⚠️ No cover letter variants for tones {', '.join(tones)}, writing a single cover letter instead")
+            return await self.generate_cover_letter(resume, job_description, job_title, company, progress_callback), None
 
     def _extract_keywords(self, job_description: str) -> List[str]:
         """Extract key technical and professional keywords from job description"""
@@ -349,3 +730,14 @@ Return ONLY valid JSON:
 
         # Remove duplicates and return unique keywords
         return list(dict.fromkeys(keywords))[:20]
+
+def _batches(sizes: List[int], budget: int) -> List[List[int]]:
+    """Indices of consecutive items grouped so each group's sizes sum to at most `budget` (at least one item per group)"""
+    batches, used = [], 0
+    for i, size in enumerate(sizes):
+        if not batches or used + size > budget:
+            batches.append([])
+            used = 0
+        batches[-1].append(i)
+        used += size
+    return batches or [[]]
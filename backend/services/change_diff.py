@@ -0,0 +1,179 @@
+from difflib import SequenceMatcher
+from typing import List, Optional, Tuple
+from models.schemas import Resume, Experience, Education, ResumeChange
+from services.skill_taxonomy import skill_taxonomy
+from services.incremental_service import resume_text, mentions
+
+# Below this word-level similarity a field counts as rewritten rather than reworded
+REWRITE_RATIO = 0.5
+
+EXPERIENCE_FIELDS = ('company', 'position', 'location', 'startDate', 'endDate')
+EDUCATION_FIELDS = ('institution', 'degree', 'field', 'location', 'startDate', 'endDate', 'gpa')
+
+def changed_span(before: str, after: str) -> Tuple[str, str, float]:
+    """Smallest word span that differs between two strings, plus their similarity
+
+    The unchanged words shared at the start and end are trimmed, so a one
+    word edit in a long bullet reports just that word on each side.
+    """
+    a, b = before.split(), after.split()
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    edits = [op for op in matcher.get_opcodes() if op[0] != 'equal']
+    if not edits:
+        return "", "", 1.0
+    first, last = edits[0], edits[-1]
+    return ' '.join(a[first[1]:last[2]]), ' '.join(b[first[3]:last[4]]), matcher.ratio()
+
+def _text_change(section: str, label: str, before: str, after: str) -> Optional[ResumeChange]:
+    if before == after:
+        return None
+    if not before.strip():
+        return ResumeChange(section=section, type="added", description=f"Added {label}", after=after)
+
+    before_span, after_span, ratio = changed_span(before, after)
+    if ratio < REWRITE_RATIO:
+        return ResumeChange(section=section, type="modified", description=f"Rewrote {label}", before=before, after=after)
+    if not before_span and not after_span:
+        # Only whitespace differs
+        return None
+    return ResumeChange(
+        section=section,
+        type="modified",
+        description=f"Reworded {label}",
+        before=before_span,
+        after=after_span
+    )
+
+def _diff_bullets(section: str, owner: str, before: List[str], after: List[str]) -> List[ResumeChange]:
+    """Align two bullet lists and describe added, removed, reworded and reordered bullets"""
+    if before == after:
+        return []
+    if sorted(before) == sorted(after):
+        return [ResumeChange(section=section, type="reordered", description=f"Reordered bullets for {owner}")]
+
+    changes = []
+    matcher = SequenceMatcher(None, before, after, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        old, new = before[i1:i2], after[j1:j2]
+        # Pair replaced bullets positionally; the surplus on either side was added or removed
+        for old_bullet, new_bullet in zip(old, new):
+            change = _text_change(section, f"bullet for {owner}", old_bullet, new_bullet)
+            if change:
+                changes.append(change)
+        for new_bullet in new[len(old):]:
+            changes.append(ResumeChange(section=section, type="added", description=f"Added bullet for {owner}", confidence="inferred", after=new_bullet))
+        for old_bullet in old[len(new):]:
+            changes.append(ResumeChange(section=section, type="removed", description=f"Removed bullet for {owner}", before=old_bullet))
+    return changes
+
+def _diff_fields(section: str, owner: str, before, after, fields) -> List[ResumeChange]:
+    changes = []
+    for field in fields:
+        old, new = getattr(before, field) or "", getattr(after, field) or ""
+        change = _text_change(section, f"{field} for {owner}", old, new)
+        if change:
+            changes.append(change)
+    return changes
+
+def _match_entries(before: list, after: list) -> List[Tuple[Optional[object], Optional[object]]]:
+    """Pair entries by id, falling back to position for entries whose id changed"""
+    before_by_id = {entry.id: entry for entry in before}
+    after_ids = {entry.id for entry in after}
+    unmatched_before = [entry for entry in before if entry.id not in after_ids]
+
+    pairs = []
+    for entry in after:
+        if entry.id in before_by_id:
+            pairs.append((before_by_id[entry.id], entry))
+        elif unmatched_before:
+            pairs.append((unmatched_before.pop(0), entry))
+        else:
+            pairs.append((None, entry))
+    pairs.extend((entry, None) for entry in unmatched_before)
+    return pairs
+
+def _diff_experience(before: List[Experience], after: List[Experience]) -> List[ResumeChange]:
+    changes = []
+    for old, new in _match_entries(before, after):
+        if old is None:
+            changes.append(ResumeChange(section="Experience", type="added", description=f"Added entry at {new.company}", confidence="suggested"))
+        elif new is None:
+            changes.append(ResumeChange(section="Experience", type="removed", description=f"Removed entry at {old.company}"))
+        else:
+            changes.extend(_diff_fields("Experience", old.company, old, new, EXPERIENCE_FIELDS))
+            changes.extend(_diff_bullets("Experience", old.company, old.description, new.description))
+            changes.extend(_diff_bullets("Experience", old.company, old.highlights or [], new.highlights or []))
+    return changes
+
+def _diff_education(before: List[Education], after: List[Education]) -> List[ResumeChange]:
+    changes = []
+    for old, new in _match_entries(before, after):
+        if old is None:
+            changes.append(ResumeChange(section="Education", type="added", description=f"Added entry at {new.institution}", confidence="suggested"))
+        elif new is None:
+            changes.append(ResumeChange(section="Education", type="removed", description=f"Removed entry at {old.institution}"))
+        else:
+            changes.extend(_diff_fields("Education", old.institution, old, new, EDUCATION_FIELDS))
+            changes.extend(_diff_bullets("Education", old.institution, old.achievements or [], new.achievements or []))
+    return changes
+
+def _diff_skills(before: Resume, after: Resume) -> List[ResumeChange]:
+    """Classify skill edits by the evidence for them in the original resume
+
+    A new skill mentioned anywhere in the original text is "inferred"; one
+    with no evidence at all is "suggested" so the user knows to check it.
+    Skills are compared by canonical name, so renaming "JS" to "JavaScript"
+    is not a removal plus an addition, and "Javascript" in a bullet is
+    evidence for "JavaScript".
+    """
+    key = skill_taxonomy.canonical_key
+    old_items = [item for skill in before.skills for item in skill.items]
+    new_items = [item for skill in after.skills for item in skill.items]
+    old_keys = {key(item) for item in old_items}
+    new_keys = {key(item) for item in new_items}
+
+    changes = []
+    text = resume_text(before, include_skills=False)
+    evidence = set(skill_taxonomy.extract(text))
+    added = [item for item in dict.fromkeys(new_items) if key(item) not in old_keys]
+    inferred = [item for item in added if key(item) in evidence or mentions(text, item)]
+    suggested = [item for item in added if item not in inferred]
+    if inferred:
+        changes.append(ResumeChange(section="Skills", type="added", description="Added skills evidenced in your experience", confidence="inferred", after=', '.join(inferred)))
+    if suggested:
+        changes.append(ResumeChange(section="Skills", type="added", description="Added skills not mentioned elsewhere in your resume", confidence="suggested", after=', '.join(suggested)))
+
+    removed = [item for item in dict.fromkeys(old_items) if key(item) not in new_keys]
+    if removed:
+        changes.append(ResumeChange(section="Skills", type="removed", description="Removed skills", before=', '.join(removed)))
+
+    old_layout = [(skill.category, [key(item) for item in skill.items if key(item) in new_keys]) for skill in before.skills]
+    new_layout = [(skill.category, [key(item) for item in skill.items if key(item) in old_keys]) for skill in after.skills]
+    if [entry for entry in old_layout if entry[1]] != [entry for entry in new_layout if entry[1]]:
+        changes.append(ResumeChange(
+            section="Skills",
+            type="reordered",
+            description="Reorganized skill categories for relevance",
+            before=', '.join(skill.category for skill in before.skills),
+            after=', '.join(skill.category for skill in after.skills)
+        ))
+    return changes
+
+def diff_resumes(original: Resume, optimized: Resume) -> List[ResumeChange]:
+    """Describe every edit between a resume and its optimized version
+
+    Computed locally field by field, so the optimization call no longer has
+    to generate (and can no longer misreport) its own change list. Text
+    fields get word-level before/after spans; contact details are never
+    rewritten and are not compared.
+    """
+    changes = []
+    summary_change = _text_change("Summary", "summary", original.summary, optimized.summary)
+    if summary_change:
+        changes.append(summary_change)
+    changes.extend(_diff_experience(original.experience, optimized.experience))
+    changes.extend(_diff_education(original.education, optimized.education))
+    changes.extend(_diff_skills(original, optimized))
+    return changes
@@ -0,0 +1,89 @@
+from models.schemas import Resume, CompletenessIssue, CompletenessReport
+from services.text_utils import BULLET_MARKERS, parsed_words, section_heading, words
+
+# A section needs this many distinct words before its coverage is judged
+MIN_SECTION_WORDS = 20
+
+# Coverage below these ratios is reported
+SECTION_COVERAGE_THRESHOLD = 0.6
+OVERALL_COVERAGE_THRESHOLD = 0.7
+
+def analyze_completeness(resume: Resume, extracted_text: str) -> CompletenessReport:
+    """Measure how much of the extracted text made it into the parsed resume
+
+    The text is scanned once: each line is classified as a section heading,
+    a bullet or content, and its words are attributed to the current
+    section. Coverage is the share of a section's distinct words that appear
+    anywhere in the parsed resume (text before the first heading is checked
+    against the whole resume, since it usually holds contact details and a
+    summary).
+    """
+    section_words = {'header': set()}
+    section_bullets = {'header': 0}
+    headings_found = set()
+    section = 'header'
+
+    for raw_line in extracted_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = section_heading(line)
+        if heading:
+            section = heading
+            headings_found.add(heading)
+            section_words.setdefault(section, set())
+            section_bullets.setdefault(section, 0)
+            continue
+        if line.startswith(BULLET_MARKERS):
+            section_bullets[section] += 1
+        section_words[section].update(words(line))
+
+    parsed = parsed_words(resume)
+    all_parsed = set().union(*parsed.values())
+
+    coverage = {}
+    for name, found in section_words.items():
+        if found:
+            coverage[name] = round(len(found & all_parsed) / len(found), 3)
+    all_words = set().union(*section_words.values())
+    overall = round(len(all_words & all_parsed) / len(all_words), 3) if all_words else 1.0
+    coverage['overall'] = overall
+
+    issues = []
+
+    # Bullets belong to experience when it has a heading, otherwise count the whole document
+    text_bullets = section_bullets.get('experience', 0) if 'experience' in headings_found else sum(section_bullets.values())
+    parsed_bullets = sum(len(exp.description) for exp in resume.experience)
+    if text_bullets > parsed_bullets * 1.5 and text_bullets > 5:
+        issues.append(CompletenessIssue(
+            code='bullets_missing',
+            section='experience',
+            message=f"⚠️ Possible data loss: Found {text_bullets} bullet points in original but only {parsed_bullets} parsed",
+            coverage=round(parsed_bullets / text_bullets, 3)
+        ))
+
+    for name in ('experience', 'education', 'skills'):
+        if name in headings_found and not getattr(resume, name):
+            issues.append(CompletenessIssue(
+                code='section_missing',
+                section=name,
+                message=f"⚠️ '{name}' section found in text but not parsed",
+                coverage=0.0
+            ))
+        elif name in coverage and len(section_words[name]) >= MIN_SECTION_WORDS and coverage[name] < SECTION_COVERAGE_THRESHOLD:
+            issues.append(CompletenessIssue(
+                code='section_incomplete',
+                section=name,
+                message=f"⚠️ '{name}' section seems incomplete ({coverage[name]:.0%} of its words were parsed)",
+                coverage=coverage[name]
+            ))
+
+    if len(all_words) >= MIN_SECTION_WORDS and overall < OVERALL_COVERAGE_THRESHOLD:
+        issues.append(CompletenessIssue(
+            code='content_missing',
+            section='overall',
+            message=f"⚠️ Parsed resume seems incomplete ({overall:.0%} of the original words were parsed)",
+            coverage=overall
+        ))
+
+    return CompletenessReport(coverage=coverage, issues=issues)
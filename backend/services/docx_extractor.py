@@ -0,0 +1,162 @@
+import zipfile
+import posixpath
+from typing import BinaryIO, Iterator, List
+from lxml import etree
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+P, T, TAB, BR, CR, TC, TR, BODY = (W + 'p', W + 't', W + 'tab', W + 'br', W + 'cr', W + 'tc', W + 'tr', W + 'body')
+NO_BREAK_HYPHEN = W + 'noBreakHyphen'
+NUM_PR, P_STYLE, VAL = W + 'numPr', W + 'pStyle', W + 'val'
+# List paragraphs get the bullet Word draws for them, as in PDF text
+BULLET = '• '
+# Text boxes are written twice (DrawingML and a VML fallback); only the first copy is read
+FALLBACK = MC + 'Fallback'
+# The only elements the parser reports: text and its containers, plus the
+# other top-level body blocks (tables, content controls) so they can be dropped
+EVENT_TAGS = (P, T, TAB, BR, CR, TC, TR, NO_BREAK_HYPHEN, NUM_PR, P_STYLE, FALLBACK, W + 'tbl', W + 'sdt', W + 'sectPr')
+
+# Table rows whose cells each hold one short paragraph are joined into one
+# "cell | cell" line, the layout the resume parser reads as company | position
+MAX_JOINED_CELL_CHARS = 80
+
+def _parse(part) -> Iterator[tuple]:
+    # Uploads are untrusted: never resolve entities or fetch anything
+    return etree.iterparse(part, events=('start', 'end'), tag=EVENT_TAGS, resolve_entities=False, no_network=True, huge_tree=False)
+
+def _relationships(archive: zipfile.ZipFile, part_name: str) -> List[tuple]:
+    """(type, target part name) of a part's relationships, in file order"""
+    folder, name = posixpath.split(part_name)
+    rels_name = posixpath.join(folder, '_rels', f'{name}.rels')
+    if rels_name not in archive.namelist():
+        return []
+    with archive.open(rels_name) as f:
+        root = etree.parse(f, etree.XMLParser(resolve_entities=False, no_network=True)).getroot()
+    return [
+        (rel.get('Type', '').rsplit('/', 1)[-1], posixpath.normpath(posixpath.join(folder, rel.get('Target', ''))).lstrip('/'))
+        for rel in root.iter(REL + 'Relationship')
+        if rel.get('TargetMode') != 'External'
+    ]
+
+def _part_lines(part: BinaryIO) -> Iterator[str]:
+    """Lines of text of one WordprocessingML part, in document order
+
+    Each paragraph is a line; tabs and line breaks inside it are kept.
+    Paragraphs nested in a text box are emitted where the text box ends,
+    before the rest of the paragraph anchoring it. Elements are cleared as
+    soon as they are read, so memory stays bounded by the largest paragraph
+    or table row rather than the document.
+    """
+    paragraphs: List[List[str]] = []  # Text of each open paragraph (text boxes nest them)
+    list_items: List[bool] = []  # Whether each open paragraph is a list item
+    rows: List[List[List[str]]] = []  # Cells of each open table row, as lists of paragraph texts
+    fallback_depth = 0
+
+    for event, element in _parse(part):
+        tag = element.tag
+        if event == 'start':
+            if tag == FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                continue
+            elif tag == P:
+                paragraphs.append([])
+                list_items.append(False)
+            elif tag == TR:
+                rows.append([])
+            elif tag == TC and rows:
+                rows[-1].append([])
+            continue
+
+        if tag == FALLBACK:
+            fallback_depth -= 1
+            element.clear()
+            continue
+        if fallback_depth:
+            continue
+
+        if tag == T and paragraphs:
+            if element.text:
+                paragraphs[-1].append(element.text)
+        elif tag == TAB and paragraphs and element.getparent() is not None and element.getparent().tag == W + 'r':
+            paragraphs[-1].append('\t')
+        elif tag in (BR, CR) and paragraphs:
+            paragraphs[-1].append('\n')
+        elif tag == NO_BREAK_HYPHEN and paragraphs:
+            paragraphs[-1].append('-')
+        elif tag == NUM_PR and paragraphs:
+            list_items[-1] = True
+        elif tag == P_STYLE and paragraphs and element.get(VAL, '').startswith('List'):
+            list_items[-1] = True
+        elif tag == P:
+            text = ''.join(paragraphs.pop()).strip()
+            if list_items.pop() and text:
+                text = BULLET + text
+            if text:
+                if rows and rows[-1]:
+                    rows[-1][-1].append(text)
+                else:
+                    yield text
+            element.clear()
+        elif tag == TR and rows:
+            cells = [cell for cell in rows.pop() if cell]
+            if cells and all(len(cell) == 1 and len(cell[0]) <= MAX_JOINED_CELL_CHARS for cell in cells):
+                row_lines = [' | '.join(cell[0] for cell in cells)]
+            else:
+                # Layout tables (a sidebar column next to the main one): read cell by cell
+                row_lines = [text for cell in cells for text in cell]
+            if rows and rows[-1]:
+                # Nested table: its rows belong to the enclosing cell
+                rows[-1][-1].extend(row_lines)
+            else:
+                yield from row_lines
+            element.clear()
+
+        # Drop finished top-level blocks so the parsed tree never grows with the document
+        parent = element.getparent()
+        if parent is not None and parent.tag == BODY:
+            parent.remove(element)
+
+def extract_docx_text(stream: BinaryIO) -> str:
+    """Text of a .docx: headers, then the body (with tables and text boxes), then footers
+
+    Reads the OOXML parts straight from the zip with a streaming parser,
+    instead of building python-docx's object model, which only exposes
+    body paragraphs. Headers come first because templates often keep the
+    name and contact details there. Repeated headers and footers (first
+    page, even pages) are read once.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise ValueError("Not a valid .docx file")
+
+    with archive:
+        names = set(archive.namelist())
+        document = next((target for kind, target in _relationships(archive, '') if kind == 'officeDocument'), 'word/document.xml')
+        if document not in names:
+            raise ValueError("Not a valid .docx file: no document part")
+        related = _relationships(archive, document)
+
+        def read(part_name: str) -> List[str]:
+            with archive.open(part_name) as part:
+                return list(_part_lines(part))
+
+        def read_unique(kind: str) -> List[str]:
+            lines, seen = [], set()
+            for rel_kind, target in related:
+                if rel_kind == kind and target in names:
+                    part_lines = read(target)
+                    if part_lines and tuple(part_lines) not in seen:
+                        seen.add(tuple(part_lines))
+                        lines.extend(part_lines)
+            return lines
+
+        lines = read_unique('header')
+        with archive.open(document) as part:
+            lines.extend(_part_lines(part))
+        lines.extend(read_unique('footer'))
+
+    return '\n'.join(lines) + '\n' if lines else ''
@@ -0,0 +1,465 @@
+import io
+import os
+import re
+import time
+import random
+import asyncio
+import hashlib
+import zipfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, List, NamedTuple, Optional
+from urllib.parse import quote
+import docx
+from docx import Document
+from models.schemas import Resume, CoverLetter, ExportRequest
+
+DOCX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Export format -> media type
+EXPORT_FORMATS = {
+    'md': 'text/markdown; charset=utf-8',
+    'txt': 'text/plain; charset=utf-8',
+    'docx': DOCX_MEDIA_TYPE,
+}
+# Exportable document -> ExportRequest field holding it
+EXPORT_DOCUMENTS = {'resume': 'resume', 'cover_letter': 'coverLetter'}
+
+# Part of every content address; bump when a renderer's output changes
+RENDERER_VERSION = '1'
+
+class RenderedDocument(NamedTuple):
+    key: str  # Content address: sha256 of the inputs plus the format extension
+    content: bytes
+    media_type: str
+    filename: str
+
+# ---------------------------------------------------------------------------
+# Markdown and plain text (same layout as src/utils/markdownGenerator.ts and
+# src/utils/downloadUtils.ts, so server and browser exports match)
+# ---------------------------------------------------------------------------
+
+_ROLE_PATTERNS = [
+    re.compile(r'(?:^|\b)(Full[- ]Stack Developer|Frontend Developer|Backend Developer|Software Engineer|Web Developer|DevOps Engineer|Data Scientist|Product Manager)', re.IGNORECASE),
+    re.compile(r'(?:^|\b)(\w+(?:\s+\w+){0,3}\s+(?:Developer|Engineer|Architect|Designer|Manager|Analyst))', re.IGNORECASE),
+]
+
+def _extract_role(summary: str) -> Optional[str]:
+    first_sentence = summary.split('.')[0] if summary else ''
+    for pattern in _ROLE_PATTERNS:
+        match = pattern.search(first_sentence)
+        if match:
+            return match.group(1)
+    return None
+
+def resume_to_markdown(resume: Resume) -> str:
+    contact = resume.contact
+    lines = [f"**{contact.name.upper()}**", ""]
+
+    role = _extract_role(resume.summary)
+    if role:
+        lines += [role, ""]
+
+    contact_parts = []
+    if contact.linkedin:
+        contact_parts.append(f"[LinkedIn]({contact.linkedin})")
+    if contact.phone:
+        contact_parts.append(contact.phone)
+    if contact.email:
+        contact_parts.append(contact.email)
+    if contact.github:
+        contact_parts.append(f"[GitHub]({contact.github})")
+    if contact.website:
+        contact_parts.append(f"[Portfolio]({contact.website})")
+    if contact_parts:
+        lines += ["  |  ".join(contact_parts), ""]
+
+    if resume.summary:
+        lines += ["# **PROFESSIONAL SUMMARY**", "", resume.summary, ""]
+
+    if resume.skills:
+        lines += ["# **TECHNICAL SKILLS**", ""]
+        lines += [f"* **{group.category}:** {', '.join(group.items)}  " for group in resume.skills]
+        lines.append("")
+
+    if resume.experience:
+        lines += ["# **PROFESSIONAL EXPERIENCE**", ""]
+        for index, exp in enumerate(resume.experience):
+            lines += [f"**{exp.position}** | {exp.company}", "", f"{exp.location} • {exp.startDate} – {exp.endDate}", ""]
+            lines += [f"* {bullet}  " for bullet in exp.description + (exp.highlights or [])]
+            if index < len(resume.experience) - 1:
+                lines.append("")
+        lines.append("")
+
+    if resume.education:
+        lines += ["# **EDUCATION**", ""]
+        for edu in resume.education:
+            degree = f"**{edu.degree}" + (f" – {edu.field}" if edu.field else "") + "**"
+            place = f"*{edu.institution}" + (f", {edu.location}" if edu.location else "") + f"* • {edu.startDate} – {edu.endDate}"
+            if edu.gpa:
+                place += f" | GPA: {edu.gpa}"
+            lines += [degree, "", place, ""]
+            if edu.achievements:
+                lines += ["**Relevant Coursework:** " + ", ".join(edu.achievements), ""]
+
+    return "\n".join(lines).strip()
+
+def resume_to_text(resume: Resume) -> str:
+    contact = resume.contact
+    rule = "=" * 50
+    lines = [contact.name, f"{contact.email} | {contact.phone} | {contact.location}"]
+    if contact.linkedin:
+        lines.append(f"LinkedIn: {contact.linkedin}")
+    if contact.website:
+        lines.append(f"Website: {contact.website}")
+    lines += ["", "PROFESSIONAL SUMMARY", rule, resume.summary, ""]
+
+    lines += ["PROFESSIONAL EXPERIENCE", rule]
+    for exp in resume.experience:
+        lines += [f"{exp.position} | {exp.company}", f"{exp.location} | {exp.startDate} - {exp.endDate}"]
+        lines += [f"• {bullet}" for bullet in exp.description]
+        lines.append("")
+
+    lines += ["EDUCATION", rule]
+    for edu in resume.education:
+        dates = f"{edu.startDate} - {edu.endDate}" + (f" | GPA: {edu.gpa}" if edu.gpa else "")
+        lines += [f"{edu.degree} in {edu.field}", f"{edu.institution}, {edu.location}", dates]
+        lines += [f"• {achievement}" for achievement in edu.achievements or []]
+        lines.append("")
+
+    lines += ["SKILLS", rule]
+    lines += [f"{group.category}: {', '.join(group.items)}" for group in resume.skills]
+    return "\n".join(lines) + "\n"
+
+def cover_letter_to_markdown(cover_letter: CoverLetter) -> str:
+    parts = ["# Cover Letter", cover_letter.greeting, cover_letter.opening, *cover_letter.body, cover_letter.closing, cover_letter.signature]
+    return "\n\n".join(parts).strip()
+
+def cover_letter_to_text(cover_letter: CoverLetter) -> str:
+    parts = [cover_letter.greeting, cover_letter.opening, *cover_letter.body, cover_letter.closing, cover_letter.signature]
+    return "\n\n".join(parts) + "\n"
+
+# ---------------------------------------------------------------------------
+# DOCX
+# ---------------------------------------------------------------------------
+
+# The package python-docx's Document() opens; read as a file so its digest is stable
+_DEFAULT_DOCX_TEMPLATE = os.path.join(os.path.dirname(docx.__file__), 'templates', 'default.docx')
+
+class DocxTemplate:
+    """A .docx template compiled once and reused for every render
+
+    Holds the template package bytes and the IDs of the styles the renderer
+    uses. Assigning a style by name through python-docx scans the whole
+    style table on every paragraph, which dominates render time, so styles
+    are resolved here once and set by ID.
+    """
+
+    STYLES = ('Title', 'Heading 1', 'List Bullet')
+
+    def __init__(self, path: Optional[str] = None):
+        with open(path or _DEFAULT_DOCX_TEMPLATE, 'rb') as f:
+            self.raw = f.read()
+        self.digest = hashlib.sha256(self.raw).hexdigest()[:16]
+
+        styles = Document(io.BytesIO(self.raw)).styles
+        self.style_ids = {name: styles[name].style_id for name in self.STYLES if name in styles}
+
+    def new_document(self):
+        return Document(io.BytesIO(self.raw))
+
+    def add_paragraph(self, document, text: str = "", style: Optional[str] = None, bold_prefix: str = ""):
+        paragraph = document.add_paragraph()
+        style_id = self.style_ids.get(style)
+        if style_id:
+            paragraph._p.get_or_add_pPr().style = style_id
+        if bold_prefix:
+            paragraph.add_run(bold_prefix).bold = True
+        if text:
+            paragraph.add_run(text)
+        return paragraph
+
+@lru_cache(maxsize=8)
+def _compile_docx_template(path: Optional[str], mtime: Optional[float]) -> DocxTemplate:
+    # mtime is part of the cache key so an edited template is recompiled
+    return DocxTemplate(path)
+
+def docx_template() -> DocxTemplate:
+    """The template from EXPORT_DOCX_TEMPLATE, or python-docx's default"""
+    path = os.getenv('EXPORT_DOCX_TEMPLATE') or None
+    return _compile_docx_template(path, os.path.getmtime(path) if path else None)
+
+def _save_docx(document) -> bytes:
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def resume_to_docx(resume: Resume, template: DocxTemplate) -> bytes:
+    document = template.new_document()
+    contact = resume.contact
+    template.add_paragraph(document, contact.name, 'Title')
+    contact_parts = [contact.email, contact.phone, contact.location, contact.linkedin, contact.github, contact.website]
+    template.add_paragraph(document, "  |  ".join(part for part in contact_parts if part))
+
+    if resume.summary:
+        template.add_paragraph(document, "Professional Summary", 'Heading 1')
+        template.add_paragraph(document, resume.summary)
+
+    if resume.skills:
+        template.add_paragraph(document, "Technical Skills", 'Heading 1')
+        for group in resume.skills:
+            template.add_paragraph(document, ", ".join(group.items), 'List Bullet', bold_prefix=f"{group.category}: ")
+
+    if resume.experience:
+        template.add_paragraph(document, "Professional Experience", 'Heading 1')
+        for exp in resume.experience:
+            template.add_paragraph(document, f" | {exp.company}", bold_prefix=exp.position)
+            template.add_paragraph(document, f"{exp.location} • {exp.startDate} – {exp.endDate}")
+            for bullet in exp.description + (exp.highlights or []):
+                template.add_paragraph(document, bullet, 'List Bullet')
+
+    if resume.education:
+        template.add_paragraph(document, "Education", 'Heading 1')
+        for edu in resume.education:
+            template.add_paragraph(document, bold_prefix=f"{edu.degree}" + (f" – {edu.field}" if edu.field else ""))
+            place = f"{edu.institution}" + (f", {edu.location}" if edu.location else "") + f" • {edu.startDate} – {edu.endDate}"
+            template.add_paragraph(document, place + (f" | GPA: {edu.gpa}" if edu.gpa else ""))
+            if edu.achievements:
+                template.add_paragraph(document, ", ".join(edu.achievements), bold_prefix="Relevant Coursework: ")
+
+    return _save_docx(document)
+
+def cover_letter_to_docx(cover_letter: CoverLetter, template: DocxTemplate) -> bytes:
+    document = template.new_document()
+    for text in (cover_letter.greeting, cover_letter.opening, *cover_letter.body, cover_letter.closing, cover_letter.signature):
+        template.add_paragraph(document, text)
+    return _save_docx(document)
+
+# ---------------------------------------------------------------------------
+# Content-addressed cache of rendered documents
+# ---------------------------------------------------------------------------
+
+class ExportCache:
+    """Rendered documents by content address"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def put(self, key: str, content: bytes) -> None:
+        raise NotImplementedError
+
+class InMemoryExportCache(ExportCache):
+    """Per-process LRU bounded by total size"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: bytes) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+class DiskExportCache(ExportCache):
+    """Rendered documents as files named by their content address, shared by every worker process"""
+
+    # Fraction of writes that also delete files older than max_age
+    PRUNE_PROBABILITY = 0.01
+
+    def __init__(self, directory: str, max_age: float = 7 * 24 * 3600):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Keys come from clients on re-download; never let one leave the directory
+        if not re.fullmatch(r'[0-9a-f]{64}\.\w+', key):
+            raise ValueError(f"Invalid export key: {key}")
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, content: bytes) -> None:
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        # Atomic, so concurrent renders of the same document never expose a partial file
+        os.replace(temp_path, path)
+        if random.random() < self.PRUNE_PROBABILITY:
+            self._prune()
+
+    def _prune(self):
+        cutoff = time.time() - self.max_age
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+def get_export_cache() -> ExportCache:
+    """Disk cache in EXPORT_CACHE_DIR (shared by workers) if set, otherwise in memory"""
+    directory = os.getenv('EXPORT_CACHE_DIR')
+    if directory:
+        return DiskExportCache(directory)
+    return InMemoryExportCache(int(float(os.getenv('EXPORT_CACHE_MB', 64)) * 1024 * 1024))
+
+# ---------------------------------------------------------------------------
+# Export service
+# ---------------------------------------------------------------------------
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands out the zip bytes written so far"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _slug(text: str) -> str:
+    # \W is Unicode-aware, so "José Müller" keeps its letters
+    return re.sub(r'[\W_]+', '-', unicodedata.normalize('NFC', text).lower()).strip('-') or 'document'
+
+def safe_filename(name: Optional[str]) -> Optional[str]:
+    """A client-supplied file name without directories, quotes or control characters
+
+    Returns None if nothing usable is left.
+    """
+    if not name:
+        return None
+    name = re.split(r'[/\\]', name)[-1]
+    name = ''.join(char for char in name if char not in '"\'' and unicodedata.category(char)[0] != 'C')
+    return name.strip().lstrip('.') or None
+
+def content_disposition(filename: str) -> str:
+    """Attachment header with an ASCII fallback name and the UTF-8 name per RFC 6266/5987"""
+    fallback = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode()
+    fallback = re.sub(r'[^\w.() -]+', '_', fallback).strip() or 'download'
+    if fallback == filename:
+        return f'attachment; filename="{filename}"'
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename, safe="")}'
+
+class ExportService:
+    """Renders resumes and cover letters to Markdown, text and DOCX
+
+    Every rendered document is stored under a content address derived from
+    its inputs (document, format, renderer version, DOCX template and the
+    JSON payload), so exporting the same content again is a cache lookup.
+    """
+
+    MAX_BULK_ITEMS = int(os.getenv('MAX_BULK_EXPORT_ITEMS', 200))
+
+    def __init__(self, cache: Optional[ExportCache] = None):
+        self.cache = cache or get_export_cache()
+
+    @staticmethod
+    def validate(request: ExportRequest):
+        """The model to render for `request`; raises ValueError if the request is invalid"""
+        if request.format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {request.format}")
+        if request.document not in EXPORT_DOCUMENTS:
+            raise ValueError(f"Unknown export document: {request.document}")
+        payload = getattr(request, EXPORT_DOCUMENTS[request.document])
+        if payload is None:
+            raise ValueError(f"Exporting a {request.document} requires the {EXPORT_DOCUMENTS[request.document]} field")
+        return payload
+
+    def render(self, request: ExportRequest) -> RenderedDocument:
+        """Render (or load from the cache) one document; blocking, run it in a thread"""
+        payload = self.validate(request)
+        name = f"{payload.contact.name} resume" if request.document == 'resume' else "cover letter"
+
+        template = docx_template() if request.format == 'docx' else None
+        digest = hashlib.sha256("\0".join([
+            request.document, request.format, RENDERER_VERSION,
+            template.digest if template else "", payload.model_dump_json()
+        ]).encode()).hexdigest()
+        key = f"{digest}.{request.format}"
+        filename = safe_filename(request.fileName) or f"{_slug(name)}.{request.format}"
+
+        content = self.cache.get(key)
+        if content is None:
+            content = self._render(request.document, request.format, payload, template)
+            self.cache.put(key, content)
+        return RenderedDocument(key, content, EXPORT_FORMATS[request.format], filename)
+
+    def _render(self, document: str, format: str, payload, template: Optional[DocxTemplate]) -> bytes:
+        if format == 'docx':
+            renderer = resume_to_docx if document == 'resume' else cover_letter_to_docx
+            return renderer(payload, template)
+        if document == 'resume':
+            text = resume_to_markdown(payload) if format == 'md' else resume_to_text(payload)
+        else:
+            text = cover_letter_to_markdown(payload) if format == 'md' else cover_letter_to_text(payload)
+        return text.encode('utf-8')
+
+    def load(self, key: str) -> Optional[RenderedDocument]:
+        """A previously rendered document by content address"""
+        format = key.rsplit('.', 1)[-1]
+        if format not in EXPORT_FORMATS:
+            return None
+        try:
+            content = self.cache.get(key)
+        except ValueError:
+            return None
+        if content is None:
+            return None
+        return RenderedDocument(key, content, EXPORT_FORMATS[format], f"document.{format}")
+
+    async def stream_zip(self, requests: List[ExportRequest]) -> AsyncIterator[bytes]:
+        """Zip archive of the rendered documents, yielded one document at a time
+
+        Documents are rendered in a worker thread one after another and each
+        compressed entry is flushed to the client before the next is
+        rendered, so memory stays at about one document regardless of how
+        many are exported.
+        """
+        sink = _ZipSink()
+        used_names = set()
+        with zipfile.ZipFile(sink, 'w') as archive:
+            for request in requests:
+                rendered = await asyncio.to_thread(self.render, request)
+
+                name, suffix = rendered.filename, 2
+                stem, dot, extension = rendered.filename.rpartition('.')
+                while name in used_names:
+                    name, suffix = (f"{stem}-{suffix}.{extension}" if dot else f"{extension}-{suffix}"), suffix + 1
+                used_names.add(name)
+
+                # DOCX files are already deflated zip packages
+                compression = zipfile.ZIP_STORED if rendered.filename.endswith('.docx') else zipfile.ZIP_DEFLATED
+                archive.writestr(zipfile.ZipInfo(name, time.localtime()[:6]), rendered.content, compress_type=compression)
+                yield sink.drain()
+        yield sink.drain()
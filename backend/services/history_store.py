@@ -0,0 +1,288 @@
+import os
+import time
+import uuid
+import sqlite3
+import asyncio
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import BinaryIO, List, Optional, Union
+from models.schemas import Resume, HistoryRecord
+
+# Record kinds: ParseResponse, OptimizeResponse and CoverLetterVariants payloads
+HISTORY_KINDS = ('parse', 'optimize', 'cover_letter')
+
+# Records hold full resumes, so they expire; expired records are never returned and are purged over time
+HISTORY_RETENTION_SECONDS = float(os.getenv('HISTORY_RETENTION_DAYS', 30)) * 24 * 3600
+
+# Records kept by the in-memory store across all sessions; the oldest are dropped beyond this
+HISTORY_MEMORY_MAX_RECORDS = int(os.getenv('HISTORY_MEMORY_MAX_RECORDS', 10000))
+
+def file_hash(content: Union[bytes, BinaryIO]) -> str:
+    """sha256 of an uploaded document, read in chunks when given a file"""
+    if isinstance(content, (bytes, bytearray)):
+        return hashlib.sha256(content).hexdigest()
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in iter(lambda: content.read(1024 * 1024), b""):
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+def resume_hash(resume: Resume) -> str:
+    return hashlib.sha256(resume.model_dump_json().encode()).hexdigest()
+
+class HistoryStore:
+    """Interface for the per-session store of parse and optimization results
+
+    Records are owned by a session ID and indexed by the hash of the
+    uploaded file, the hash of the resume that was optimized and the hash of
+    the job description, so a returning client can load earlier results
+    instead of recomputing them. Payloads are stored as the JSON the client
+    originally received and returned as-is. Records expire after
+    HISTORY_RETENTION_SECONDS, and a session can delete its records.
+    """
+
+    def save(
+        self,
+        owner: str,
+        kind: str,
+        payload: str,
+        file_hash: Optional[str] = None,
+        resume_hash: Optional[str] = None,
+        job_hash: Optional[str] = None
+    ) -> str:
+        raise NotImplementedError
+
+    def get(self, owner: str, record_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def find(
+        self,
+        owner: str,
+        kind: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        resume_hash: Optional[str] = None,
+        job_hash: Optional[str] = None,
+        limit: int = 20
+    ) -> List[HistoryRecord]:
+        """Matching records, newest first (metadata only)"""
+        raise NotImplementedError
+
+    def latest(self, owner: str, kind: str, **hashes) -> Optional[str]:
+        """Payload of the newest matching record, if any"""
+        records = self.find(owner, kind, limit=1, **hashes)
+        return self.get(owner, records[0].id) if records else None
+
+    def delete(self, owner: str, record_id: Optional[str] = None) -> int:
+        """Delete one record of the session, or all of them; returns how many were deleted"""
+        raise NotImplementedError
+
+class InMemoryHistoryStore(HistoryStore):
+    """Per-process store, used for tests and when HISTORY_STORE=memory"""
+
+    def __init__(self, max_records: int = HISTORY_MEMORY_MAX_RECORDS, retention: float = HISTORY_RETENTION_SECONDS):
+        self.max_records = max_records
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._records = {}   # owner -> {record id: HistoryRecord}, oldest first
+        self._by_id = OrderedDict()  # record id -> (owner, payload), oldest first
+
+    def save(self, owner, kind, payload, file_hash=None, resume_hash=None, job_hash=None) -> str:
+        record = HistoryRecord(
+            id=uuid.uuid4().hex, kind=kind, createdAt=time.time(),
+            fileHash=file_hash, resumeHash=resume_hash, jobHash=job_hash
+        )
+        with self._lock:
+            self._records.setdefault(owner, {})[record.id] = record
+            self._by_id[record.id] = (owner, payload)
+            while len(self._by_id) > self.max_records:
+                self._remove(next(iter(self._by_id)))
+        return record.id
+
+    def _remove(self, record_id: str):
+        owner, _ = self._by_id.pop(record_id)
+        records = self._records[owner]
+        del records[record_id]
+        if not records:
+            del self._records[owner]
+
+    def get(self, owner, record_id) -> Optional[str]:
+        with self._lock:
+            entry = self._by_id.get(record_id)
+            record = self._records[entry[0]][record_id] if entry else None
+        if entry is None or entry[0] != owner or record.createdAt < time.time() - self.retention:
+            return None
+        return entry[1]
+
+    def find(self, owner, kind=None, file_hash=None, resume_hash=None, job_hash=None, limit=20) -> List[HistoryRecord]:
+        with self._lock:
+            records = list(self._records.get(owner, {}).values())
+        cutoff = time.time() - self.retention
+        matches = []
+        for record in reversed(records):
+            if record.createdAt < cutoff:
+                break
+            if kind and record.kind != kind:
+                continue
+            if file_hash and record.fileHash != file_hash:
+                continue
+            if resume_hash and record.resumeHash != resume_hash:
+                continue
+            if job_hash and record.jobHash != job_hash:
+                continue
+            matches.append(record)
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def delete(self, owner, record_id=None) -> int:
+        with self._lock:
+            records = self._records.get(owner, {})
+            removed = [key for key in ([record_id] if record_id else list(records)) if key in records]
+            for key in removed:
+                self._remove(key)
+        return len(removed)
+
+class SQLiteHistoryStore(HistoryStore):
+    """History kept in a SQLite WAL database, shared by every worker process
+
+    Every lookup is by owner plus an optional kind and hashes; each pattern
+    has a composite index ending in created_at, so finding the newest match
+    is an index seek whatever the table size. Metadata queries never read
+    the payload column. The database file is created on first use, not when
+    the store is constructed.
+    """
+
+    # Fraction of saves that also purge expired records
+    PRUNE_PROBABILITY = 0.01
+
+    def __init__(self, db_path: str, retention: float = HISTORY_RETENTION_SECONDS):
+        self.db_path = db_path
+        self.retention = retention
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _create_schema(self):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS history (
+                        id TEXT PRIMARY KEY,
+                        owner TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        file_hash TEXT,
+                        resume_hash TEXT,
+                        job_hash TEXT,
+                        created_at REAL NOT NULL,
+                        payload TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_history_owner ON history (owner, kind, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_history_file ON history (owner, file_hash, kind, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_history_resume ON history (owner, resume_hash, job_hash, kind, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_history_job ON history (owner, job_hash, kind, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_history_created ON history (created_at);
+                """)
+            finally:
+                conn.close()
+            self._schema_ready = True
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call, as in SQLiteJobBroker, so the
+        # store is safe to use from threads and from separate processes
+        if not self._schema_ready:
+            self._create_schema()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def save(self, owner, kind, payload, file_hash=None, resume_hash=None, job_hash=None) -> str:
+        record_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO history (id, owner, kind, file_hash, resume_hash, job_hash, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (record_id, owner, kind, file_hash, resume_hash, job_hash, now, payload)
+            )
+            if random.random() < self.PRUNE_PROBABILITY:
+                conn.execute("DELETE FROM history WHERE created_at < ?", (now - self.retention,))
+        return record_id
+
+    def get(self, owner, record_id) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM history WHERE id = ? AND owner = ? AND created_at >= ?",
+                (record_id, owner, time.time() - self.retention)
+            ).fetchone()
+        return row[0] if row else None
+
+    def find(self, owner, kind=None, file_hash=None, resume_hash=None, job_hash=None, limit=20) -> List[HistoryRecord]:
+        conditions = ["owner = ?"]
+        params = [owner]
+        for column, value in (("kind", kind), ("file_hash", file_hash), ("resume_hash", resume_hash), ("job_hash", job_hash)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        conditions.append("created_at >= ?")
+        params.extend([time.time() - self.retention, limit])
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, kind, created_at, file_hash, resume_hash, job_hash FROM history "
+                f"WHERE {' AND '.join(conditions)} ORDER BY created_at DESC LIMIT ?",
+                params
+            ).fetchall()
+        return [
+            HistoryRecord(id=row[0], kind=row[1], createdAt=row[2], fileHash=row[3], resumeHash=row[4], jobHash=row[5])
+            for row in rows
+        ]
+
+    def delete(self, owner, record_id=None) -> int:
+        with self._connect() as conn:
+            if record_id:
+                cursor = conn.execute("DELETE FROM history WHERE owner = ? AND id = ?", (owner, record_id))
+            else:
+                cursor = conn.execute("DELETE FROM history WHERE owner = ?", (owner,))
+        return cursor.rowcount
+
+def get_history_store() -> Optional[HistoryStore]:
+    """Create the store selected by HISTORY_STORE ('sqlite', 'memory' or 'off')"""
+    mode = os.getenv('HISTORY_STORE', 'sqlite').lower()
+    if mode == 'sqlite':
+        return SQLiteHistoryStore(os.getenv('HISTORY_DB', 'history.db'))
+    if mode == 'memory':
+        return InMemoryHistoryStore()
+    return None
+
+# Shared by the REST routes and WebSocket handlers of this process (SQLite opens the file on first use)
+history_store = get_history_store()
+
+async def load_history(session_id: Optional[str], kind: str, **hashes) -> Optional[str]:
+    """Newest stored payload for the session, or None (also when history is off)"""
+    if not session_id or history_store is None:
+        return None
+    try:
+        return await asyncio.to_thread(history_store.latest, session_id, kind, **hashes)
+    except Exception as e:
+        print(f"⚠️ History lookup failed: {e}")
+        return None
+
+async def save_history(session_id: Optional[str], kind: str, payload: str, **hashes) -> Optional[str]:
+    """Store a result for the session; a failing store never fails the request"""
+    if not session_id or history_store is None:
+        return None
+    try:
+        return await asyncio.to_thread(history_store.save, session_id, kind, payload, **hashes)
+    except Exception as e:
+        print(f"⚠️ Failed to save {kind} result to history: {e}")
+        return None
@@ -0,0 +1,134 @@
+import re
+from typing import List
+from models.schemas import Resume, OptimizedResume, Experience
+from services.skill_taxonomy import skill_taxonomy
+
+class ResumeDiff:
+    """Sections and entries of a resume that changed since its last optimization"""
+
+    def __init__(self, summary_changed: bool, skills_changed: bool, changed_experience_ids: List[str]):
+        self.summary_changed = summary_changed
+        self.skills_changed = skills_changed
+        self.changed_experience_ids = changed_experience_ids
+
+    @property
+    def needs_ai(self) -> bool:
+        return self.summary_changed or self.skills_changed or bool(self.changed_experience_ids)
+
+def diff_resume(previous: Resume, current: Resume, previous_optimized: OptimizedResume) -> ResumeDiff:
+    """Compare the resume being optimized with the one the previous result was built from
+
+    Experience entries are matched by `id`. An entry counts as changed if it
+    is new, was edited, or has no optimized counterpart to reuse.
+    """
+    previous_entries = {exp.id: exp for exp in previous.experience}
+    optimized_ids = {exp.id for exp in previous_optimized.experience}
+
+    changed_ids = [
+        exp.id for exp in current.experience
+        if exp.id not in optimized_ids or previous_entries.get(exp.id) != exp
+    ]
+
+    return ResumeDiff(
+        summary_changed=previous.summary != current.summary,
+        skills_changed=previous.skills != current.skills,
+        changed_experience_ids=changed_ids
+    )
+
+def merge_optimized(
+    current: Resume,
+    previous_optimized: OptimizedResume,
+    diff: ResumeDiff,
+    summary: str = None,
+    skills: list = None,
+    experience: List[Experience] = None
+) -> Resume:
+    """Assemble a resume from re-optimized entries plus reused previous output
+
+    Contact and education are never rewritten by optimization, so they are
+    always taken from the current resume.
+    """
+    reoptimized = {exp.id: exp for exp in experience or []}
+    reused = {exp.id: exp for exp in previous_optimized.experience}
+
+    merged_experience = []
+    for exp in current.experience:
+        if exp.id in diff.changed_experience_ids:
+            # Fall back to the user's text if the model skipped an entry
+            merged_experience.append(reoptimized.get(exp.id, exp))
+        else:
+            merged_experience.append(reused[exp.id])
+
+    return Resume(
+        contact=current.contact,
+        summary=(summary or current.summary) if diff.summary_changed else previous_optimized.summary,
+        experience=merged_experience,
+        education=current.education,
+        skills=(skills or current.skills) if diff.skills_changed else previous_optimized.skills
+    )
+
+def resume_text(resume: Resume, include_skills: bool = True) -> str:
+    """The resume's prose (summary, roles, bullets, education), for keyword and skill evidence
+
+    Also used by services/change_diff.py, which leaves the skills list out
+    to look for evidence of skills elsewhere in the resume.
+    """
+    parts = [resume.summary]
+    for exp in resume.experience:
+        parts.extend([exp.position, *exp.description, *(exp.highlights or [])])
+    for edu in resume.education:
+        parts.extend([edu.degree, edu.field, *(edu.achievements or [])])
+    if include_skills:
+        for skill in resume.skills:
+            parts.extend(skill.items)
+    return ' '.join(parts)
+
+def mentions(text: str, term: str) -> bool:
+    """Whether `term` appears in `text` as a whole word or phrase, ignoring case"""
+    return re.search(r'(?<!\w)' + re.escape(term) + r'(?!\w)', text, re.IGNORECASE) is not None
+
+def _keyword_hits(resume: Resume, keywords: List[str]) -> set:
+    """Keywords the resume mentions, literally or under another name of the same skill ("JS" for "JavaScript")"""
+    text = resume_text(resume)
+    skills = set(skill_taxonomy.extract(text))
+    return {keyword for keyword in keywords if mentions(text, keyword) or skill_taxonomy.canonicalize(keyword) in skills}
+
+def rescore(previous_optimized: OptimizedResume, resume: Resume) -> OptimizedResume:
+    """Recompute keyword match locally against the previous result's job keywords
+
+    The job keywords known from the full run (matched keywords plus skill
+    gaps) are re-checked against the new resume text. Keywords the model
+    matched without a literal mention stay matched unless the literal
+    evidence disappeared, and the previous matchScore is scaled by the
+    change in matched keywords.
+    """
+    gap_skills = [gap.skill for gap in previous_optimized.skillGaps or []]
+    job_keywords = list(dict.fromkeys(previous_optimized.matchedKeywords + gap_skills))
+
+    previous_hits = _keyword_hits(previous_optimized, job_keywords)
+    hits = _keyword_hits(resume, job_keywords)
+    previously_matched = set(previous_optimized.matchedKeywords)
+
+    matched = [
+        keyword for keyword in job_keywords
+        if keyword in hits or (keyword in previously_matched and keyword not in previous_hits)
+    ]
+
+    if previously_matched:
+        match_score = round(previous_optimized.matchScore * len(matched) / len(previously_matched))
+    else:
+        match_score = previous_optimized.matchScore
+    match_score = max(0, min(100, match_score))
+
+    potential_score = previous_optimized.potentialScore
+    if potential_score is not None:
+        potential_score = max(potential_score, match_score)
+
+    return OptimizedResume(
+        **dict(resume),
+        changes=[],
+        matchScore=match_score,
+        matchedKeywords=matched,
+        skillGaps=[gap for gap in previous_optimized.skillGaps or [] if gap.skill not in hits],
+        potentialScore=potential_score
+    )
@@ -0,0 +1,100 @@
+import os
+import re
+import asyncio
+import hashlib
+from models.schemas import JobAnalysis
+from services.llm_client import LLMClient
+from services.model_router import ModelRouter
+from services.shared_state import SharedCache, get_cache
+from services.skill_taxonomy import skill_taxonomy
+
+def job_description_hash(job_description: str) -> str:
+    """Hash of a job description, insensitive to case and whitespace differences"""
+    normalized = re.sub(r'\s+', ' ', job_description).strip().lower()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+def job_digest(analysis: JobAnalysis) -> str:
+    """Compact prompt representation of an analyzed job description"""
+    lines = [
+        f"Title: {analysis.title or 'n/a'} ({analysis.seniority})",
+        f"Required skills: {', '.join(analysis.requiredSkills) or 'n/a'}",
+        f"Nice-to-have skills: {', '.join(analysis.niceToHaveSkills) or 'n/a'}",
+        f"Keywords: {', '.join(analysis.keywords) or 'n/a'}",
+        "Responsibilities:",
+        *[f"- {item}" for item in analysis.responsibilities],
+    ]
+    if analysis.companyContext:
+        lines.append(f"Company context: {analysis.companyContext}")
+    if analysis.hiringManager:
+        lines.append(f"Hiring manager: {analysis.hiringManager}")
+    return "\n".join(lines)
+
+# Shared by every service in the process, and across processes when SHARED_STATE_DB is set
+job_analysis_cache = get_cache('job_analysis', max_size=int(os.getenv('JOB_ANALYSIS_CACHE_SIZE', 1024)))
+
+class JobAnalysisService:
+    """Extracts a reusable structured analysis from a job description
+
+    Each distinct posting is analyzed once; later optimize and cover-letter
+    calls for the same posting get the cached result and send its compact
+    digest to the model instead of the full text. Concurrent requests for a
+    posting that is still being analyzed share the in-flight call.
+    """
+
+    def __init__(self, client: LLMClient, router: ModelRouter, cache: SharedCache = job_analysis_cache):
+        self.client = client
+        self.router = router
+        self.cache = cache
+        self._in_flight = {}
+
+    async def analyze(self, job_description: str) -> JobAnalysis:
+        key = job_description_hash(job_description)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return JobAnalysis.model_validate_json(cached)
+
+        if key not in self._in_flight:
+            task = asyncio.ensure_future(self._analyze(key, job_description))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self._in_flight[key] = task
+        # shield: one caller disconnecting must not cancel the shared call
+        return await asyncio.shield(self._in_flight[key])
+
+    async def _analyze(self, key: str, job_description: str) -> JobAnalysis:
+        prompt = f"""Analyze this job description and extract its requirements.
+
+📋 JOB DESCRIPTION:
+{job_description}
+
+Extract:
+- title: The job title, if stated
+- seniority: One of "intern", "junior", "mid", "senior", "staff", "principal", "manager", "executive"
+- requiredSkills: Skills and technologies explicitly required
+- niceToHaveSkills: Skills listed as preferred, bonus or nice-to-have
+- keywords: Other important terms an applicant tracking system would match (methodologies, domains, certifications)
+- responsibilities: The main responsibilities, one short phrase each (at most 8)
+- companyContext: One sentence about the company, product or culture, if described
+- hiringManager: The hiring manager or recruiter's name, if given
+
+Use the exact wording of the job description for skills and keywords. Return ONLY valid JSON."""
+
+        analysis = await self.router.run(
+            'job_analysis',
+            lambda model: self.client.complete_structured(
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You extract structured requirements from job descriptions accurately and concisely. Always return valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0,
+                response_model=JobAnalysis,
+                repair_context=job_description
+            )
+        )
+        # "JS" and "JavaScript" are one skill for matching and for the prompt digest
+        analysis = analysis.model_copy(update={
+            'requiredSkills': skill_taxonomy.canonicalize_all(analysis.requiredSkills),
+            'niceToHaveSkills': skill_taxonomy.canonicalize_all(analysis.niceToHaveSkills),
+        })
+        await self.cache.aput(key, analysis.model_dump_json())
+        return analysis
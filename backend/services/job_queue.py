@@ -0,0 +1,395 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+from models.schemas import Job
+from utils.ws_encoding import message_type
+
+# Message types that end a job's event stream
+TERMINAL_MESSAGE_TYPES = ('result', 'error')
+
+# Seconds a claimed job stays leased to its worker; running workers renew it,
+# and a job whose lease runs out (the worker died) is re-queued
+JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 60))
+
+# Claims of the same job before an expired lease fails it instead of re-queueing
+MAX_JOB_ATTEMPTS = int(os.getenv('MAX_JOB_ATTEMPTS', 2))
+
+# Seconds the web process waits for a job's next event before giving up on it
+JOB_RELAY_TIMEOUT = float(os.getenv('JOB_RELAY_TIMEOUT', 300))
+
+# Seconds finished and cancelled jobs are kept before workers delete them
+JOB_RETENTION_SECONDS = float(os.getenv('JOB_RETENTION_SECONDS', 3600))
+
+# Statuses of jobs no worker will run again
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+LEASE_EXPIRED_MESSAGE = json.dumps({"type": "error", "message": "Job failed: its worker stopped responding"})
+
+class JobBroker:
+    """Interface for the queue that connects the web process to job workers
+
+    Jobs are enqueued by the web process, claimed by workers, and every
+    WebSocket-protocol message a worker produces (progress/result/error) is
+    published as an ordered, already-encoded event that the web process
+    relays to the client verbatim.
+
+    A claim leases the job to its worker for JOB_LEASE_SECONDS. The worker
+    renews the lease while the job runs; once it lapses, `requeue_expired`
+    hands the job to another worker, or fails it after MAX_JOB_ATTEMPTS
+    claims. The web process deletes a job once its result is relayed, and
+    `purge` removes finished jobs nobody relayed.
+    """
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        raise NotImplementedError
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """Extend a running job's lease; False if the worker no longer holds it (cancelled, re-queued, deleted)"""
+        raise NotImplementedError
+
+    def requeue_expired(self) -> int:
+        """Re-queue (or fail) running jobs whose lease has lapsed; returns how many"""
+        raise NotImplementedError
+
+    def publish(self, job_id: str, message: str) -> None:
+        raise NotImplementedError
+
+    def fetch_events(self, job_id: str, after: int = 0) -> List[Tuple[int, str]]:
+        raise NotImplementedError
+
+    def finish(self, job_id: str, status: str) -> None:
+        raise NotImplementedError
+
+    def cancel(self, job_id: str) -> None:
+        raise NotImplementedError
+
+    def is_cancelled(self, job_id: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, job_id: str) -> None:
+        """Drop a job and its events"""
+        raise NotImplementedError
+
+    def purge(self, max_age: float = JOB_RETENTION_SECONDS) -> int:
+        """Delete jobs that finished more than `max_age` seconds ago; returns how many"""
+        raise NotImplementedError
+
+class InMemoryJobBroker(JobBroker):
+    """In-process broker, used for tests and single-process queue mode"""
+
+    def __init__(self, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._queue = []
+        self._events = {}
+        self._leases = {}  # job id -> (worker id, lease expiry)
+        self._finished_at = {}
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        job = Job(id=uuid.uuid4().hex, kind=kind, payload=payload)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._events[job.id] = []
+            self._queue.append(job.id)
+        return job.id
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        with self._lock:
+            while self._queue:
+                job = self._jobs.get(self._queue.pop(0))
+                if job is not None and job.status == 'queued':
+                    job.status = 'running'
+                    job.attempts += 1
+                    self._leases[job.id] = (worker_id, time.time() + self.lease_seconds)
+                    return job
+            return None
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != 'running' or self._leases[job_id][0] != worker_id:
+                return False
+            self._leases[job_id] = (worker_id, time.time() + self.lease_seconds)
+            return True
+
+    def requeue_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.status == 'running' and self._leases[job.id][1] < now
+            ]
+            for job in expired:
+                if job.attempts < MAX_JOB_ATTEMPTS:
+                    job.status = 'queued'
+                    self._queue.append(job.id)
+                else:
+                    job.status = 'failed'
+                    self._finished_at[job.id] = now
+                    events = self._events[job.id]
+                    events.append((len(events) + 1, LEASE_EXPIRED_MESSAGE))
+            return len(expired)
+
+    def publish(self, job_id: str, message: str) -> None:
+        with self._lock:
+            events = self._events.get(job_id)
+            if events is not None:
+                events.append((len(events) + 1, message))
+
+    def fetch_events(self, job_id: str, after: int = 0) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._events.get(job_id, [])[after:]
+
+    def finish(self, job_id: str, status: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == 'running':
+                job.status = status
+                self._finished_at[job_id] = time.time()
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status not in FINISHED_STATUSES:
+                job.status = 'cancelled'
+                self._finished_at[job_id] = time.time()
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job is not None and job.status == 'cancelled'
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._events.pop(job_id, None)
+            self._leases.pop(job_id, None)
+            self._finished_at.pop(job_id, None)
+
+    def purge(self, max_age: float = JOB_RETENTION_SECONDS) -> int:
+        cutoff = time.time() - max_age
+        with self._lock:
+            old = [job_id for job_id, finished_at in self._finished_at.items() if finished_at < cutoff]
+        for job_id in old:
+            self.delete(job_id)
+        return len(old)
+
+class SQLiteJobBroker(JobBroker):
+    """SQLite-backed broker shared by the web process and worker processes"""
+
+    def __init__(self, db_path: str, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    message TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                );
+            """)
+            # Lease and retention columns, added in place to queues created before them
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, definition in (
+                ('attempts', 'INTEGER NOT NULL DEFAULT 0'),
+                ('lease_until', 'REAL'),
+                ('finished_at', 'REAL'),
+            ):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            conn.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_until);
+                CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at);
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps the broker safe to use
+        # from threads and from separate worker processes
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers can
+            # never claim (or re-queue) the same job
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, kind, json.dumps(payload), time.time())
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                    (worker_id, time.time() + self.lease_seconds, row[0])
+                )
+        if row is None:
+            return None
+        return Job(id=row[0], kind=row[1], payload=json.loads(row[2]), status='running', attempts=row[3] + 1)
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND worker = ?",
+                (time.time() + self.lease_seconds, job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def requeue_expired(self) -> int:
+        now = time.time()
+        with self._transaction() as conn:
+            expired = conn.execute(
+                "SELECT id, attempts FROM jobs WHERE status = 'running' AND lease_until < ?", (now,)
+            ).fetchall()
+            for job_id, attempts in expired:
+                if attempts < MAX_JOB_ATTEMPTS:
+                    conn.execute("UPDATE jobs SET status = 'queued', worker = NULL, lease_until = NULL WHERE id = ?", (job_id,))
+                else:
+                    conn.execute("UPDATE jobs SET status = 'failed', finished_at = ? WHERE id = ?", (now, job_id))
+                    conn.execute(
+                        "INSERT INTO job_events (job_id, seq, message) "
+                        "SELECT ?, COALESCE(MAX(seq), 0) + 1, ? FROM job_events WHERE job_id = ?",
+                        (job_id, LEASE_EXPIRED_MESSAGE, job_id)
+                    )
+        return len(expired)
+
+    def publish(self, job_id: str, message: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job_events (job_id, seq, message) "
+                "SELECT ?, COALESCE(MAX(seq), 0) + 1, ? FROM job_events WHERE job_id = ?",
+                (job_id, message, job_id)
+            )
+
+    def fetch_events(self, job_id: str, after: int = 0) -> List[Tuple[int, str]]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT seq, message FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+
+    def finish(self, job_id: str, status: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (status, time.time(), job_id)
+            )
+
+    def cancel(self, job_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id)
+            )
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row[0] == 'cancelled'
+
+    def delete(self, job_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def purge(self, max_age: float = JOB_RETENTION_SECONDS) -> int:
+        with self._transaction() as conn:
+            old = [row[0] for row in conn.execute(
+                "SELECT id FROM jobs WHERE finished_at < ?", (time.time() - max_age,)
+            )]
+            conn.executemany("DELETE FROM job_events WHERE job_id = ?", [(job_id,) for job_id in old])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in old])
+        return len(old)
+
+class BrokerChannel:
+    """WebSocket stand-in that publishes protocol messages to the broker
+
+    Lets workers reuse the WebSocketManager handlers unchanged: everything
+    they would have sent to the client is recorded as a job event instead.
+    """
+
+    def __init__(self, broker: JobBroker, job_id: str):
+        self.broker = broker
+        self.job_id = job_id
+        self.last_message_type = None
+
+    async def send_json(self, message: dict):
+        await self.send_text(json.dumps(message))
+
+    async def send_text(self, message: str):
+        self.last_message_type = message_type(message)
+        await asyncio.to_thread(self.broker.publish, self.job_id, message)
+
+async def relay_job_events(broker: JobBroker, websocket, job_id: str, poll_interval: float = 0.1, timeout: float = JOB_RELAY_TIMEOUT):
+    """Forward a job's events to the client until its result or error arrives
+
+    If no event arrives for `timeout` seconds (no worker picked the job up,
+    or every worker running it is stuck), the job is cancelled and the
+    client gets an error instead of waiting forever.
+    """
+    after = 0
+    last_event = time.monotonic()
+    while True:
+        events = await asyncio.to_thread(broker.fetch_events, job_id, after)
+        for seq, message in events:
+            after = seq
+            last_event = time.monotonic()
+            await websocket.send_text(message)
+            if message_type(message) in TERMINAL_MESSAGE_TYPES:
+                return
+        if time.monotonic() - last_event > timeout:
+            await asyncio.to_thread(broker.cancel, job_id)
+            await websocket.send_json({"type": "error", "message": f"Job timed out: no progress for {timeout:.0f} seconds"})
+            return
+        await asyncio.sleep(poll_interval)
+
+def get_job_broker() -> Optional[JobBroker]:
+    """Create the broker selected by JOB_QUEUE_MODE ('off', 'sqlite' or 'memory')"""
+    mode = os.getenv('JOB_QUEUE_MODE', 'off').lower()
+    if mode == 'sqlite':
+        return SQLiteJobBroker(os.getenv('JOB_QUEUE_DB', 'jobs.db'))
+    if mode == 'memory':
+        return InMemoryJobBroker()
+    return None
@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+from typing import Optional, Type, TypeVar
+from openai import AsyncOpenAI
+from pydantic import BaseModel, ValidationError
+from utils.json_schema import response_format_for
+from services.shared_state import llm_rate_budget
+from services.token_planner import record_usage
+from utils.profiling import profile_stage
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+# Cap on how much source context is echoed back in a repair prompt
+MAX_REPAIR_CONTEXT_CHARS = 12000
+
+def fixture_key(request: dict) -> str:
+    """Stable hash of a chat completion request, used to name recorded fixtures"""
+    canonical = {key: request.get(key) for key in ('model', 'messages', 'temperature', 'response_format')}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+class LLMClient:
+    """Async OpenAI chat client shared by the parser and AI services
+
+    Every call is a plain coroutine, so cancelling the task awaiting it (for
+    example when the WebSocket client disconnects) aborts the in-flight HTTP
+    request instead of leaving it running in a worker thread.
+
+    LLM_RECORD_MODE=record saves every response under LLM_FIXTURES_DIR;
+    LLM_RECORD_MODE=replay serves responses from there without calling the
+    API. OPENAI_BASE_URL can point the client at a stand-in server.
+    """
+
+    def __init__(self, api_key: str):
+        self.client = AsyncOpenAI(api_key=api_key, base_url=os.getenv('OPENAI_BASE_URL') or None)
+        self.record_mode = os.getenv('LLM_RECORD_MODE', 'off').lower()
+        self.fixtures_dir = os.getenv('LLM_FIXTURES_DIR', 'fixtures/llm')
+
+    async def complete_json(self, model: str, messages: list, temperature: float, response_format: Optional[dict] = None) -> dict:
+        """Run a JSON-mode chat completion and return the decoded object"""
+        request = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "response_format": response_format or {"type": "json_object"}
+        }
+
+        if self.record_mode == 'replay':
+            return json.loads(self._load_fixture(request))
+
+        # Shared requests-per-minute budget (LLM_REQUESTS_PER_MINUTE) across all workers
+        with profile_stage('rate_budget'):
+            await llm_rate_budget.acquire()
+        with profile_stage(f'llm_request:{model}'):
+            response = await self.client.chat.completions.create(**request)
+        record_usage(response.usage)
+        content = response.choices[0].message.content
+
+        if self.record_mode == 'record':
+            self._save_fixture(request, content)
+
+        return json.loads(content)
+
+    def _fixture_path(self, request: dict) -> str:
+        return os.path.join(self.fixtures_dir, f"{fixture_key(request)}.json")
+
+    def _load_fixture(self, request: dict) -> str:
+        path = self._fixture_path(request)
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded LLM response for this request ({path})")
+        with open(path) as f:
+            return json.load(f)['response']['content']
+
+    def _save_fixture(self, request: dict, content: str):
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        with open(self._fixture_path(request), 'w') as f:
+            json.dump({"request": request, "response": {"content": content}}, f, indent=2)
+
+    async def complete_structured(
+        self,
+        model: str,
+        messages: list,
+        temperature: float,
+        response_model: Type[ModelT],
+        repair_context: str = ""
+    ) -> ModelT:
+        """Run a strict structured-output completion and validate it into `response_model`
+
+        If validation still fails, only the failing fields are sent back to
+        the model for repair instead of re-running the whole request.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            response_model: Pydantic model the response must match (compiled to a strict JSON Schema)
+            repair_context: Source material the repair call may need to fill in fields (e.g. resume text)
+        """
+        result = await self.complete_json(model, messages, temperature, response_format_for(response_model))
+
+        # Validating the decoded dict measures faster than model_validate_json on
+        # the raw text with pydantic-core 2.14 (benchmarks/bench_validation.py),
+        # and repair needs the dict anyway
+        try:
+            with profile_stage(f'validate:{response_model.__name__}'):
+                return response_model.model_validate(result)
+        except ValidationError as e:
+            print(f"⚠️ {response_model.__name__} failed validation on {len(e.errors())} field(s), requesting targeted repair")
+            fixes = await self._repair_fields(model, result, e, repair_context)
+
+        for path, value in fixes.items():
+            _set_path(result, path, value)
+        return response_model.model_validate(result)
+
+    async def _repair_fields(self, model: str, result: dict, error: ValidationError, repair_context: str) -> dict:
+        """Ask the model for corrected values of just the fields that failed validation"""
+        failing_fields = {}
+        for err in error.errors():
+            path = _data_path(result, err['loc'], err['type'] == 'missing')
+            if path not in failing_fields:
+                failing_fields[path] = {
+                    "problem": err['msg'],
+                    "currentValue": None if err['type'] == 'missing' else err.get('input')
+                }
+
+        prompt = f"""Some fields of a JSON document failed schema validation. Return corrected values for ONLY these fields.
+
+❌ FAILING FIELDS (keyed by slash-separated path):
+{json.dumps(failing_fields, indent=2, default=str)}
+
+📄 CONTEXT:
+{(repair_context or json.dumps(result, default=str))[:MAX_REPAIR_CONTEXT_CHARS]}
+
+Return ONLY valid JSON of the form {{"fixes": {{"<path>": <corrected value>, ...}}}} with one entry per failing field."""
+
+        response = await self.complete_json(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You repair JSON fields that failed schema validation. You change nothing except the listed fields. Always return valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0
+        )
+        return {path: value for path, value in response.get('fixes', {}).items() if path in failing_fields}
+
+def _data_path(data, loc: tuple, missing: bool) -> str:
+    """Map a Pydantic error location onto a path that exists in the raw data
+
+    Union validation adds type tags (e.g. 'list[str]') to error locations;
+    those are dropped by stopping at the deepest segment present in the data.
+    """
+    segments = []
+    node = data
+    for index, key in enumerate(loc):
+        is_last = index == len(loc) - 1
+        if isinstance(node, dict) and (key in node or (missing and is_last)):
+            node = node.get(key)
+        elif isinstance(node, list) and isinstance(key, int) and key < len(node):
+            node = node[key]
+        else:
+            break
+        segments.append(str(key))
+    return '/'.join(segments)
+
+def _set_path(data, path: str, value):
+    """Set a value at a slash-separated path, creating missing objects"""
+    keys = [int(key) if key.isdigit() else key for key in path.split('/')] if path else []
+    if not keys:
+        return
+    node = data
+    for key in keys[:-1]:
+        if isinstance(node, dict) and not isinstance(node.get(key), (dict, list)):
+            node[key] = {}
+        node = node[key]
+    node[keys[-1]] = value
@@ -0,0 +1,117 @@
+import os
+import time
+import threading
+from typing import Awaitable, Callable, List, Optional
+
+# Large model used when a cheaper model's output is rejected
+DEFAULT_ESCALATION_MODEL = "gpt-4o"
+
+# Per-task defaults: (environment variable, model)
+DEFAULT_TASK_MODELS = {
+    'parse': ('PARSE_MODEL', 'gpt-4o-mini'),
+    'optimize': ('OPTIMIZE_MODEL', DEFAULT_ESCALATION_MODEL),
+    'cover_letter': ('COVER_LETTER_MODEL', 'gpt-4o-mini'),
+    'job_analysis': ('JOB_ANALYSIS_MODEL', 'gpt-4o-mini'),
+}
+
+class RouteStats:
+    """Thread-safe latency and success counters per (task, model) route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, task: str, model: str, latency: float, success: bool):
+        with self._lock:
+            route = self._routes.setdefault((task, model), {'calls': 0, 'successes': 0, 'totalLatency': 0.0})
+            route['calls'] += 1
+            route['successes'] += int(success)
+            route['totalLatency'] += latency
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [
+                {
+                    'task': task,
+                    'model': model,
+                    'calls': route['calls'],
+                    'successRate': route['successes'] / route['calls'],
+                    'avgLatencyMs': round(route['totalLatency'] / route['calls'] * 1000, 1),
+                }
+                for (task, model), route in self._routes.items()
+            ]
+
+# Shared by every router in the process so /api/model-routes sees all calls
+route_stats = RouteStats()
+
+class ModelRouter:
+    """Picks a model per task and escalates to the large model when needed
+
+    Each task first runs on its configured model. If the output fails
+    validation, or passes validation but the quality check reports problems,
+    the call is retried once on the escalation model.
+    """
+
+    def __init__(self, stats: RouteStats = route_stats):
+        self.stats = stats
+        self.escalation_model = os.getenv('ESCALATION_MODEL', DEFAULT_ESCALATION_MODEL)
+        self.task_models = {
+            task: os.getenv(env_var, default)
+            for task, (env_var, default) in DEFAULT_TASK_MODELS.items()
+        }
+
+    def models_for(self, task: str) -> List[str]:
+        """Models to try for a task, cheapest first"""
+        model = self.task_models.get(task, self.escalation_model)
+        if model == self.escalation_model:
+            return [model]
+        return [model, self.escalation_model]
+
+    async def run(
+        self,
+        task: str,
+        call: Callable[[str], Awaitable[object]],
+        validate: Optional[Callable[[object], object]] = None,
+        check: Optional[Callable[[object], list]] = None,
+        models: Optional[List[str]] = None
+    ):
+        """Run `call(model)` on each routed model until the output is accepted
+
+        Args:
+            task: Routing key ('parse', 'optimize', 'cover_letter', 'job_analysis')
+            call: Async function performing the model call for a given model name
+            validate: Optional conversion of the response to the output object, raising on invalid data
+            check: Optional quality check returning a list of problems with a valid output
+            models: Models to try instead of the task's routed ones (see services/token_planner.py)
+
+        Returns the first accepted output. If every model's output had quality
+        problems, the first valid one is returned; if none was valid, the last
+        error is raised.
+        """
+        best = None
+        last_error = None
+
+        for model in models or self.models_for(task):
+            start = time.perf_counter()
+            try:
+                output = await call(model)
+                if validate:
+                    output = validate(output)
+            except Exception as e:
+                self.stats.record(task, model, time.perf_counter() - start, False)
+                print(f"⚠️ {task} on {model} failed validation: {type(e).__name__}: {e}")
+                last_error = e
+                continue
+
+            problems = check(output) if check else []
+            self.stats.record(task, model, time.perf_counter() - start, not problems)
+            if not problems:
+                return output
+
+            print(f"⚠️ {task} on {model} failed quality check: {problems[0]}")
+            if best is None:
+                best = output
+
+        if best is not None:
+            return best
+        raise last_error
@@ -1,10 +1,51 @@
 import PyPDF2
-import docx
+import io
 import re
 import os
-import json
-from openai import OpenAI
-from models.schemas import Resume
+import asyncio
+import hashlib
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Union
+from models.schemas import Resume, ResumeSections
+from services.llm_client import LLMClient
+from services.model_router import ModelRouter
+from services.text_normalizer import normalize_text, PAGE_BREAK
+from services.docx_extractor import extract_docx_text
+from services.completeness import analyze_completeness
+from services.text_utils import section_heading
+from services.section_confidence import split_sections, score_sections, SECTION_FIELDS
+from services.token_planner import TokenPlanner, TokenPlan
+from services.shared_state import get_cache
+from utils.tokens import count_tokens
+from utils.profiling import profile_stage
+
+# AI parse results keyed by normalized text; shared across workers when SHARED_STATE_DB is set
+parse_cache = get_cache('parse')
+
+# 'ai' sends the whole document to the LLM; 'hybrid' parses it locally and
+# sends only the sections the local parser is not confident about
+PARSE_MODE = os.getenv('PARSE_MODE', 'ai').lower()
+# Sections scoring below this confidence are re-parsed by the LLM in hybrid mode
+HYBRID_CONFIDENCE_THRESHOLD = float(os.getenv('HYBRID_CONFIDENCE_THRESHOLD', 0.85))
+# If this share of the text is low-confidence, the whole document goes to the LLM instead
+HYBRID_FULL_PARSE_SHARE = float(os.getenv('HYBRID_FULL_PARSE_SHARE', 0.7))
+
+class HybridPlan(NamedTuple):
+    """Outcome of the local pass of a hybrid parse"""
+    resume: Resume  # Locally parsed resume
+    scores: Dict[str, float]  # Confidence per text section
+    fields: List[str]  # Resume fields the LLM should re-parse
+    text: str  # Text of the low-confidence sections, sent to the LLM
+    full: bool  # Too much is low-confidence: parse the whole document with the LLM
+
+class ParseResult(NamedTuple):
+    """Outcome of `FileParserService.parse_file`"""
+    resume: Resume
+    text: str  # Normalized extracted text
+    source: str  # 'ai', 'hybrid', 'fallback' (the AI call failed) or 'regex' (no AI configured)
+
+# Parses worth keeping in the history store; a fallback would otherwise be
+# served again instead of retrying the AI
+STORED_PARSE_SOURCES = ('ai', 'hybrid')
 
 class FileParserService:
     """Service to parse different file formats into Resume JSON"""
@@ -12,45 +53,54 @@ class FileParserService:
     def __init__(self):
         api_key = os.getenv('OPENAI_API_KEY')
         if api_key:
-            self.client = OpenAI(api_key=api_key)
+            self.client = LLMClient(api_key)
+            self.router = ModelRouter()
+            self.token_planner = TokenPlanner(self.router)
             self.use_ai_parsing = True
+            self.parse_mode = PARSE_MODE
         else:
             self.client = None
             self.use_ai_parsing = False
+            self.parse_mode = 'regex'
             print("⚠️ Warning: OPENAI_API_KEY not set. Using fallback regex parsing (less reliable)")
 
-    def parse_file(self, file_content: bytes, file_type: str, progress_callback=None) -> tuple[Resume, str]:
+    async def parse_file(self, file_content: Union[bytes, BinaryIO], file_type: str, progress_callback=None, refresh: bool = False) -> ParseResult:
         """Parse file content based on file type
 
+        Text extraction runs in a worker thread; the AI call is awaited directly
+        so cancelling the calling task aborts the request.
+
         Args:
-            file_content: The file content as bytes
+            file_content: The file content as bytes or a readable binary file (e.g. a spooled upload)
             file_type: The MIME type of the file
             progress_callback: Optional async callback for progress updates (progress, message)
+            refresh: Ignore cached AI results and parse again
 
         Returns:
-            tuple: (parsed_resume, extracted_text)
+            ParseResult: (resume, text, source), where text is the normalized extracted text
         """
         # Helper to send progress updates
-        def send_progress(progress, message):
+        async def send_progress(progress, message):
             if progress_callback:
                 try:
-                    progress_callback(progress, message)
+                    await progress_callback(progress, message)
                 except Exception as e:
                     print(f"Error sending progress: {e}")
 
         # Extract text based on file type
-        send_progress(20, "📄 Extracting text from document...")
+        await send_progress(20, "📄 Extracting text from document...")
 
-        if file_type == 'application/pdf':
-            text = self._parse_pdf(file_content)
-        elif file_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
-            text = self._parse_docx(file_content)
-        elif file_type == 'text/markdown' or file_type.endswith('.md'):
-            text = file_content.decode('utf-8')
-        else:
-            text = file_content.decode('utf-8')
+        with profile_stage('extract_text'):
+            raw_text = await asyncio.to_thread(self._extract_text, file_content, file_type)
+
+        # Strip headers/footers, hyphenation and whitespace noise before it costs prompt tokens
+        with profile_stage('normalize_text'):
+            text, report = normalize_text(raw_text)
+        print(f"🧹 Normalized text: {report['originalChars']} → {report['normalizedChars']} chars, "
+              f"~{report['tokensSaved']} tokens saved ({report['headerFooterLinesRemoved']} header/footer lines, "
+              f"{report['hyphenationsJoined']} hyphenations)")
 
-        send_progress(35, f"✅ Extracted {len(text)} characters from document")
+        await send_progress(35, f"✅ Extracted {len(text)} characters from document")
 
         # Log extracted text for debugging
         print(f"\n{'='*80}")
@@ -62,43 +112,104 @@ class FileParserService:
         print(f"{'='*80}\n")
 
         # Use AI-powered parsing if available, otherwise fallback to regex
-        if self.use_ai_parsing:
-            send_progress(45, "🤖 Analyzing with AI...")
-            resume = self._parse_with_ai(text, progress_callback=send_progress)
-            send_progress(85, "✅ AI parsing complete")
+        if self.use_ai_parsing and self.parse_mode == 'hybrid':
+            await send_progress(45, "🧩 Parsing sections, AI for the uncertain ones...")
+            with profile_stage('hybrid_parse'):
+                resume, source = await self._parse_hybrid(text, progress_callback=send_progress, refresh=refresh)
+            await send_progress(85, "✅ Parsing complete")
+        elif self.use_ai_parsing:
+            await send_progress(45, "🤖 Analyzing with AI...")
+            with profile_stage('ai_parse'):
+                try:
+                    resume, source = await self._parse_with_ai(text, progress_callback=send_progress, refresh=refresh), 'ai'
+                except Exception as e:
+                    resume, source = self._fallback_parse(text, e), 'fallback'
+            await send_progress(85, "✅ AI parsing complete")
         else:
-            send_progress(45, "📝 Parsing with pattern matching...")
-            resume = self._parse_text_to_resume(text)
-            send_progress(85, "✅ Parsing complete")
+            await send_progress(45, "📝 Parsing with pattern matching...")
+            with profile_stage('regex_parse'):
+                resume, source = self._parse_text_to_resume(text), 'regex'
+            await send_progress(85, "✅ Parsing complete")
 
-        return resume, text
+        return ParseResult(resume, text, source)
 
-    def _parse_pdf(self, content: bytes) -> str:
+    def _extract_text(self, file_content: Union[bytes, BinaryIO], file_type: str) -> str:
+        """Extract plain text based on file type"""
+        # PyPDF2 and the DOCX extractor read from file objects, so uploads are never copied into memory
+        stream = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
+        if file_type == 'application/pdf':
+            return self._parse_pdf(stream)
+        elif file_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword']:
+            return self._parse_docx(stream)
+        elif file_type == 'text/markdown' or file_type.endswith('.md'):
+            return stream.read().decode('utf-8')
+        else:
+            return stream.read().decode('utf-8')
+
+    def _parse_pdf(self, stream: BinaryIO) -> str:
         """Extract text from PDF"""
-        import io
-        pdf_file = io.BytesIO(content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        pdf_reader = PyPDF2.PdfReader(stream)
         text = ""
         for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+            # Form feeds mark page boundaries for header/footer detection
+            text += page.extract_text() + PAGE_BREAK
         return text
 
-    def _parse_docx(self, content: bytes) -> str:
-        """Extract text from DOCX"""
-        import io
-        docx_file = io.BytesIO(content)
-        doc = docx.Document(docx_file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+    def _parse_docx(self, stream: BinaryIO) -> str:
+        """Extract text from DOCX, including headers, footers, tables and text boxes"""
+        return extract_docx_text(stream)
+
+    async def _parse_with_ai(self, text: str, progress_callback=None, refresh: bool = False) -> Resume:
+        """Use AI (GPT-4) to intelligently parse resume text into structured JSON
 
-    def _parse_with_ai(self, text: str, progress_callback=None) -> Resume:
-        """Use AI (GPT-4) to intelligently parse resume text into structured JSON"""
+        Raises if the AI call fails; callers fall back with `_fallback_parse`.
+        """
+
+        cache_key = hashlib.sha256(text.encode()).hexdigest()
+        cached = None if refresh else await parse_cache.aget(cache_key)
+        if cached is not None:
+            if progress_callback:
+                await progress_callback(75, "⚡ Resume parsed before, reusing result...")
+            return Resume.model_validate_json(cached)
+
+        if progress_callback:
+            await progress_callback(50, "🧠 Sending to AI for intelligent parsing...")
+
+        messages = self._ai_parse_messages(text)
+        plan = self.token_planner.plan('parse', messages, Resume, source_text=text)
+
+        if progress_callback:
+            await progress_callback(55, "⏳ Waiting for AI response...")
+
+        with self.token_planner.track(plan):
+            if plan.strategy == 'chunked':
+                resume = await self._parse_chunked(text, plan)
+            else:
+                # Fast model first; escalates to the large model if the output
+                # fails validation or looks like it dropped content. The strict
+                # schema guarantees the Resume shape, so no normalization pass
+                resume = await self.router.run(
+                    'parse',
+                    lambda model: self.client.complete_structured(
+                        model=model,
+                        messages=messages,
+                        temperature=0.05,  # Very low temperature for maximum accuracy and consistency
+                        response_model=Resume,
+                        repair_context=text
+                    ),
+                    check=lambda resume: [issue.message for issue in analyze_completeness(resume, text).issues],
+                    models=plan.models
+                )
 
         if progress_callback:
-            progress_callback(50, "🧠 Sending to AI for intelligent parsing...")
+            await progress_callback(75, "📥 AI response validated, finalizing...")
 
+        # Only AI results are cached; the regex fallback is cheap to redo
+        await parse_cache.aput(cache_key, resume.model_dump_json())
+        return resume
+
+    def _ai_parse_messages(self, text: str) -> list:
+        """Chat messages asking the LLM to parse the whole resume text"""
         prompt = f"""You are an EXPERT resume parser with ZERO TOLERANCE for data loss. Your job is to extract EVERY SINGLE DETAIL from this resume with PERFECT accuracy.
 
 📄 RESUME TEXT TO PARSE:
@@ -188,69 +299,179 @@ The parsed resume should contain AT LEAST 80% of the character count of the orig
 
 Return ONLY the valid JSON object, no additional text."""
 
-        try:
-            if progress_callback:
-                progress_callback(55, "⏳ Waiting for AI response...")
-
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",  # Can also use "gpt-3.5-turbo" for cost savings
-                messages=[
-                    {"role": "system", "content": "You are an EXPERT resume parser with ZERO tolerance for data loss. You extract EVERY detail word-for-word with PERFECT accuracy. You NEVER summarize, skip content, or lose information. Always return complete, thorough JSON matching the exact schema."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.05,  # Very low temperature for maximum accuracy and consistency
-                response_format={"type": "json_object"}
+        messages = [
+            {"role": "system", "content": "You are an EXPERT resume parser with ZERO tolerance for data loss. You extract EVERY detail word-for-word with PERFECT accuracy. You NEVER summarize, skip content, or lose information. Always return complete, thorough JSON matching the exact schema."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages
+
+    def plan_hybrid_parse(self, text: str) -> HybridPlan:
+        """Parse each section locally and pick the ones the LLM should re-parse"""
+        sections = split_sections(text)
+        header = sections['header']
+        resume = Resume(
+            contact=self._extract_contact_info('\n'.join(header), header),
+            summary=self._parse_summary_lines(sections.get('summary', [])),
+            experience=self._parse_experience_lines(sections.get('experience', [])),
+            education=self._parse_education_lines(sections.get('education', [])),
+            skills=self._parse_skills_lines(sections.get('skills', []))
+        )
+        scores = score_sections(resume, sections)
+
+        low = [name for name, score in scores.items() if score < HYBRID_CONFIDENCE_THRESHOLD]
+        fields = [field for name in low for field in SECTION_FIELDS[name]]
+        if low:
+            # An unheaded summary sits in the header, and sections under
+            # headings we don't recognize sit in whichever section precedes them
+            if 'header' in low and 'summary' not in sections:
+                fields.append('summary')
+            fields += [name for name in ('experience', 'education', 'skills') if name not in sections]
+
+        low_text = '\n\n'.join(
+            '\n'.join(sections[name] if name == 'header' else [name.upper(), *sections[name]])
+            for name in low
+        )
+        total_chars = sum(len(line) for lines in sections.values() for line in lines)
+        low_chars = sum(len(line) for name in low for line in sections[name])
+        full = bool(total_chars) and low_chars / total_chars >= HYBRID_FULL_PARSE_SHARE
+        return HybridPlan(resume, scores, fields, low_text, full)
+
+    async def _parse_chunked(self, text: str, plan: TokenPlan, fields: Optional[List[str]] = None, base: Optional[Resume] = None) -> Resume:
+        """Parse a resume too long for one call in chunks that each fit the plan's models
+
+        Chunks break between blocks of lines, so entries stay whole unless
+        one alone exceeds a chunk. Chunks are parsed concurrently into
+        sections and concatenated in order. Contact details and summary
+        come from the first chunk that has them, and anything no chunk
+        returned is kept from `base` (by default the regex parse).
+        Only `fields` (by default all) are requested and replaced.
+        """
+        fields = fields or list(Resume.model_fields)
+        overhead = self.token_planner.count_request(self._section_messages(fields, ''), ResumeSections, plan.models[0])
+        chunks = _chunk_text(text, self.token_planner.chunk_tokens(plan, overhead), plan.models[0])
+        print(f"   Parsing {len(chunks)} chunks")
+
+        results = await asyncio.gather(*(
+            self.router.run(
+                'parse',
+                lambda model, chunk=chunk: self.client.complete_structured(
+                    model=model,
+                    messages=self._section_messages(fields, chunk),
+                    temperature=0.05,
+                    response_model=ResumeSections,
+                    repair_context=chunk
+                ),
+                models=plan.models
             )
+            for chunk in chunks
+        ))
+
+        contact = next((sections.contact for sections in results if sections.contact and sections.contact.name), None)
+        summary = next((sections.summary for sections in results if sections.summary), None)
+        experience = [exp for sections in results for exp in sections.experience or []]
+        education = [edu for sections in results for edu in sections.education or []]
+        skills = [skill for sections in results for skill in sections.skills or []]
+        update = {
+            'contact': contact,
+            'summary': summary,
+            # Each chunk numbers its entries from 1
+            'experience': [exp.model_copy(update={'id': f'exp{i + 1}'}) for i, exp in enumerate(experience)],
+            'education': [edu.model_copy(update={'id': f'edu{i + 1}'}) for i, edu in enumerate(education)],
+            'skills': skills,
+        }
+        resume = base or self._parse_text_to_resume(text)
+        return resume.model_copy(update={field: value for field, value in update.items() if value and field in fields})
 
-            if progress_callback:
-                progress_callback(70, "📥 Received AI response, processing...")
+    def _hybrid_messages(self, plan: HybridPlan) -> list:
+        return self._section_messages(plan.fields, plan.text)
 
-            result = json.loads(response.choices[0].message.content)
-            print(f"✅ Successfully parsed AI response")
+    def _section_messages(self, fields: List[str], text: str) -> list:
+        """Chat messages asking the LLM to parse resume sections into the given fields"""
+        prompt = f"""Parse these sections of a resume into JSON. Fill ONLY these fields: {', '.join(fields)}. Set every other field to null.
 
-            if progress_callback:
-                progress_callback(75, "🔧 Normalizing data structures...")
-
-            # Validate and ensure required fields exist
-            if not result.get('contact'):
-                result['contact'] = {'name': '', 'email': '', 'phone': '', 'location': ''}
-            if not result.get('experience'):
-                result['experience'] = []
-            if not result.get('education'):
-                result['education'] = []
-            if not result.get('skills'):
-                result['skills'] = []
-
-            # Normalize education achievements to be a list
-            print(f"🔍 Normalizing {len(result.get('education', []))} education entries...")
-            for i, edu in enumerate(result.get('education', [])):
-                if 'achievements' in edu:
-                    print(f"   Education {i}: achievements type = {type(edu['achievements'])}")
-                    if isinstance(edu['achievements'], str):
-                        print(f"   Converting achievements from string to list...")
-                        # Convert string to list by splitting on common delimiters
-                        achievements_str = edu['achievements']
-                        # Split on common delimiters: comma, semicolon, or newline
-                        achievements = [a.strip() for a in achievements_str.replace(';', ',').split(',') if a.strip()]
-                        edu['achievements'] = achievements if achievements else None
-                        print(f"   ✅ Converted to list with {len(achievements)} items")
-
-            # Also normalize experience achievements
-            print(f"🔍 Normalizing {len(result.get('experience', []))} experience entries...")
-            for i, exp in enumerate(result.get('experience', [])):
-                if 'achievements' in exp and isinstance(exp['achievements'], str):
-                    achievements_str = exp['achievements']
-                    achievements = [a.strip() for a in achievements_str.replace(';', ',').split(',') if a.strip()]
-                    exp['achievements'] = achievements if achievements else None
-                    print(f"   Experience {i}: ✅ Converted achievements to list")
-
-            print(f"✅ About to create Resume object...")
-            return Resume(**result)
+📄 RESUME SECTIONS:
+{text}
+
+🚨 RULES:
+1. **PRESERVE EVERYTHING** - Copy text word for word, including every bullet, metric and skill
+2. **NO SUMMARIZING** - Don't paraphrase, combine or shorten bullets
+3. **MAINTAIN ORDER** - Keep entries in the order they appear, with ids exp1, exp2, ... and edu1, edu2, ...
+4. Dates keep their original format; use 'Present' for current roles
+5. If a listed field has no content in these sections, return an empty list (or empty string) for it
+
+Return ONLY the valid JSON object."""
+        return [
+            {"role": "system", "content": "You are an EXPERT resume parser with ZERO tolerance for data loss. You extract EVERY detail word-for-word. Always return valid JSON matching the exact schema."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _fallback_parse(self, text: str, error: Exception) -> Resume:
+        """Regex parse after the AI call failed"""
+        print(f"⚠️ AI parsing failed: {type(error).__name__}: {error}")
+        print("   Falling back to regex parsing.")
+        return self._parse_text_to_resume(text)
+
+    async def _parse_hybrid(self, text: str, progress_callback=None, refresh: bool = False) -> tuple[Resume, str]:
+        """Parse locally, then let the LLM re-parse only the low-confidence sections
+
+        Returns the resume and its source: 'hybrid', 'ai' for a whole-document
+        parse, or 'fallback' when the AI call failed.
+        """
+        with profile_stage('local_parse'):
+            plan = self.plan_hybrid_parse(text)
+        print(f"🧩 Section confidence: {', '.join(f'{name} {score:.2f}' for name, score in plan.scores.items())}")
+
+        if plan.full:
+            print("   Mostly low-confidence, parsing the whole document with AI")
+            try:
+                return await self._parse_with_ai(text, progress_callback=progress_callback, refresh=refresh), 'ai'
+            except Exception as e:
+                return self._fallback_parse(text, e), 'fallback'
+        if not plan.fields:
+            print("   All sections parsed locally, no AI call")
+            return plan.resume, 'hybrid'
+
+        cache_key = hashlib.sha256(('hybrid:' + text).encode()).hexdigest()
+        cached = None if refresh else await parse_cache.aget(cache_key)
+        if cached is not None:
+            return Resume.model_validate_json(cached), 'hybrid'
+
+        print(f"   Sending {', '.join(plan.fields)} to AI ({len(plan.text)} of {len(text)} chars)")
+        if progress_callback:
+            await progress_callback(55, f"🧠 AI is parsing {', '.join(plan.fields)}...")
+        messages = self._hybrid_messages(plan)
+
+        def merge(sections: ResumeSections) -> Resume:
+            update = {field: getattr(sections, field) for field in plan.fields if getattr(sections, field) is not None}
+            return plan.resume.model_copy(update=update)
+
+        token_plan = self.token_planner.plan('parse', messages, ResumeSections, source_text=plan.text)
+
+        try:
+            with self.token_planner.track(token_plan):
+                if token_plan.strategy == 'chunked':
+                    resume = await self._parse_chunked(plan.text, token_plan, fields=plan.fields, base=plan.resume)
+                else:
+                    resume = await self.router.run(
+                        'parse',
+                        lambda model: self.client.complete_structured(
+                            model=model,
+                            messages=messages,
+                            temperature=0.05,
+                            response_model=ResumeSections,
+                            repair_context=plan.text
+                        ),
+                        validate=merge,
+                        check=lambda resume: [issue.message for issue in analyze_completeness(resume, text).issues],
+                        models=token_plan.models
+                    )
+            await parse_cache.aput(cache_key, resume.model_dump_json())
+            return resume, 'hybrid'
 
         except Exception as e:
-            print(f"⚠️ AI parsing failed: {type(e).__name__}: {e}")
-            print(f"   Falling back to regex parsing.")
-            return self._parse_text_to_resume(text)
+            print(f"⚠️ AI section parsing failed: {type(e).__name__}: {e}")
+            print("   Keeping the locally parsed sections.")
+            return plan.resume, 'fallback'
 
     def _parse_text_to_resume(self, text: str) -> Resume:
         """Parse text content into Resume structure"""
@@ -356,12 +577,12 @@ Return ONLY the valid JSON object, no additional text."""
                            'San Francisco', 'New York', 'Los Angeles', 'Chicago', 'Boston',
                            'Seattle', 'Austin', 'Denver', 'Portland', 'USA', 'US']
         for line in lines[:15]:
-            if any(keyword in line for keyword in location_keywords):
-                # Clean up the location
-                location = line.split('|')[0].strip() if '|' in line else line
-                if location and len(location) < 50:  # Reasonable length for location
-                    contact['location'] = location
-                    break
+            # "email | phone | City, ST": take the part naming the place
+            parts = [part.strip() for part in line.split('|')]
+            location = next((part for part in parts if '@' not in part and any(keyword in part for keyword in location_keywords)), None)
+            if location and len(location) < 50:  # Reasonable length for location
+                contact['location'] = location
+                break
 
         return contact
 
@@ -371,51 +592,60 @@ Return ONLY the valid JSON object, no additional text."""
         summary_start = -1
 
         for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in summary_keywords):
+            if _is_heading(line, summary_keywords):
                 summary_start = i + 1
                 break
 
         if summary_start > 0:
-            summary_lines = []
-            for i in range(summary_start, min(summary_start + 15, len(lines))):
-                line = lines[i]
+            summary_end = min(summary_start + 15, len(lines))
+            for i in range(summary_start, summary_end):
                 # Stop at next section
-                if any(keyword in line.lower() for keyword in ['experience', 'education', 'skills', 'projects', 'certifications']):
+                if _is_heading(lines[i], ['experience', 'education', 'skills', 'projects', 'certifications']):
+                    summary_end = i
                     break
-                if line and not line.startswith('#') and not line.startswith('-') and not line.startswith('•'):
-                    summary_lines.append(line)
-            return ' '.join(summary_lines)
+            return self._parse_summary_lines(lines[summary_start:summary_end])
 
         return ''
 
+    def _parse_summary_lines(self, lines: list) -> str:
+        """Summary text from the lines of a summary section"""
+        return ' '.join(line for line in lines if line and not line.startswith('#') and not line.startswith('-') and not line.startswith('•'))
+
     def _extract_experience(self, lines: list) -> list:
         """Extract work experience"""
-        experience = []
         exp_start = -1
 
         # Find experience section
         for i, line in enumerate(lines):
-            if 'experience' in line.lower() or 'work history' in line.lower():
+            if _is_heading(line, ['experience', 'work history']):
                 exp_start = i + 1
                 break
 
         if exp_start < 0:
-            return experience
+            return []
 
         # Find where experience section ends
         exp_end = len(lines)
         for i in range(exp_start, len(lines)):
-            if any(keyword in lines[i].lower() for keyword in ['education', 'skills', 'projects', 'certifications', 'languages']):
+            if _is_heading(lines[i], ['education', 'skills', 'projects', 'certifications', 'languages']):
                 exp_end = i
                 break
 
-        # Parse experience entries
+        return self._parse_experience_lines(lines[exp_start:exp_end])
+
+    def _parse_experience_lines(self, lines: list) -> list:
+        """Experience entries from the lines of an experience section"""
+        experience = []
         current_exp = None
-        for i in range(exp_start, exp_end):
-            line = lines[i]
+        for line in lines:
+            # Check if this is a date line ("Jan 2020 - Present"); checked
+            # first, as it would otherwise be taken for a new entry
+            dates = _date_range(line)
+            if dates and current_exp:
+                current_exp['startDate'], current_exp['endDate'] = dates
 
             # Check if this is a job title/company line (usually contains company name and position)
-            if line and not line.startswith('-') and not line.startswith('•') and len(line) > 5:
+            elif line and not line.startswith('-') and not line.startswith('•') and len(line) > 5:
                 # Save previous experience if exists
                 if current_exp and current_exp['description']:
                     experience.append(current_exp)
@@ -433,26 +663,22 @@ Return ONLY the valid JSON object, no additional text."""
 
                 # Try to parse company and position
                 if '|' in line:
-                    parts = line.split('|')
-                    current_exp['company'] = parts[0].strip()
-                    current_exp['position'] = parts[1].strip() if len(parts) > 1 else ''
-                    current_exp['location'] = parts[2].strip() if len(parts) > 2 else ''
+                    parts = [part.strip() for part in line.split('|')]
+                    # "Company | Position | Location | Jan 2020 - Present"
+                    for part in parts[1:]:
+                        dates = _date_range(part)
+                        if dates:
+                            current_exp['startDate'], current_exp['endDate'] = dates
+                            parts.remove(part)
+                            break
+                    current_exp['company'] = parts[0]
+                    current_exp['position'] = parts[1] if len(parts) > 1 else ''
+                    current_exp['location'] = parts[2] if len(parts) > 2 else ''
                 else:
                     # Try to extract position and company from line
                     current_exp['position'] = line
                     current_exp['company'] = 'Not specified'
 
-            # Check if this is a date line
-            elif line and any(month in line for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']):
-                if current_exp:
-                    # Parse dates
-                    date_parts = line.split('-') if '-' in line else line.split('to')
-                    if len(date_parts) >= 2:
-                        current_exp['startDate'] = date_parts[0].strip()
-                        current_exp['endDate'] = date_parts[1].strip()
-                    else:
-                        current_exp['startDate'] = line
-
             # Check if this is a description line (starts with - or •)
             elif line and (line.startswith('-') or line.startswith('•')):
                 if current_exp:
@@ -466,32 +692,38 @@ Return ONLY the valid JSON object, no additional text."""
 
     def _extract_education(self, lines: list) -> list:
         """Extract education information"""
-        education = []
         edu_start = -1
 
         # Find education section
         for i, line in enumerate(lines):
-            if 'education' in line.lower():
+            if _is_heading(line, ['education']):
                 edu_start = i + 1
                 break
 
         if edu_start < 0:
-            return education
+            return []
 
         # Find where education section ends
         edu_end = len(lines)
         for i in range(edu_start, len(lines)):
-            if any(keyword in lines[i].lower() for keyword in ['skills', 'projects', 'certifications', 'languages', 'experience']):
+            if _is_heading(lines[i], ['skills', 'projects', 'certifications', 'languages', 'experience']):
                 edu_end = i
                 break
 
-        # Parse education entries
+        return self._parse_education_lines(lines[edu_start:edu_end])
+
+    def _parse_education_lines(self, lines: list) -> list:
+        """Education entries from the lines of an education section"""
+        education = []
         current_edu = None
-        for i in range(edu_start, edu_end):
-            line = lines[i]
+        for line in lines:
+            # Check if this is a date line ("2011 - 2015", "May 2015")
+            dates = _date_range(line) or (_single_date(line) and ('', line))
+            if dates and current_edu:
+                current_edu['startDate'], current_edu['endDate'] = dates
 
             # Check if this is a degree/institution line
-            if line and not line.startswith('-') and not line.startswith('•') and len(line) > 5:
+            elif line and not line.startswith('-') and not line.startswith('•') and len(line) > 5:
                 # Save previous education if exists
                 if current_edu:
                     education.append(current_edu)
@@ -509,23 +741,24 @@ Return ONLY the valid JSON object, no additional text."""
 
                 # Try to parse institution and degree
                 if '|' in line:
-                    parts = line.split('|')
-                    current_edu['institution'] = parts[0].strip()
-                    current_edu['degree'] = parts[1].strip() if len(parts) > 1 else ''
-                    current_edu['field'] = parts[2].strip() if len(parts) > 2 else ''
+                    parts = [part.strip() for part in line.split('|')]
+                    for part in parts[1:]:
+                        dates = _date_range(part)
+                        if dates:
+                            current_edu['startDate'], current_edu['endDate'] = dates
+                            parts.remove(part)
+                            break
+                    current_edu['institution'] = parts[0]
+                    current_edu['degree'] = parts[1] if len(parts) > 1 else ''
+                    current_edu['field'] = parts[2] if len(parts) > 2 else ''
                 else:
                     current_edu['institution'] = line
                     current_edu['degree'] = 'Not specified'
 
-            # Check if this is a date line
-            elif line and any(month in line for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']) or re.search(r'\d{4}', line):
+            # Achievements ("- Dean's List")
+            elif line and (line.startswith('-') or line.startswith('•')):
                 if current_edu:
-                    date_parts = line.split('-') if '-' in line else line.split('to')
-                    if len(date_parts) >= 2:
-                        current_edu['startDate'] = date_parts[0].strip()
-                        current_edu['endDate'] = date_parts[1].strip()
-                    else:
-                        current_edu['startDate'] = line
+                    current_edu.setdefault('achievements', []).append(line.lstrip('-•').strip())
 
         # Add last education entry
         if current_edu:
@@ -535,34 +768,45 @@ Return ONLY the valid JSON object, no additional text."""
 
     def _extract_skills(self, lines: list) -> list:
         """Extract skills information"""
-        skills = []
         skills_start = -1
 
         # Find skills section
         for i, line in enumerate(lines):
-            if 'skills' in line.lower() or 'technical skills' in line.lower():
+            if _is_heading(line, ['skills', 'technical skills']):
                 skills_start = i + 1
                 break
 
         if skills_start < 0:
-            return skills
+            return []
 
         # Find where skills section ends
         skills_end = len(lines)
         for i in range(skills_start, len(lines)):
-            if any(keyword in lines[i].lower() for keyword in ['experience', 'education', 'projects', 'certifications', 'languages']):
+            if _is_heading(lines[i], ['experience', 'education', 'projects', 'certifications', 'languages']):
                 skills_end = i
                 break
 
-        # Parse skills
+        return self._parse_skills_lines(lines[skills_start:skills_end])
+
+    def _parse_skills_lines(self, lines: list) -> list:
+        """Skill groups from the lines of a skills section"""
+        skills = []
         current_category = 'Skills'
         current_items = []
 
-        for i in range(skills_start, skills_end):
-            line = lines[i]
+        for line in lines:
+            # "Category: item, item, item" on one line, or "Category | items" from a table row
+            category, colon, items = line.lstrip('-•').partition(':')
+            if not colon and line.count('|') == 1:
+                category, colon, items = line.partition('|')
+            if colon and items.strip() and len(category) < 50:
+                if current_items:
+                    skills.append({'category': current_category, 'items': current_items})
+                current_category = category.strip()
+                current_items = [s.strip() for s in items.split(',') if s.strip()]
 
             # Check if this is a category line (usually ends with : or is a header)
-            if line.endswith(':') or (line and not line.startswith('-') and not line.startswith('•') and len(line) > 3 and len(line) < 50):
+            elif line.endswith(':') or (line and not line.startswith('-') and not line.startswith('•') and ',' not in line and len(line) > 3 and len(line) < 50):
                 # Save previous category if exists
                 if current_items:
                     skills.append({
@@ -592,3 +836,59 @@ Return ONLY the valid JSON object, no additional text."""
             })
 
         return skills
+
+def _is_heading(line: str, keywords: list) -> bool:
+    """Whether a line is a section heading naming one of `keywords`
+
+    Headings are short and carry no content after a colon, so bullets and
+    "Languages: Python, Go" lines that merely mention a keyword don't count.
+    """
+    if len(line) > 40 or line.startswith(('-', '•')) or ':' in line.rstrip(':'):
+        return False
+    return any(keyword in line.lower() for keyword in keywords)
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})'
+_DATE_RANGE = re.compile(rf'({_DATE})\s*(?:-|–|—|to)\s*({_DATE}|present|current|now)', re.IGNORECASE)
+_SINGLE_DATE = re.compile(_DATE, re.IGNORECASE)
+
+def _date_range(line: str):
+    """(start, end) if the line is just a date range such as "Jan 2020 - Present", else None"""
+    match = _DATE_RANGE.fullmatch(line.strip(' ()'))
+    return (match.group(1), match.group(2)) if match else None
+
+def _single_date(line: str) -> bool:
+    return bool(_SINGLE_DATE.fullmatch(line.strip(' ()')))
+
+def _chunk_text(text: str, max_tokens: int, model: str) -> List[str]:
+    """Split text into chunks of at most `max_tokens`, between blocks of lines
+
+    Blocks are separated by blank lines or start at a section heading; a
+    block too large for a chunk is split between lines. A chunk that
+    starts inside a section repeats the section's heading first.
+    """
+    blocks, block = [], []
+    for line in text.splitlines():
+        if not line.strip() or (block and section_heading(line.strip())):
+            if block:
+                blocks.append(block)
+            block = [line] if line.strip() else []
+        else:
+            block.append(line)
+    if block:
+        blocks.append(block)
+
+    chunks, lines, used, heading = [], [], 0, None
+    for block in blocks:
+        if section_heading(block[0].strip()):
+            heading = block[0]
+        for part in [block] if count_tokens('\n'.join(block), model) <= max_tokens else [[line] for line in block]:
+            tokens = count_tokens('\n'.join(part), model)
+            if lines and used + tokens > max_tokens:
+                chunks.append('\n'.join(lines))
+                lines, used = ([heading], count_tokens(heading, model)) if heading and part[0] != heading else ([], 0)
+            lines.extend(part)
+            used += tokens
+    if lines:
+        chunks.append('\n'.join(lines))
+    return chunks
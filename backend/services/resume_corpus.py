@@ -0,0 +1,232 @@
+import sys
+from array import array
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional
+from models.schemas import Resume, ContactInfo, Experience, Education, Skill
+from services.skill_taxonomy import skill_taxonomy
+
+# String/list ID standing for None
+NONE = 0xFFFFFFFF
+
+class StringPool:
+    """Strings stored back to back in one UTF-8 buffer, addressed by integer ID
+
+    `add` appends free text (summaries, bullets) as-is; `intern` stores each
+    distinct value once, for low-cardinality fields such as skills,
+    companies and dates that repeat across a corpus.
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        self._interned = {}
+
+    def add(self, text: Optional[str]) -> int:
+        if text is None:
+            return NONE
+        self._data += text.encode('utf-8')
+        self._offsets.append(len(self._data))
+        return len(self._offsets) - 2
+
+    def intern(self, text: Optional[str]) -> int:
+        if text is None:
+            return NONE
+        string_id = self._interned.get(text)
+        if string_id is None:
+            string_id = self._interned[text] = self.add(text)
+        return string_id
+
+    def lookup(self, text: str) -> Optional[int]:
+        """ID of an interned string, without adding it"""
+        return self._interned.get(text)
+
+    def get(self, string_id: int) -> Optional[str]:
+        if string_id == NONE:
+            return None
+        return self._data[self._offsets[string_id]:self._offsets[string_id + 1]].decode('utf-8')
+
+    def nbytes(self) -> int:
+        interned = sys.getsizeof(self._interned) + sum(sys.getsizeof(text) for text in self._interned)
+        return len(self._data) + self._offsets.itemsize * len(self._offsets) + interned
+
+class ResumeCorpus:
+    """Append-only, array-backed store for large numbers of `Resume`s
+
+    Every string lives in a shared StringPool and every record is a fixed
+    stride of string IDs in a flat `array`, with variable-length parts
+    (experience entries, bullets, skill groups) addressed by offset arrays.
+    A resume costs a few hundred bytes beyond its text instead of the
+    per-object overhead of a tree of models, lists and str objects.
+    `corpus[i]` rebuilds the `Resume` exactly as appended.
+    """
+
+    CONTACT_FIELDS = ('name', 'email', 'phone', 'location', 'linkedin', 'github', 'website')
+    EXPERIENCE_FIELDS = ('id', 'company', 'position', 'location', 'startDate', 'endDate')  # + description, highlights lists
+    EDUCATION_FIELDS = ('id', 'institution', 'degree', 'field', 'location', 'startDate', 'endDate', 'gpa')  # + achievements list
+
+    # Fields shared across many resumes, stored once each
+    INTERNED_CONTACT_FIELDS = {'location'}
+
+    def __init__(self):
+        self.strings = StringPool()
+        self._contact = array('I')
+        self._summary = array('I')
+        self._experience_start = array('I', [0])
+        self._experience = array('I')
+        self._education_start = array('I', [0])
+        self._education = array('I')
+        self._skill_start = array('I', [0])
+        self._skills = array('I')  # category, items list per group
+        # Lists of string IDs (bullets, achievements, skill items)
+        self._list_start = array('I', [0])
+        self._list_items = array('I')
+
+    @classmethod
+    def from_resumes(cls, resumes: Iterable[Resume]) -> 'ResumeCorpus':
+        corpus = cls()
+        for resume in resumes:
+            corpus.append(resume)
+        return corpus
+
+    def __len__(self) -> int:
+        return len(self._summary)
+
+    def __getitem__(self, index: int) -> Resume:
+        if not -len(self) <= index < len(self):
+            raise IndexError("resume index out of range")
+        return self._build(index % len(self))
+
+    def __iter__(self) -> Iterator[Resume]:
+        for index in range(len(self)):
+            yield self._build(index)
+
+    def append(self, resume: Resume) -> int:
+        """Add a resume; returns its index"""
+        strings = self.strings
+        for field in self.CONTACT_FIELDS:
+            value = getattr(resume.contact, field)
+            self._contact.append(strings.intern(value) if field in self.INTERNED_CONTACT_FIELDS else strings.add(value))
+        self._summary.append(strings.add(resume.summary))
+
+        for exp in resume.experience:
+            self._experience.extend(strings.intern(getattr(exp, field)) for field in self.EXPERIENCE_FIELDS)
+            self._experience.append(self._add_list(exp.description, strings.add))
+            self._experience.append(self._add_list(exp.highlights, strings.add))
+        self._experience_start.append(len(self._experience) // (len(self.EXPERIENCE_FIELDS) + 2))
+
+        for edu in resume.education:
+            self._education.extend(strings.intern(getattr(edu, field)) for field in self.EDUCATION_FIELDS)
+            self._education.append(self._add_list(edu.achievements, strings.add))
+        self._education_start.append(len(self._education) // (len(self.EDUCATION_FIELDS) + 1))
+
+        for group in resume.skills:
+            self._skills.append(strings.intern(group.category))
+            self._skills.append(self._add_list(group.items, strings.intern))
+        self._skill_start.append(len(self._skills) // 2)
+
+        return len(self) - 1
+
+    def _add_list(self, values: Optional[List[str]], encode) -> int:
+        if values is None:
+            return NONE
+        self._list_items.extend(encode(value) for value in values)
+        self._list_start.append(len(self._list_items))
+        return len(self._list_start) - 2
+
+    def _list_ids(self, list_id: int) -> Optional[array]:
+        if list_id == NONE:
+            return None
+        return self._list_items[self._list_start[list_id]:self._list_start[list_id + 1]]
+
+    def _list(self, list_id: int) -> Optional[List[str]]:
+        ids = self._list_ids(list_id)
+        if ids is None:
+            return None
+        get = self.strings.get
+        return [get(string_id) for string_id in ids]
+
+    def _build(self, index: int) -> Resume:
+        # Values were validated when the resume was first built, so the
+        # models are reassembled with model_construct rather than re-validated
+        get = self.strings.get
+
+        stride = len(self.CONTACT_FIELDS)
+        contact_ids = self._contact[index * stride:(index + 1) * stride]
+        contact = ContactInfo.model_construct(**{field: get(i) for field, i in zip(self.CONTACT_FIELDS, contact_ids)})
+
+        experience = []
+        stride = len(self.EXPERIENCE_FIELDS) + 2
+        for entry in range(self._experience_start[index], self._experience_start[index + 1]):
+            ids = self._experience[entry * stride:(entry + 1) * stride]
+            values = {field: get(i) for field, i in zip(self.EXPERIENCE_FIELDS, ids)}
+            experience.append(Experience.model_construct(**values, description=self._list(ids[-2]), highlights=self._list(ids[-1])))
+
+        education = []
+        stride = len(self.EDUCATION_FIELDS) + 1
+        for entry in range(self._education_start[index], self._education_start[index + 1]):
+            ids = self._education[entry * stride:(entry + 1) * stride]
+            values = {field: get(i) for field, i in zip(self.EDUCATION_FIELDS, ids)}
+            education.append(Education.model_construct(**values, achievements=self._list(ids[-1])))
+
+        skills = [
+            Skill.model_construct(category=get(self._skills[group * 2]), items=self._list(self._skills[group * 2 + 1]))
+            for group in range(self._skill_start[index], self._skill_start[index + 1])
+        ]
+
+        return Resume.model_construct(
+            contact=contact,
+            summary=get(self._summary[index]),
+            experience=experience,
+            education=education,
+            skills=skills
+        )
+
+    # Analytics straight off the arrays, without materializing any Resume
+
+    def skill_ids(self, index: int) -> List[int]:
+        """Interned IDs of all skill items of a resume"""
+        ids = []
+        for group in range(self._skill_start[index], self._skill_start[index + 1]):
+            ids.extend(self._list_ids(self._skills[group * 2 + 1]))
+        return ids
+
+    def _matching_string_ids(self, skill: str, canonical: bool) -> set:
+        if not canonical:
+            string_id = self.strings.lookup(skill)
+            return set() if string_id is None else {string_id}
+        key = skill_taxonomy.canonical_key(skill)
+        return {string_id for text, string_id in self.strings._interned.items() if skill_taxonomy.canonical_key(text) == key}
+
+    def with_skill(self, skill: str, canonical: bool = True) -> List[int]:
+        """Indexes of the resumes that list `skill`
+
+        By default any name of the same skill matches ("JS" finds resumes
+        listing "JavaScript"); `canonical=False` requires the exact string.
+        """
+        wanted = self._matching_string_ids(skill, canonical)
+        if not wanted:
+            return []
+        return [index for index in range(len(self)) if not wanted.isdisjoint(self.skill_ids(index))]
+
+    def skill_counts(self, canonical: bool = True) -> Counter:
+        """Number of resumes listing each skill, by canonical name unless `canonical=False`"""
+        names = {}
+        counts = Counter()
+        for index in range(len(self)):
+            listed = set()
+            for string_id in self.skill_ids(index):
+                name = names.get(string_id)
+                if name is None:
+                    text = self.strings.get(string_id)
+                    name = names[string_id] = (skill_taxonomy.canonicalize(text) or text) if canonical else text
+                listed.add(name)
+            counts.update(listed)
+        return counts
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the corpus"""
+        arrays = (
+            self._contact, self._summary, self._experience_start, self._experience, self._education_start,
+            self._education, self._skill_start, self._skills, self._list_start, self._list_items
+        )
+        return self.strings.nbytes() + sum(a.itemsize * len(a) for a in arrays)
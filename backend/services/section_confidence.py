@@ -0,0 +1,112 @@
+import re
+from typing import Dict, List
+from models.schemas import Resume
+from services.text_utils import BULLET_MARKERS, normalize_heading, parsed_words, section_heading, words
+
+# Headings of sections the Resume model has no field for; they end the section before them
+OTHER_HEADINGS = {
+    'projects', 'personal projects', 'certifications', 'certificates', 'licenses and certifications', 'languages',
+    'awards', 'honors', 'honors and awards', 'publications', 'volunteer', 'volunteering', 'volunteer experience',
+    'interests', 'hobbies', 'references', 'activities', 'leadership',
+}
+
+# Resume fields each text section fills
+SECTION_FIELDS = {
+    'header': ['contact'],
+    'summary': ['summary'],
+    'experience': ['experience'],
+    'education': ['education'],
+    'skills': ['skills'],
+}
+
+PLACEHOLDER = 'Not specified'
+
+_PHONE = re.compile(r'\+?\d[\d\s().-]{8,}\d')
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """Non-empty lines of each section of extracted text, keyed by section
+
+    Lines before the first heading are the 'header' (contact details and an
+    unheaded summary); sections the Resume has no field for are 'other'.
+    A section that appears twice is merged.
+    """
+    sections = {'header': []}
+    current = 'header'
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = section_heading(line)
+        if heading is None and normalize_heading(line) in OTHER_HEADINGS:
+            heading = 'other'
+        if heading:
+            current = heading
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return sections
+
+def _coverage(lines: List[str], parsed: set) -> float:
+    text_words = words(' '.join(lines))
+    if not text_words:
+        return 1.0
+    return len(text_words & parsed) / len(text_words)
+
+def _specified(value) -> bool:
+    return bool(value) and value != PLACEHOLDER
+
+def _structure(name: str, resume: Resume, lines: List[str]) -> float:
+    """Share of the section's parsed entries with every field a template resume would have"""
+    if name == 'header':
+        text = ' '.join(lines)
+        contact = resume.contact
+        checks = [_specified(contact.name) and '@' not in contact.name and not any(c.isdigit() for c in contact.name)]
+        if '@' in text:
+            checks.append(_specified(contact.email))
+        if _PHONE.search(text):
+            checks.append(_specified(contact.phone))
+        return sum(checks) / len(checks)
+    if name == 'summary':
+        return 1.0 if resume.summary else 0.0
+    if name == 'experience':
+        if not resume.experience:
+            return 0.0
+        complete = sum(
+            all(_specified(value) for value in (exp.company, exp.position, exp.startDate, exp.endDate)) and bool(exp.description)
+            for exp in resume.experience
+        )
+        text_bullets = sum(line.startswith(BULLET_MARKERS) for line in lines)
+        parsed_bullets = sum(len(exp.description) for exp in resume.experience)
+        bullets = min(1.0, parsed_bullets / text_bullets) if text_bullets else 1.0
+        return min(complete / len(resume.experience), bullets)
+    if name == 'education':
+        if not resume.education:
+            return 0.0
+        complete = sum(
+            _specified(edu.institution) and _specified(edu.degree) and bool(edu.startDate or edu.endDate)
+            for edu in resume.education
+        )
+        return complete / len(resume.education)
+    if name == 'skills':
+        return 1.0 if any(group.items for group in resume.skills) else 0.0
+    return 1.0
+
+def score_sections(resume: Resume, sections: Dict[str, List[str]]) -> Dict[str, float]:
+    """Confidence (0-1) that each text section was parsed correctly
+
+    A section scores the lower of two checks: the share of its distinct
+    words found in the fields it fills (content the parser dropped or put
+    elsewhere), and the share of parsed entries that came out fully
+    structured (no placeholder company, missing dates or bullets). Header
+    words may also land in the summary, which is often unheaded.
+    """
+    parsed = parsed_words(resume)
+    # Category names ("Languages:") are part of the skills text too
+    parsed['skills'] |= words(' '.join(group.category for group in resume.skills))
+    scores = {}
+    for name, lines in sections.items():
+        if name not in SECTION_FIELDS or not lines:
+            continue
+        fields = parsed['contact'] | parsed['summary'] if name == 'header' else parsed[name]
+        scores[name] = round(min(_coverage(lines, fields), _structure(name, resume, lines)), 3)
+    return scores
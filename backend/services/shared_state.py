@@ -0,0 +1,194 @@
+import os
+import time
+import random
+import sqlite3
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+
+class SharedCache:
+    """Interface for string-valued caches that may be shared across processes
+
+    Values are JSON strings (e.g. `model.model_dump_json()`), so the same
+    entries can be read by any worker process. Async code uses `aget`/`aput`,
+    which stores doing blocking I/O run in a worker thread.
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def put(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    async def aget(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def aput(self, key: str, value: str) -> None:
+        self.put(key, value)
+
+class InMemoryCache(SharedCache):
+    """Per-process LRU cache with a TTL, used when no shared store is configured"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 24 * 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+class _SQLiteStore:
+    """Connection handling shared by the SQLite-backed state classes"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires_at);
+                CREATE TABLE IF NOT EXISTS rate_budget (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call, as in SQLiteJobBroker, so the
+        # store is safe to use from threads and from separate processes
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+class SQLiteCache(_SQLiteStore, SharedCache):
+    """Cache stored in a SQLite WAL database shared by every worker process"""
+
+    # Fraction of writes that also purge expired entries
+    PRUNE_PROBABILITY = 0.01
+
+    def __init__(self, db_path: str, namespace: str, ttl: float = 24 * 3600):
+        super().__init__(db_path)
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, value, now + self.ttl)
+            )
+            if random.random() < self.PRUNE_PROBABILITY:
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    async def aget(self, key: str) -> Optional[str]:
+        # A busy database can block for up to the 30s lock timeout; keep that off the event loop
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self.put, key, value)
+
+class RateBudget:
+    """Token bucket limiting LLM requests per minute, optionally shared across processes
+
+    `acquire()` waits until a request may be sent. With a `db_path` the bucket
+    lives in SQLite, so the limit holds for all worker processes together
+    rather than for each one separately. A limit of 0 disables it.
+    """
+
+    def __init__(self, requests_per_minute: float, db_path: Optional[str] = None, name: str = 'llm'):
+        self.rate = requests_per_minute / 60
+        self.capacity = max(1.0, requests_per_minute / 60)  # Allow up to one second's worth of burst
+        self.name = name
+        self._store = _SQLiteStore(db_path) if db_path and requests_per_minute else None
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return how long to wait for one"""
+        now = time.time()
+        if self._store is None:
+            with self._lock:
+                tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if tokens >= 1:
+                    self._tokens = tokens - 1
+                    return 0.0
+                self._tokens = tokens
+                return (1 - tokens) / self.rate
+
+        with self._store._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM rate_budget WHERE name = ?", (self.name,)).fetchone()
+                tokens = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+                if tokens >= 1:
+                    tokens -= 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_budget (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.name, tokens, now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def acquire(self) -> None:
+        if not self.rate:
+            return
+        while True:
+            # The shared bucket takes SQLite's write lock, which can wait on other processes
+            wait = await asyncio.to_thread(self._take) if self._store else self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+def get_cache(namespace: str, max_size: int = 1024, ttl: float = 24 * 3600) -> SharedCache:
+    """Cache for `namespace`, shared across processes when SHARED_STATE_DB is set"""
+    db_path = os.getenv('SHARED_STATE_DB')
+    if db_path:
+        return SQLiteCache(db_path, namespace, ttl)
+    return InMemoryCache(max_size, ttl)
+
+# LLM request budget (LLM_REQUESTS_PER_MINUTE, 0 = unlimited), shared by every service in the process
+llm_rate_budget = RateBudget(float(os.getenv('LLM_REQUESTS_PER_MINUTE', 0)), os.getenv('SHARED_STATE_DB'))
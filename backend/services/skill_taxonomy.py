@@ -0,0 +1,115 @@
+import os
+import re
+import json
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+# Bundled taxonomy: canonical skills with their category and aliases
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'skill_taxonomy.json')
+
+# Skill tokens keep the punctuation that is part of a name: C++, C#, .NET, Node.js, T-SQL.
+# A slash separates tokens ("JavaScript/TypeScript"), so CI/CD is the phrase "ci cd"
+_TOKEN = re.compile(r'\.?[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*', re.IGNORECASE)
+_PARENTHETICAL = re.compile(r'\([^)]*\)')
+_VERSION = re.compile(r'v?\d+(?:\.\d+)*\+?|es\d+\+?', re.IGNORECASE)
+
+# Trie node key holding the canonical skill of the phrase ending at that node
+_END = ''
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(unicodedata.normalize('NFKC', text))
+
+def _key(tokens: List[str]) -> str:
+    return ' '.join(token.lower() for token in tokens)
+
+class SkillTaxonomy:
+    """Canonicalizes free-text skill mentions against a fixed taxonomy
+
+    Compiled once into two structures: a dict from normalized alias to
+    canonical name, for single mentions such as resume skill items or
+    matchedKeywords ("JS", "Javascript", "JavaScript (ES6+)" -> "JavaScript"),
+    and a token trie of the same aliases for finding every skill in running
+    text (job descriptions, bullets) in one pass with longest-match wins.
+    """
+
+    def __init__(self, skills: List[dict], ambiguous: Iterable[str] = ()):
+        self._aliases: Dict[str, str] = {}
+        self._categories: Dict[str, str] = {}
+        self._trie: dict = {}
+        # Aliases that are also ordinary words only count in running text when not lowercase ("Go", "REST")
+        self._ambiguous = {_key(_tokens(alias)) for alias in ambiguous}
+
+        for skill in skills:
+            name = skill['name']
+            self._categories[name] = skill.get('category')
+            for alias in [name, *skill.get('aliases', [])]:
+                tokens = [token.lower() for token in _tokens(alias)]
+                if not tokens:
+                    continue
+                self._aliases.setdefault(' '.join(tokens), name)
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, name)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TAXONOMY_PATH) -> 'SkillTaxonomy':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['skills'], data.get('ambiguous', ()))
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self._categories
+
+    def category(self, skill: str) -> Optional[str]:
+        return self._categories.get(skill)
+
+    def canonicalize(self, mention: str) -> Optional[str]:
+        """Canonical name of a single skill mention, or None if it is not in the taxonomy"""
+        tokens = _tokens(_PARENTHETICAL.sub(' ', mention))
+        canonical = self._aliases.get(_key(tokens))
+        # "Python 3.11", "Angular 17", "Java 21": retry without trailing versions
+        while canonical is None and len(tokens) > 1 and _VERSION.fullmatch(tokens[-1]):
+            tokens = tokens[:-1]
+            canonical = self._aliases.get(_key(tokens))
+        return canonical
+
+    def canonical_key(self, mention: str) -> str:
+        """Comparison key for a mention: its canonical name, or its normalized text if unknown"""
+        return self.canonicalize(mention) or _key(_tokens(mention))
+
+    def canonicalize_all(self, mentions: Iterable[str]) -> List[str]:
+        """Canonical names for known mentions (others kept as written), without duplicates"""
+        result = {}
+        for mention in mentions:
+            canonical = self.canonicalize(mention) or mention.strip()
+            result.setdefault(canonical.lower(), canonical)
+        return list(result.values())
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills mentioned in running text, in order of first mention"""
+        tokens = _tokens(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            node, match, match_end = self._trie, None, i
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j].lower())
+                if node is None:
+                    break
+                if _END in node:
+                    match, match_end = node[_END], j + 1
+            if match and _key(tokens[i:match_end]) in self._ambiguous and all(t.islower() or t.isdigit() for t in tokens[i:match_end]):
+                match = None
+            if match:
+                found.setdefault(match, None)
+                i = match_end
+            else:
+                i += 1
+        return list(found)
+
+# Compiled at import (about 2 ms) and shared by every service in the process
+skill_taxonomy = SkillTaxonomy.load(os.getenv('SKILL_TAXONOMY_PATH') or DEFAULT_TAXONOMY_PATH)
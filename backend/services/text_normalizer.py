@@ -0,0 +1,104 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import List, Tuple
+from utils.tokens import count_tokens
+
+# Page separator used by the PDF extractor
+PAGE_BREAK = '\f'
+
+# Lines inspected at the top and bottom of each page for repeated headers/footers
+EDGE_LINES = 2
+
+# Fraction of pages a line must repeat on to count as a header or footer
+REPEAT_THRESHOLD = 0.6
+
+_ZERO_WIDTH = re.compile('[\u200b\u200c\u200d\u2060\ufeff]')
+_SOFT_HYPHEN = '\u00ad'
+_HYPHEN_BREAK = re.compile(r'(\w)-\n[ \t]*([a-z])')
+_INLINE_SPACE = re.compile(r'[ \t]+')
+_BLANK_LINES = re.compile(r'\n{3,}')
+_DIGITS = re.compile(r'\d+')
+_PAGE_NUMBER = re.compile(r'^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$', re.IGNORECASE)
+
+def _edge_key(line: str) -> str:
+    # "Page 2 of 3" and "Page 3 of 3" are the same footer
+    return _DIGITS.sub('#', line.strip().lower())
+
+def _strip_headers_footers(pages: List[str]) -> Tuple[List[str], int]:
+    """Drop repeats of lines found at the top or bottom of most pages, and bare page numbers
+
+    The first occurrence of a repeated line is kept: on a multi-page resume
+    the running header is usually the candidate's name and contact details,
+    which the parser still needs once.
+    """
+    page_lines = [page.split('\n') for page in pages]
+
+    def edge_indexes(lines):
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        return set(filled[:EDGE_LINES] + filled[-EDGE_LINES:])
+
+    repeated = set()
+    if len(pages) >= 2:
+        counts = Counter()
+        for lines in page_lines:
+            counts.update({_edge_key(lines[i]) for i in edge_indexes(lines)})
+        min_pages = max(2, REPEAT_THRESHOLD * len(pages))
+        repeated = {key for key, count in counts.items() if count >= min_pages}
+
+    removed = 0
+    seen = set()
+    kept_pages = []
+    for lines in page_lines:
+        edges = edge_indexes(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            if i in edges:
+                key = _edge_key(line)
+                if (key in repeated and key in seen) or (len(pages) >= 2 and _PAGE_NUMBER.match(line.strip())):
+                    removed += 1
+                    continue
+                seen.add(key)
+            kept.append(line)
+        kept_pages.append('\n'.join(kept))
+    return kept_pages, removed
+
+def normalize_text(text: str) -> Tuple[str, dict]:
+    """Clean extracted resume text before it is parsed
+
+    Removes repeated page headers/footers and page numbers (pages are split
+    on form feeds), applies NFKC Unicode normalization (ligatures, non-breaking
+    and full-width characters), joins words hyphenated across line breaks and
+    collapses runs of whitespace. Line structure and bullet characters are
+    kept, since both the AI prompt and the regex fallback rely on them.
+
+    Returns:
+        tuple: (normalized_text, report) where report counts the characters
+        and tokens saved
+    """
+    pages = text.split(PAGE_BREAK)
+    pages, header_footer_lines = _strip_headers_footers(pages)
+    normalized = '\n'.join(pages)
+
+    normalized = unicodedata.normalize('NFKC', normalized)
+    normalized = _ZERO_WIDTH.sub('', normalized).replace(_SOFT_HYPHEN, '')
+    normalized = normalized.replace('\r\n', '\n').replace('\r', '\n')
+
+    normalized, hyphenations = _HYPHEN_BREAK.subn(r'\1\2', normalized)
+
+    normalized = '\n'.join(_INLINE_SPACE.sub(' ', line).strip() for line in normalized.split('\n'))
+    normalized = _BLANK_LINES.sub('\n\n', normalized).strip() + '\n'
+
+    original_tokens = count_tokens(text)
+    normalized_tokens = count_tokens(normalized)
+    report = {
+        "originalChars": len(text),
+        "normalizedChars": len(normalized),
+        "charsSaved": len(text) - len(normalized),
+        "originalTokens": original_tokens,
+        "normalizedTokens": normalized_tokens,
+        "tokensSaved": original_tokens - normalized_tokens,
+        "headerFooterLinesRemoved": header_footer_lines,
+        "hyphenationsJoined": hyphenations,
+    }
+    return normalized, report
@@ -0,0 +1,56 @@
+import re
+from typing import Dict, Optional, Set
+from models.schemas import Resume
+
+# Section headings recognised in extracted text, normalized to lowercase letters and spaces
+SECTION_HEADINGS = {
+    'summary': {'summary', 'professional summary', 'profile', 'professional profile', 'objective', 'career objective', 'about', 'about me'},
+    'experience': {'experience', 'work experience', 'professional experience', 'employment', 'employment history', 'work history', 'career history'},
+    'education': {'education', 'academic background', 'education and training', 'qualifications'},
+    'skills': {'skills', 'technical skills', 'core skills', 'key skills', 'core competencies', 'competencies', 'technologies', 'skills and tools'},
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Longer lines are never headings
+MAX_HEADING_LENGTH = 40
+
+# Characters that start a bullet line; a '-' only counts at the start of a line
+BULLET_MARKERS = ('•', '-', '*', '▪', '◦', '●', '‣', '–', '·', '○', '■')
+
+# Words shorter than this are ignored for coverage (articles, "of", "in", ...)
+MIN_WORD_LENGTH = 3
+
+_WORD = re.compile(r'\w+')
+_NON_LETTER = re.compile(r'[^a-z ]+')
+
+def words(text: str) -> Set[str]:
+    """Distinct lowercase words of `text` of at least MIN_WORD_LENGTH characters"""
+    return {word for word in _WORD.findall(text.lower()) if len(word) >= MIN_WORD_LENGTH}
+
+def normalize_heading(line: str) -> Optional[str]:
+    """`line` as lowercase letters and single spaces, or None if it is too long to be a heading"""
+    if len(line) > MAX_HEADING_LENGTH:
+        return None
+    return ' '.join(_NON_LETTER.sub(' ', line.lower()).split())
+
+def section_heading(line: str) -> Optional[str]:
+    """The Resume section a heading line starts ('summary', 'experience', ...), or None"""
+    return _HEADING_LOOKUP.get(normalize_heading(line))
+
+def parsed_words(resume: Resume) -> Dict[str, Set[str]]:
+    """Words of each section of a parsed resume, keyed like SECTION_HEADINGS plus 'contact'"""
+    contact = resume.contact
+    experience = []
+    for exp in resume.experience:
+        experience.extend([exp.company, exp.position, exp.location or '', exp.startDate, exp.endDate, *exp.description, *(exp.highlights or [])])
+    education = []
+    for edu in resume.education:
+        education.extend([edu.institution, edu.degree, edu.field, edu.location or '', edu.startDate, edu.endDate, edu.gpa or '', *(edu.achievements or [])])
+
+    return {
+        'contact': words(' '.join(filter(None, [contact.name, contact.email, contact.phone, contact.location, contact.linkedin, contact.github, contact.website]))),
+        'summary': words(resume.summary),
+        'experience': words(' '.join(experience)),
+        'education': words(' '.join(education)),
+        'skills': words(' '.join(item for skill in resume.skills for item in skill.items)),
+    }
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, NamedTuple, Optional, Type
+from pydantic import BaseModel
+from services.model_router import ModelRouter
+from utils.json_schema import response_format_for
+from utils.tokens import count_tokens
+
+# (context window, max output tokens) per model family; the longest matching prefix wins
+MODEL_LIMITS = {
+    'gpt-4.1': (1047576, 32768),
+    'gpt-4o': (128000, 16384),
+    'gpt-4-turbo': (128000, 4096),
+    'gpt-4': (8192, 8192),
+    'gpt-3.5-turbo': (16385, 4096),
+}
+DEFAULT_MODEL_LIMITS = (128000, 16384)
+
+# Model a request is moved to when it fits none of its routed models
+LARGE_CONTEXT_MODEL = os.getenv('LARGE_CONTEXT_MODEL', 'gpt-4.1')
+# Share of the context window and output limit kept free for estimation error
+TOKEN_SAFETY_MARGIN = float(os.getenv('TOKEN_SAFETY_MARGIN', 0.1))
+
+# Expected output per task: (tokens per token of source text, fixed tokens).
+# The source is what the model writes back: the resume text for parsing
+# (its JSON runs 1.3-1.7x the text), the indented resume JSON in the
+# optimization prompt (written back compact, with rewritten bullets, plus
+# keywords and skill gaps), nothing for a cover letter
+OUTPUT_ESTIMATES = {
+    'parse': (1.6, 150),
+    'optimize': (1.0, 500),
+    'cover_letter': (0.0, 700),
+}
+# Chat formatting tokens added per message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+class TokenPlan(NamedTuple):
+    """Preflight decision for one LLM task"""
+    task: str
+    strategy: str  # 'single', 'large_context' or 'chunked'
+    models: List[str]  # Models to route the call(s) to, cheapest first
+    input_tokens: int  # Estimated prompt tokens, including the response schema
+    output_tokens: int  # Estimated response tokens
+
+def model_limits(model: str) -> tuple:
+    """(context window, max output tokens) of a model"""
+    matches = [prefix for prefix in MODEL_LIMITS if model.startswith(prefix)]
+    return MODEL_LIMITS[max(matches, key=len)] if matches else DEFAULT_MODEL_LIMITS
+
+class PlanStats:
+    """Thread-safe counters of planning decisions and their measured outcomes, per (task, strategy)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans = {}
+
+    def record(self, plan: TokenPlan, usage: dict, success: bool):
+        with self._lock:
+            entry = self._plans.setdefault((plan.task, plan.strategy), {
+                'plans': 0, 'successes': 0, 'measured': 0,
+                'estimatedInput': 0, 'estimatedOutput': 0, 'measuredInput': 0, 'measuredOutput': 0,
+            })
+            entry['plans'] += 1
+            entry['successes'] += int(success)
+            if usage['calls']:
+                # Estimates are compared only with plans whose calls reported usage
+                entry['measured'] += 1
+                entry['estimatedInput'] += plan.input_tokens
+                entry['estimatedOutput'] += plan.output_tokens
+                entry['measuredInput'] += usage['input']
+                entry['measuredOutput'] += usage['output']
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [
+                {
+                    'task': task,
+                    'strategy': strategy,
+                    'plans': entry['plans'],
+                    'successRate': entry['successes'] / entry['plans'],
+                    # Measured / estimated tokens: above 1 means the planner underestimates
+                    'inputRatio': round(entry['measuredInput'] / entry['estimatedInput'], 3) if entry['measured'] else None,
+                    'outputRatio': round(entry['measuredOutput'] / entry['estimatedOutput'], 3) if entry['measured'] else None,
+                }
+                for (task, strategy), entry in self._plans.items()
+            ]
+
+# Shared by every planner in the process so /api/token-plans sees all decisions
+plan_stats = PlanStats()
+
+# Token usage of the LLM calls made under the plan being tracked, if any
+_usage: ContextVar[Optional[dict]] = ContextVar('token_usage', default=None)
+
+def record_usage(usage) -> None:
+    """Add an LLM response's reported usage to the plan being tracked; no-op outside of one"""
+    tracked = _usage.get()
+    if tracked is not None and usage is not None:
+        tracked['calls'] += 1
+        tracked['input'] += usage.prompt_tokens
+        tracked['output'] += usage.completion_tokens
+
+class TokenPlanner:
+    """Checks a prompt's size against the routed models before anything is sent
+
+    Input tokens are counted locally with tiktoken (utils.tokens, which
+    falls back to a deliberately high length-based estimate when no
+    tokenizer is available) over the messages and the strict response schema; output tokens are estimated per task from
+    the content the model has to write back. A request that fits its
+    routed models goes out as a single call. One that fits only some of
+    them, or only LARGE_CONTEXT_MODEL, keeps those models. Anything larger
+    is planned as chunked, and the caller splits the work into calls that
+    each fit.
+    """
+
+    def __init__(self, router: ModelRouter, stats: PlanStats = plan_stats):
+        self.router = router
+        self.stats = stats
+        self.large_context_model = LARGE_CONTEXT_MODEL
+
+    def count_request(self, messages: list, response_model: Type[BaseModel], model: str) -> int:
+        """Prompt tokens of a request: its messages plus the strict response schema"""
+        schema_tokens = count_tokens(json.dumps(response_format_for(response_model)), model)
+        return sum(count_tokens(message['content'], model) + MESSAGE_OVERHEAD_TOKENS for message in messages) + schema_tokens
+
+    def estimate_output(self, task: str, source_tokens: int, outputs: int = 1) -> int:
+        ratio, fixed = OUTPUT_ESTIMATES[task]
+        return round(ratio * source_tokens) + fixed * outputs
+
+    def fits(self, model: str, input_tokens: int, output_tokens: int) -> bool:
+        window, max_output = model_limits(model)
+        usable = 1 - TOKEN_SAFETY_MARGIN
+        return input_tokens + output_tokens <= window * usable and output_tokens <= max_output * usable
+
+    def plan(
+        self,
+        task: str,
+        messages: list,
+        response_model: Type[BaseModel],
+        source_text: str = "",
+        outputs: int = 1
+    ) -> TokenPlan:
+        """Estimate a task's tokens and pick how to send it
+
+        Args:
+            task: Routing key ('parse', 'optimize', 'cover_letter')
+            messages: Chat messages of the single-call request
+            response_model: Structured-output model; its JSON Schema is sent with the request
+            source_text: The part of the prompt the model writes back (see OUTPUT_ESTIMATES)
+            outputs: Number of documents in the response (cover letter variants)
+        """
+        routed = self.router.models_for(task)
+        input_tokens = self.count_request(messages, response_model, routed[0])
+        source_tokens = count_tokens(source_text, routed[0]) if source_text else 0
+        output_tokens = self.estimate_output(task, source_tokens, outputs)
+
+        fitting = [model for model in routed if self.fits(model, input_tokens, output_tokens)]
+        if fitting == routed:
+            plan = TokenPlan(task, 'single', routed, input_tokens, output_tokens)
+        elif fitting:
+            plan = TokenPlan(task, 'large_context', fitting, input_tokens, output_tokens)
+        elif self.fits(self.large_context_model, input_tokens, output_tokens):
+            plan = TokenPlan(task, 'large_context', [self.large_context_model], input_tokens, output_tokens)
+        else:
+            plan = TokenPlan(task, 'chunked', routed, input_tokens, output_tokens)
+
+        print(f"📏 {task}: ~{input_tokens:,} input + ~{output_tokens:,} output tokens → {plan.strategy} on {', '.join(plan.models)}")
+        return plan
+
+    def chunk_tokens(self, plan: TokenPlan, overhead_tokens: int, outputs: int = 1) -> int:
+        """Most source tokens one chunk of a chunked plan can hold on every model of the plan
+
+        Args:
+            plan: The chunked plan
+            overhead_tokens: Prompt tokens of a chunk request without its source text (instructions, schema)
+            outputs: Number of documents in each chunk's response
+        """
+        ratio, fixed = OUTPUT_ESTIMATES[plan.task]
+        usable = 1 - TOKEN_SAFETY_MARGIN
+        budgets = []
+        for model in plan.models:
+            window, max_output = model_limits(model)
+            by_window = (window * usable - overhead_tokens - fixed * outputs) / (1 + ratio)
+            by_output = (max_output * usable - fixed * outputs) / ratio if ratio else by_window
+            budgets.append(min(by_window, by_output))
+        return max(1, int(min(budgets)))
+
+    @contextmanager
+    def track(self, plan: TokenPlan):
+        """Measure the LLM calls made inside the block against the plan, and log the outcome"""
+        usage = {'calls': 0, 'input': 0, 'output': 0}
+        token = _usage.set(usage)
+        start = time.perf_counter()
+        success = False
+        try:
+            yield usage
+            success = True
+        finally:
+            _usage.reset(token)
+            elapsed = time.perf_counter() - start
+            self.stats.record(plan, usage, success)
+            measured = (
+                f"measured {usage['input']:,} in / {usage['output']:,} out over {usage['calls']} call(s)"
+                if usage['calls'] else "no usage reported"
+            )
+            print(f"📏 {plan.task} {plan.strategy}: estimated {plan.input_tokens:,} in / {plan.output_tokens:,} out, "
+                  f"{measured}, {elapsed:.1f}s, {'ok' if success else 'failed'}")
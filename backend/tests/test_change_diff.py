@@ -0,0 +1,45 @@
+from benchmarks.fixtures import sample_resume
+from models.schemas import Skill
+from services.change_diff import changed_span, diff_resumes
+
+def test_changed_span_trims_the_shared_words():
+    assert changed_span("Built a fast API in Python", "Built a scalable API in Python")[:2] == ("fast", "scalable")
+    assert changed_span("same text", "same  text") == ("", "", 1.0)
+
+def test_identical_resumes_have_no_changes():
+    resume = sample_resume(jobs=2, bullets=2)
+    assert diff_resumes(resume, resume.model_copy(deep=True)) == []
+
+def test_reworded_rewritten_added_and_reordered_bullets():
+    original = sample_resume(jobs=2, bullets=3)
+    optimized = original.model_copy(deep=True)
+    company = original.experience[0].company
+    bullets = optimized.experience[0].description
+    bullets[0] = bullets[0].replace(bullets[0].split()[0], "Spearheaded", 1)
+    bullets[1] = "Something entirely different and new"
+    bullets.append("Mentored four engineers")
+    optimized.experience[1].description.reverse()
+
+    changes = diff_resumes(original, optimized)
+    by_description = {(change.type, change.description): change for change in changes}
+
+    reworded = by_description[("modified", f"Reworded bullet for {company}")]
+    assert (reworded.before, reworded.after) == (original.experience[0].description[0].split()[0], "Spearheaded")
+    assert ("modified", f"Rewrote bullet for {company}") in by_description
+    assert by_description[("added", f"Added bullet for {company}")].after == "Mentored four engineers"
+    assert ("reordered", f"Reordered bullets for {original.experience[1].company}") in by_description
+
+def test_skills_are_compared_by_canonical_name_and_evidence():
+    original = sample_resume(jobs=1, bullets=2)
+    original.experience[0].description.append("Deployed services with Terraform")
+    original.skills = [Skill(category='Languages', items=['JS', 'Python'])]
+    optimized = original.model_copy(deep=True)
+    optimized.skills = [Skill(category='Languages', items=['JavaScript', 'Python', 'Terraform', 'Haskell'])]
+
+    changes = [change for change in diff_resumes(original, optimized) if change.section == "Skills"]
+
+    # JS -> JavaScript is a rename, not a removal plus an addition
+    assert [(change.type, change.confidence, change.after) for change in changes] == [
+        ("added", "inferred", "Terraform"),
+        ("added", "suggested", "Haskell"),
+    ]
@@ -0,0 +1,39 @@
+import pytest
+from benchmarks.fixtures import sample_resume
+from services.completeness import analyze_completeness
+from services.export_service import resume_to_text
+from services.text_utils import section_heading
+
+@pytest.fixture
+def resume():
+    return sample_resume(jobs=3, bullets=4)
+
+@pytest.mark.parametrize('line, section', [
+    ('EXPERIENCE', 'experience'),
+    ('## Work History', 'experience'),
+    ('Technical Skills:', 'skills'),
+    ('Profile', 'summary'),
+    ('Experience building distributed systems at scale for many years', None),
+    ('Projects', None),
+])
+def test_section_headings(line, section):
+    assert section_heading(line) == section
+
+def test_complete_parse_has_no_issues(resume):
+    report = analyze_completeness(resume, resume_to_text(resume))
+    assert report.issues == []
+    assert report.coverage['overall'] > 0.9
+
+def test_dropped_bullets_and_sections_are_reported(resume):
+    text = resume_to_text(resume)
+    parsed = resume.model_copy(update={
+        'experience': [exp.model_copy(update={'description': exp.description[:1]}) for exp in resume.experience],
+        'education': [],
+    })
+
+    report = analyze_completeness(parsed, text)
+    codes = {(issue.code, issue.section) for issue in report.issues}
+
+    assert ('bullets_missing', 'experience') in codes
+    assert ('section_missing', 'education') in codes
+    assert report.coverage['experience'] < 1
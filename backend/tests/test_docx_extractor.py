@@ -0,0 +1,39 @@
+import io
+import random
+import pytest
+from benchmarks.bench_docx_extract import build_resume
+from services.docx_extractor import extract_docx_text, BULLET
+
+@pytest.fixture(scope='module')
+def resume():
+    data, snippets = build_resume(jobs=3, rng=random.Random(0))
+    return extract_docx_text(io.BytesIO(data)), snippets
+
+def test_every_part_of_a_template_resume_is_recovered(resume):
+    text, snippets = resume
+    for part, expected in snippets.items():
+        missing = [snippet for snippet in expected if snippet not in text]
+        assert not missing, f"{part}: {missing}"
+
+def test_header_comes_first_and_footer_last(resume):
+    text, _ = resume
+    lines = text.splitlines()
+    assert lines[0] == "Alex Johnson"
+    assert lines[-1] == "References available on request"
+
+def test_text_box_is_read_once_despite_its_vml_fallback(resume):
+    text, snippets = resume
+    [summary] = snippets['text box']
+    assert text.count(summary) == 1
+    assert text.index("Summary") < text.index(summary) < text.index("Experience")
+
+def test_short_table_rows_are_joined_and_list_items_get_bullets(resume):
+    text, snippets = resume
+    lines = text.splitlines()
+    assert "Company 0 | Senior Engineer | Jan 2020 - Dec 2021" in lines
+    assert any(line.startswith("Languages | ") for line in lines)
+    assert BULLET + snippets['body'][0] in lines
+
+def test_invalid_files_raise_value_error():
+    with pytest.raises(ValueError):
+        extract_docx_text(io.BytesIO(b"not a zip"))
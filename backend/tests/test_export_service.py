@@ -0,0 +1,50 @@
+import io
+import zipfile
+import asyncio
+import importlib
+from fastapi.testclient import TestClient
+from benchmarks.fixtures import sample_resume
+from models.schemas import ExportRequest
+from services.export_service import ExportService, InMemoryExportCache, _slug, safe_filename, content_disposition
+
+def test_slug_keeps_unicode_letters():
+    assert _slug("José Müller resume") == "josé-müller-resume"
+    assert _slug("  --  ") == "document"
+
+def test_safe_filename_strips_paths_quotes_and_control_characters():
+    assert safe_filename("../../etc/passwd") == "passwd"
+    assert safe_filename("..\\x.md") == "x.md"
+    assert safe_filename('a"b\r\n.md') == "ab.md"
+    assert safe_filename("简历.md") == "简历.md"
+    assert safe_filename("../") is None
+    assert safe_filename(None) is None
+
+def test_content_disposition_has_ascii_fallback_and_utf8_name():
+    assert content_disposition("resume.md") == 'attachment; filename="resume.md"'
+    header = content_disposition("José résumé.docx")
+    assert header.startswith('attachment; filename="Jose resume.docx"; ')
+    assert header.endswith("filename*=UTF-8''Jos%C3%A9%20r%C3%A9sum%C3%A9.docx")
+    header.encode('latin-1')
+    assert 'filename="download"' in content_disposition("简历")
+
+def test_export_with_unicode_file_name(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('HISTORY_STORE', 'off')
+    monkeypatch.setenv('JOB_QUEUE_MODE', 'off')
+    main = importlib.import_module('main')
+    with TestClient(main.app) as client:
+        request = ExportRequest(document='resume', format='md', resume=sample_resume(1, 1), fileName='简历.md')
+        response = client.post('/api/export', json=request.model_dump())
+    assert response.status_code == 200
+    assert "filename*=UTF-8''%E7%AE%80%E5%8E%86.md" in response.headers['content-disposition']
+
+def test_zip_entries_cannot_escape_the_archive():
+    service = ExportService(InMemoryExportCache())
+    resume = sample_resume(1, 1)
+    requests = [ExportRequest(document='resume', format='md', resume=resume, fileName=name) for name in ('../x', '/x', 'x')]
+
+    async def collect():
+        return b"".join([chunk async for chunk in service.stream_zip(requests)])
+
+    archive = zipfile.ZipFile(io.BytesIO(asyncio.run(collect())))
+    assert archive.namelist() == ['x', 'x-2', 'x-3']
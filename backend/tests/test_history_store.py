@@ -0,0 +1,44 @@
+import pytest
+from services.history_store import InMemoryHistoryStore, SQLiteHistoryStore
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return InMemoryHistoryStore()
+    return SQLiteHistoryStore(str(tmp_path / 'history.db'))
+
+def test_sqlite_file_is_created_on_first_use(tmp_path):
+    path = tmp_path / 'history.db'
+    store = SQLiteHistoryStore(str(path))
+    assert not path.exists()
+    store.save('session', 'parse', '{}')
+    assert path.exists()
+
+def test_expired_records_are_not_returned(store):
+    record_id = store.save('session', 'parse', '{"resume": 1}', file_hash='abc')
+    assert store.latest('session', 'parse', file_hash='abc') == '{"resume": 1}'
+
+    store.retention = -1
+    assert store.find('session') == []
+    assert store.get('session', record_id) is None
+
+def test_session_can_delete_its_records(store):
+    first = store.save('session', 'parse', '{}')
+    store.save('session', 'optimize', '{}')
+    other = store.save('other', 'parse', '{}')
+
+    assert store.delete('other', first) == 0
+    assert store.delete('session', first) == 1
+    assert [record.kind for record in store.find('session')] == ['optimize']
+    assert store.delete('session') == 1
+    assert store.find('session') == []
+    assert store.get('other', other) == '{}'
+
+def test_memory_store_drops_oldest_records_beyond_its_cap():
+    store = InMemoryHistoryStore(max_records=2)
+    oldest = store.save('a', 'parse', '1')
+    store.save('b', 'parse', '2')
+    store.save('a', 'parse', '3')
+
+    assert store.get('a', oldest) is None
+    assert len(store.find('a')) == 1 and len(store.find('b')) == 1
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from benchmarks.fixtures import sample_resume
+from models.schemas import ResumeSections
+from services import parser_service
+from services.export_service import resume_to_text
+
+@pytest.fixture
+def resume():
+    return sample_resume(jobs=2, bullets=3)
+
+@pytest.fixture
+def parser(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    # Parse the low-confidence sections alone however much of the document they are
+    monkeypatch.setattr(parser_service, 'HYBRID_FULL_PARSE_SHARE', 1.1)
+    parser = parser_service.FileParserService()
+    parser.parse_mode = 'hybrid'
+    return parser
+
+def parse(parser, resume):
+    return asyncio.run(parser.parse_file(resume_to_text(resume).encode(), 'text/plain', refresh=True))
+
+def test_only_low_confidence_sections_are_sent_and_replaced(parser, resume):
+    requests = []
+
+    async def complete_structured(model, messages, temperature, response_model, repair_context=""):
+        requests.append((response_model, repair_context))
+        return ResumeSections(contact=resume.contact, summary="Rewritten by the model", experience=resume.experience, education=resume.education)
+
+    parser.client.complete_structured = complete_structured
+    plan = parser.plan_hybrid_parse(resume_to_text(resume))
+    assert 'experience' in plan.fields and 'summary' not in plan.fields
+
+    result = parse(parser, resume)
+
+    assert result.source == 'hybrid'
+    assert result.resume.experience == resume.experience
+    # The summary parsed confidently, so the model's version is ignored
+    assert result.resume.summary == plan.resume.summary
+    assert all(model is ResumeSections for model, _ in requests)
+    assert requests[0][1] == plan.text
+
+def test_ai_failure_keeps_the_local_parse_as_a_fallback(parser, resume):
+    async def complete_structured(**kwargs):
+        raise ConnectionError('model unavailable')
+
+    parser.client.complete_structured = complete_structured
+    result = parse(parser, resume)
+
+    assert result.source == 'fallback'
+    assert result.resume == parser.plan_hybrid_parse(result.text).resume
+    assert result.source not in parser_service.STORED_PARSE_SOURCES
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import pytest
+from services.job_queue import InMemoryJobBroker, SQLiteJobBroker, relay_job_events
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def broker(request, tmp_path):
+    if request.param == 'memory':
+        return InMemoryJobBroker(lease_seconds=0)
+    return SQLiteJobBroker(str(tmp_path / 'jobs.db'), lease_seconds=0)
+
+class RecordingSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, message: str):
+        self.messages.append(json.loads(message))
+
+    async def send_json(self, message: dict):
+        self.messages.append(message)
+
+def test_expired_lease_is_requeued_then_failed(broker):
+    job_id = broker.enqueue('parse', {'fileContent': ''})
+    assert broker.claim('dead-worker').id == job_id
+
+    # The lease (0s) has lapsed without a renewal: another worker gets the job
+    assert broker.requeue_expired() == 1
+    job = broker.claim('second-worker')
+    assert job.id == job_id and job.attempts == 2
+    assert not broker.renew(job_id, 'dead-worker')
+
+    # Out of attempts: the job fails and the client is told why
+    assert broker.requeue_expired() == 1
+    assert broker.claim('third-worker') is None
+    (_, message), = broker.fetch_events(job_id)
+    assert json.loads(message)['type'] == 'error'
+
+def test_finished_jobs_are_purged(broker):
+    finished = broker.enqueue('parse', {})
+    broker.claim('worker')
+    broker.publish(finished, json.dumps({'type': 'result', 'data': {}}))
+    broker.finish(finished, 'completed')
+    cancelled = broker.enqueue('parse', {})
+    broker.cancel(cancelled)
+    waiting = broker.enqueue('parse', {})
+
+    assert broker.purge(max_age=-1) == 2
+    assert broker.fetch_events(finished) == []
+    assert broker.claim('worker').id == waiting
+
+def test_relay_times_out_without_events(broker):
+    job_id = broker.enqueue('optimize', {})
+    websocket = RecordingSocket()
+
+    asyncio.run(relay_job_events(broker, websocket, job_id, poll_interval=0.01, timeout=0.05))
+
+    assert websocket.messages[-1]['type'] == 'error'
+    assert broker.is_cancelled(job_id)
+    assert broker.claim('worker') is None
@@ -0,0 +1,63 @@
+import asyncio
+import json
+from models.schemas import JobAnalysis, Resume
+from services.llm_client import LLMClient
+from utils.json_schema import strict_json_schema
+
+class ScriptedClient(LLMClient):
+    """LLMClient whose completions come from a list instead of the API"""
+
+    def __init__(self, responses):
+        super().__init__('test-key')
+        self.responses = list(responses)
+        self.requests = []
+
+    async def complete_json(self, model, messages, temperature, response_format=None):
+        self.requests.append({'messages': messages, 'response_format': response_format})
+        return self.responses.pop(0)
+
+def test_strict_schema_requires_every_field():
+    schema = strict_json_schema(JobAnalysis)
+    assert schema['additionalProperties'] is False
+    assert set(schema['required']) == set(JobAnalysis.model_fields)
+    # A field called "title" survives; the "title" and "default" keywords do not
+    assert 'title' in schema['properties']
+    assert 'default' not in json.dumps(schema['properties']['companyContext'])
+    assert 'title' not in schema
+
+    contact = strict_json_schema(Resume)['$defs']['ContactInfo']
+    assert contact['required'] == list(contact['properties'])
+
+def test_only_failing_fields_are_repaired():
+    analysis = {
+        'title': 'Engineer', 'requiredSkills': ['Python'], 'niceToHaveSkills': 'Go',
+        'keywords': [], 'responsibilities': [], 'companyContext': None,
+    }
+    fixes = {'fixes': {'niceToHaveSkills': ['Go'], 'seniority': 'senior', 'title': 'Changed'}}
+    client = ScriptedClient([analysis, fixes])
+
+    result = asyncio.run(client.complete_structured('model', [], 0, JobAnalysis, repair_context='job text'))
+
+    assert result.niceToHaveSkills == ['Go']
+    assert result.seniority == 'senior'
+    # Fields that validated are not touched even if the repair returns them
+    assert result.title == 'Engineer'
+    repair_prompt = client.requests[1]['messages'][-1]['content']
+    assert '"niceToHaveSkills"' in repair_prompt and '"seniority"' in repair_prompt
+    assert '"requiredSkills"' not in repair_prompt
+    assert 'job text' in repair_prompt
+
+def test_nested_fields_are_repaired_by_path():
+    resume = {
+        'contact': {'name': 'A', 'email': 'a@b.c', 'phone': '1', 'location': None, 'linkedin': None, 'github': None, 'website': None},
+        'summary': 'S', 'education': [], 'skills': [],
+        'experience': [{'id': 'exp1', 'company': 'C', 'position': 'P', 'location': None, 'startDate': '2020', 'endDate': 'Present',
+                        'description': ['x'], 'highlights': None}, {'id': 'exp2', 'company': 'D', 'position': 'Q', 'location': None,
+                        'startDate': '2019', 'endDate': '2020', 'description': None, 'highlights': None}],
+    }
+    client = ScriptedClient([resume, {'fixes': {'experience/1/description': ['y']}}])
+
+    result = asyncio.run(client.complete_structured('model', [], 0, Resume))
+
+    assert result.experience[1].description == ['y']
+    assert result.experience[0].description == ['x']
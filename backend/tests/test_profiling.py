@@ -0,0 +1,19 @@
+import tracemalloc
+from utils import profiling
+
+def test_profiler_stops_only_the_tracing_it_started():
+    assert not tracemalloc.is_tracing()
+    profiling._start_tracing()
+    profiling._start_tracing()
+    profiling._stop_tracing()
+    assert tracemalloc.is_tracing()
+    profiling._stop_tracing()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        profiling._start_tracing()
+        profiling._stop_tracing()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,34 @@
+from benchmarks.fixtures import sample_resume
+from models.schemas import Resume, ContactInfo, Experience, Skill
+from services.resume_corpus import ResumeCorpus
+
+def sparse_resume() -> Resume:
+    return Resume(
+        contact=ContactInfo(name='José Müller', email='', phone='', location=None),
+        summary='',
+        experience=[Experience(id='exp1', company='Ünïcode GmbH', position='Dev', startDate='2020', endDate='Present', description=[], highlights=[])],
+        education=[],
+        skills=[Skill(category='Languages', items=['JS', 'Golang'])],
+    )
+
+def test_resumes_round_trip_exactly():
+    resumes = [sample_resume(jobs=3, bullets=2), sparse_resume(), sample_resume(jobs=1, bullets=1)]
+    corpus = ResumeCorpus.from_resumes(resumes)
+
+    assert len(corpus) == 3
+    assert list(corpus) == resumes
+    assert corpus[-2] == resumes[1]
+    # None and empty lists stay distinct
+    assert corpus[0].experience[0].highlights is None
+    assert corpus[1].experience[0].highlights == []
+    assert corpus[1].contact.location is None
+
+def test_skill_lookup_matches_any_alias():
+    corpus = ResumeCorpus.from_resumes([sparse_resume(), sample_resume(jobs=1, bullets=1)])
+
+    # The first resume lists "JS" and "Golang", the sample "JavaScript" and "Go"
+    assert corpus.with_skill('JavaScript') == [0, 1]
+    assert corpus.with_skill('JavaScript', canonical=False) == [1]
+    assert corpus.with_skill('Rust') == []
+    assert corpus.skill_counts()['Go'] == 2
+    assert corpus.skill_counts(canonical=False)['Golang'] == 1
@@ -0,0 +1,27 @@
+import pytest
+from services.skill_taxonomy import skill_taxonomy
+
+@pytest.mark.parametrize('mention, canonical', [
+    ('JS', 'JavaScript'),
+    ('javascript', 'JavaScript'),
+    ('JavaScript (ES6+)', 'JavaScript'),
+    ('Golang', 'Go'),
+    ('k8s', 'Kubernetes'),
+    ('cpp', 'C++'),
+    ('CI/CD', 'CI/CD'),
+    ('nodejs', 'Node.js'),
+    ('Python 3.11', 'Python'),
+])
+def test_aliases_canonicalize(mention, canonical):
+    assert skill_taxonomy.canonicalize(mention) == canonical
+
+def test_unknown_mentions_are_kept_as_written():
+    assert skill_taxonomy.canonicalize('Underwater basket weaving') is None
+    assert skill_taxonomy.canonicalize_all(['JS', 'JavaScript', 'Basket weaving', 'golang']) == ['JavaScript', 'Basket weaving', 'Go']
+
+def test_lowercase_go_is_not_a_skill_in_running_text():
+    assert 'Go' not in skill_taxonomy.extract("Ready to go the extra mile and rest when done")
+    assert skill_taxonomy.extract("Built services in Go and golang tooling, REST APIs") == ['Go', 'REST APIs']
+
+def test_extract_prefers_the_longest_match():
+    assert skill_taxonomy.extract("Continuous integration with GitHub Actions") == ['CI/CD', 'GitHub Actions']
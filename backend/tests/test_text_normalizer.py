@@ -0,0 +1,78 @@
+from services.completeness import analyze_completeness
+from services.parser_service import FileParserService
+from services.text_normalizer import PAGE_BREAK, normalize_text
+
+HEADER = ["Alex Johnson", "alex@example.com | (555) 123-4567 | Seattle, WA"]
+
+PAGES = [
+    [
+        "SUMMARY",
+        "Backend engineer with eight years of experience building payment and data platforms.",
+        "",
+        "EXPERIENCE",
+        "Senior Software Engineer",
+        "Northwind Traders | Seattle, WA | Jan 2020 - Present",
+        "• Led migration of the billing service to event sourcing, cutting reconciliation time by 60%",
+        "• Designed a rate limiter shared by twelve services handling 40k requests per second",
+        "• Mentored four engineers through promotion to senior roles",
+    ],
+    [
+        "Software Engineer",
+        "Contoso Ltd | Portland, OR | Jun 2016 - Dec 2019",
+        "• Built the ingestion pipeline for partner inventory feeds in Python and Kafka",
+        "• Reduced nightly batch runtime from five hours to forty minutes",
+        "",
+        "EDUCATION",
+        "University of Washington",
+        "B.S. Computer Science | 2012 - 2016",
+    ],
+    [
+        "SKILLS",
+        "Languages: Python, Go, SQL",
+        "Infrastructure: Kafka, PostgreSQL, Kubernetes, Terraform",
+    ],
+]
+
+def _document() -> str:
+    return PAGE_BREAK.join(
+        '\n'.join(HEADER + lines + ["", f"Page {number} of {len(PAGES)}"])
+        for number, lines in enumerate(PAGES, start=1)
+    )
+
+def test_repeated_header_is_kept_once():
+    text, report = normalize_text(_document())
+
+    for line in HEADER:
+        assert text.count(line) == 1
+    assert text.startswith(HEADER[0])
+    assert "Page" not in text
+    # Two header lines on pages 2 and 3, plus three page footers
+    assert report["headerFooterLinesRemoved"] == 7
+
+def test_regex_parse_keeps_contact_details():
+    text, _ = normalize_text(_document())
+    resume = FileParserService()._parse_text_to_resume(text)
+
+    assert resume.contact.name == "Alex Johnson"
+    assert resume.contact.email == "alex@example.com"
+
+def test_completeness_signals_do_not_regress():
+    raw = _document()
+    text, _ = normalize_text(raw)
+    parser = FileParserService()
+
+    raw_report = analyze_completeness(parser._parse_text_to_resume(raw.replace(PAGE_BREAK, '\n')), raw)
+    normalized_report = analyze_completeness(parser._parse_text_to_resume(text), text)
+
+    raw_codes = {(issue.code, issue.section) for issue in raw_report.issues}
+    normalized_codes = {(issue.code, issue.section) for issue in normalized_report.issues}
+    assert normalized_codes <= raw_codes
+
+def test_completeness_still_flags_missing_sections():
+    text, _ = normalize_text(_document())
+    resume = FileParserService()._parse_text_to_resume(text)
+    truncated = resume.model_copy(update={"experience": [], "skills": []})
+
+    codes = {(issue.code, issue.section) for issue in analyze_completeness(truncated, text).issues}
+    assert ("section_missing", "experience") in codes
+    assert ("section_missing", "skills") in codes
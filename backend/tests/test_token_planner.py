@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from services.model_router import ModelRouter, RouteStats
+from services.token_planner import TokenPlanner, PlanStats
+from models.schemas import Resume, CoverLetter
+
+@pytest.fixture
+def planner():
+    router = ModelRouter(RouteStats())
+    router.task_models['parse'] = 'gpt-4'  # 8k context, escalating to gpt-4o (128k)
+    return TokenPlanner(router, PlanStats())
+
+def messages(text):
+    return [{'role': 'user', 'content': text}]
+
+def test_small_request_is_a_single_call_on_the_routed_models(planner):
+    text = 'word ' * 20
+    plan = planner.plan('parse', messages(text), Resume, source_text=text)
+    assert (plan.strategy, plan.models) == ('single', ['gpt-4', 'gpt-4o'])
+
+def test_request_too_big_for_the_small_model_keeps_the_models_it_fits(planner):
+    text = 'word ' * 3000
+    plan = planner.plan('parse', messages(text), Resume, source_text=text)
+    assert (plan.strategy, plan.models) == ('large_context', ['gpt-4o'])
+
+def test_request_too_big_for_every_routed_model_moves_to_the_large_context_model(planner):
+    plan = planner.plan('cover_letter', messages('word ' * 120000), CoverLetter)
+    assert (plan.strategy, plan.models) == ('large_context', ['gpt-4.1'])
+
+def test_output_too_big_for_any_model_is_chunked(planner):
+    text = 'word ' * 120000
+    plan = planner.plan('parse', messages(text), Resume, source_text=text)
+    assert plan.strategy == 'chunked'
+    # Each chunk's estimated output must fit the smallest output limit of the plan (gpt-4: 8192)
+    chunk = planner.chunk_tokens(plan, overhead_tokens=1000)
+    assert planner.fits('gpt-4', 1000 + chunk, planner.estimate_output('parse', chunk))
+
+def test_track_records_the_outcome(planner):
+    plan = planner.plan('parse', messages('hello'), Resume, source_text='hello')
+    with pytest.raises(RuntimeError):
+        with planner.track(plan):
+            raise RuntimeError('boom')
+    [entry] = planner.stats.snapshot()
+    assert (entry['task'], entry['strategy'], entry['successRate']) == ('parse', 'single', 0.0)
+
+def test_router_escalates_when_validation_or_quality_check_fails():
+    router = ModelRouter(RouteStats())
+    calls = []
+
+    async def call(model):
+        calls.append(model)
+        return model
+
+    def validate(output):
+        if output == 'gpt-4o-mini':
+            raise ValueError('invalid')
+        return output
+
+    assert asyncio.run(router.run('parse', call, validate=validate)) == 'gpt-4o'
+    assert calls == ['gpt-4o-mini', 'gpt-4o']
+
+    # Every output has problems: the first valid one is kept
+    assert asyncio.run(router.run('parse', call, check=lambda output: ['dropped content'])) == 'gpt-4o-mini'
+
+    def reject(output):
+        raise ValueError(output)
+
+    # Nothing valid: the last error is raised
+    with pytest.raises(ValueError, match='gpt-4o$'):
+        asyncio.run(router.run('parse', call, validate=reject))
+    successes = {(route['model'], route['successRate']) for route in router.stats.snapshot()}
+    assert ('gpt-4o-mini', 0.0) in successes
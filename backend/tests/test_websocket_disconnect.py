@@ -0,0 +1,52 @@
+import asyncio
+import importlib
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from benchmarks.fixtures import sample_resume
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('HISTORY_STORE', 'off')
+    monkeypatch.setenv('JOB_QUEUE_MODE', 'off')
+    return importlib.import_module('main')
+
+def test_abandoned_session_releases_its_slot(app, monkeypatch):
+    from api.admission import admission
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def hang(*args, **kwargs):
+        started.set()
+        try:
+            # Longer than the test allows, short enough not to hang it if cancellation breaks
+            await asyncio.sleep(3)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(app.ws_manager.ai_service, 'optimize_resume', hang)
+
+    with TestClient(app.app) as client:
+        with client.websocket_connect('/ws/optimize') as websocket:
+            websocket.send_json({
+                'type': 'optimize',
+                'resume': sample_resume(jobs=2, bullets=2).model_dump(),
+                'jobDescription': 'Backend engineer, Python and Kafka',
+            })
+            assert started.wait(5)
+            snapshot = admission.snapshot()
+            assert snapshot['sessions'] == 1 and snapshot['activeRequests'] == 1
+            dropped = time.monotonic()
+
+        # The client is gone mid-request: its AI call is cancelled and both slots free up
+        while True:
+            snapshot = admission.snapshot()
+            if snapshot['sessions'] == 0 and snapshot['activeRequests'] == 0:
+                break
+            assert time.monotonic() - dropped < 1, f"slots still held: {snapshot}"
+            time.sleep(0.01)
+        assert time.monotonic() - dropped < 1
+        assert cancelled.is_set()
@@ -0,0 +1,46 @@
+from functools import lru_cache
+from typing import Type
+from pydantic import BaseModel
+
+# Keywords OpenAI strict structured outputs does not accept
+_UNSUPPORTED_KEYWORDS = ('title', 'default')
+
+def _make_strict(node):
+    """Recursively adapt a Pydantic JSON Schema node to OpenAI strict mode"""
+    if isinstance(node, list):
+        return [_make_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    strict = {}
+    for key, value in node.items():
+        if key in ('properties', '$defs'):
+            # Maps of field/definition names, which may legitimately be called "title"
+            strict[key] = {name: _make_strict(schema) for name, schema in value.items()}
+        elif key not in _UNSUPPORTED_KEYWORDS:
+            strict[key] = _make_strict(value)
+
+    if strict.get('type') == 'object' and 'properties' in strict:
+        # Strict mode requires every property to be listed as required;
+        # optional fields are already expressed as anyOf [..., null]
+        strict['required'] = list(strict['properties'].keys())
+        strict['additionalProperties'] = False
+
+    return strict
+
+@lru_cache(maxsize=None)
+def strict_json_schema(model: Type[BaseModel]) -> dict:
+    """Compile a Pydantic model into a strict-mode JSON Schema (cached per model)"""
+    return _make_strict(model.model_json_schema())
+
+@lru_cache(maxsize=None)
+def response_format_for(model: Type[BaseModel]) -> dict:
+    """OpenAI `response_format` requesting strict structured output for a model"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": strict_json_schema(model),
+            "strict": True
+        }
+    }
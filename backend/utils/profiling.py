@@ -0,0 +1,249 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import asyncio
+import threading
+import tracemalloc
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+# Profiling is opt-in per request and only allowed when PROFILING_ENABLED is set: it turns on
+# process-wide tracemalloc and stack sampling, so any client could slow a deployed server down
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+# Profiles kept in PROFILE_DIR; the oldest are deleted beyond this
+MAX_PROFILES = int(os.getenv('MAX_PROFILES', 100))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 5)) / 1000
+
+_current_profile: ContextVar[Optional['RequestProfile']] = ContextVar('request_profile', default=None)
+_NO_STAGE = nullcontext()
+
+def profile_stage(name: str):
+    """Time a stage of the current request if it is being profiled
+
+    With profiling off this is one ContextVar lookup returning a shared
+    no-op context manager, so stages can stay in hot paths.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return _NO_STAGE
+    return profile.stage(name)
+
+def profiling_requested(flag) -> bool:
+    """Whether a request's profile flag (header, query parameter or message field) asks for profiling"""
+    if not PROFILING_ENABLED or flag is None:
+        return False
+    if isinstance(flag, str):
+        return flag.lower() in ('1', 'true', 'yes', 'on')
+    return bool(flag)
+
+class StackSampler(threading.Thread):
+    """Samples the Python stacks of all threads at a fixed interval
+
+    asyncio interleaves requests on one thread, so samples cover the whole
+    process while the profiled request runs; profile on an otherwise quiet
+    worker. Threads that are idle (event loop waiting in select, executor
+    threads waiting for work) are not sampled.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.frames = {}  # (name, file, line) -> frame index
+        self.samples = {}  # thread name -> [(stack of frame indexes, weight ms)]
+        self._stopped = threading.Event()
+
+    def run(self):
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            now = time.perf_counter()
+            weight = (now - last) * 1000
+            last = now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _is_idle(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    key = (code.co_name, code.co_filename, code.co_firstlineno)
+                    stack.append(self.frames.setdefault(key, len(self.frames)))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples.setdefault(names.get(thread_id, str(thread_id)), []).append((stack, weight))
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def speedscope(self, name: str) -> dict:
+        """The samples as a speedscope file (https://www.speedscope.app), one profile per thread"""
+        frames = [None] * len(self.frames)
+        for (function, filename, line), index in self.frames.items():
+            frames[index] = {"name": function, "file": filename, "line": line}
+        profiles = []
+        for thread, samples in self.samples.items():
+            total = sum(weight for _, weight in samples)
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": [stack for stack, _ in samples],
+                "weights": [weight for _, weight in samples],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "resume-optimizer",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.endswith('selectors.py'):
+        return True
+    if code.co_name == 'wait' and filename.endswith('threading.py'):
+        return True
+    return code.co_name == '_worker' and filename.endswith(os.path.join('concurrent', 'futures', 'thread.py'))
+
+# tracemalloc is process-wide: it runs while at least one profiled request does.
+# If something else (PYTHONTRACEMALLOC, a debugger) already traces, it is left running
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+def _start_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+def _stop_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+class RequestProfile:
+    """Per-stage timings, allocations and stack samples of one request"""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.stages = []
+        self._depth = 0
+        self._sampler = StackSampler()
+        self._started = None
+
+    @contextmanager
+    def stage(self, name: str):
+        record = {"name": name, "depth": self._depth}
+        self.stages.append(record)
+        self._depth += 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        memory = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record["startMs"] = round((wall - self._started) * 1000, 2)
+            record["wallMs"] = round((time.perf_counter() - wall) * 1000, 2)
+            # Process CPU time: includes any other work interleaved with this stage
+            record["cpuMs"] = round((time.process_time() - cpu) * 1000, 2)
+            record["allocatedKb"] = round((tracemalloc.get_traced_memory()[0] - memory) / 1024, 1)
+
+    def start(self):
+        _start_tracing()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._sampler.start()
+
+    def finish(self, error: Optional[BaseException] = None) -> dict:
+        self._sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics('lineno')[:10]
+        _stop_tracing()
+
+        summary = {
+            "id": self.id,
+            "kind": self.kind,
+            "wallMs": round((time.perf_counter() - self._started) * 1000, 2),
+            "cpuMs": round((time.process_time() - self._cpu_started) * 1000, 2),
+            "peakTracedKb": round(peak / 1024, 1),
+            "error": repr(error) if error else None,
+            "stages": self.stages,
+            "topAllocations": [{"site": str(stat.traceback), "sizeKb": round(stat.size / 1024, 1), "count": stat.count} for stat in top],
+            "samples": sum(len(samples) for samples in self._sampler.samples.values()),
+        }
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(PROFILE_DIR, f"{self.id}.json"), 'w') as f:
+            json.dump(summary, f, indent=2)
+        with open(os.path.join(PROFILE_DIR, f"{self.id}.speedscope.json"), 'w') as f:
+            json.dump(self._sampler.speedscope(f"{self.kind} {self.id}"), f)
+        _prune_profiles()
+        print(f"🔬 Profiled {self.kind} request {self.id}: {summary['wallMs']:.0f} ms wall, "
+              f"{summary['cpuMs']:.0f} ms CPU, {summary['peakTracedKb']:.0f} KB peak")
+        return summary
+
+def _prune_profiles():
+    """Delete the oldest profiles beyond MAX_PROFILES"""
+    try:
+        summaries = [entry for entry in os.scandir(PROFILE_DIR) if re.fullmatch(r'[0-9a-f]{32}\.json', entry.name)]
+    except FileNotFoundError:
+        return
+    summaries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in summaries[:max(0, len(summaries) - MAX_PROFILES)]:
+        for path in (entry.path, entry.path[:-len('.json')] + '.speedscope.json'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+@asynccontextmanager
+async def profile_request(kind: str, enabled: bool):
+    """Profile the enclosed request if `enabled`; yields the RequestProfile or None
+
+    The summary and the speedscope file are written to PROFILE_DIR under
+    the profile's ID when the request ends, even if it failed. The memory
+    snapshot and file writes run in a worker thread, off the event loop.
+    """
+    if not enabled:
+        yield None
+        return
+
+    profile = RequestProfile(kind)
+    token = _current_profile.set(profile)
+    profile.start()
+    error = None
+    try:
+        yield profile
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_profile.reset(token)
+        await asyncio.to_thread(profile.finish, error)
+
+def load_profile(profile_id: str, speedscope: bool = False) -> Optional[str]:
+    """A saved profile summary (or its speedscope file) as JSON text, or None"""
+    if not re.fullmatch(r'[0-9a-f]{32}', profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.speedscope.json" if speedscope else f"{profile_id}.json")
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,35 @@
+try:
+    import tiktoken
+except ImportError:  # Listed in requirements.txt; without it token counts are estimated
+    tiktoken = None
+
+# Characters per token assumed when no tokenizer is available. English prose
+# averages about 4 with GPT tokenizers, but JSON, code and non-English text run
+# lower, so the estimate errs high: over-counting only makes the token planner
+# chunk a little early, while under-counting could overflow a context window
+FALLBACK_CHARS_PER_TOKEN = 3
+
+_encodings = {}
+
+def _encoding(model: str):
+    """The model's tiktoken encoding, or None if tiktoken or its encoding files are unavailable"""
+    if model not in _encodings:
+        encoding = None
+        if tiktoken is not None:
+            try:
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                # Encoding files are downloaded on first use (or read from TIKTOKEN_CACHE_DIR)
+                print(f"⚠️ No tokenizer for {model} ({type(e).__name__}), estimating tokens from length")
+        _encodings[model] = encoding
+    return _encodings[model]
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens with tiktoken, or estimate them conservatively from length when it is unavailable"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + FALLBACK_CHARS_PER_TOKEN - 1) // FALLBACK_CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,27 @@
+import re
+from typing import Optional
+from pydantic import BaseModel
+
+_MESSAGE_TYPE_PATTERN = re.compile(r'\{\s*"type"\s*:\s*"(\w+)"')
+
+def encode_result(payload: BaseModel) -> str:
+    """Encode a `result` message as a text frame, serializing the payload exactly once
+
+    The payload is dumped straight to JSON by pydantic-core and spliced into
+    the message envelope, instead of the dump → json.loads → send_json
+    round trip.
+    """
+    return encode_json_result(payload.model_dump_json())
+
+def encode_json_result(data: str) -> str:
+    """Encode a `result` message around a payload that is already JSON (e.g. loaded from history)"""
+    return '{"type":"result","data":' + data + '}'
+
+def message_type(message: str) -> Optional[str]:
+    """Read the `type` of an encoded protocol message without decoding the payload
+
+    Every message the backend produces starts with its "type" key, so only
+    the first few bytes need to be looked at.
+    """
+    match = _MESSAGE_TYPE_PATTERN.match(message, 0, 64)
+    return match.group(1) if match else None
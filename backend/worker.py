@@ -0,0 +1,114 @@
+import os
+import time
+import uuid
+import asyncio
+import argparse
+import multiprocessing
+from dotenv import load_dotenv
+from api.websocket import WebSocketManager
+from services.job_queue import JobBroker, BrokerChannel, SQLiteJobBroker, JOB_LEASE_SECONDS, JOB_RETENTION_SECONDS
+
+class JobWorker:
+    """Claims parse/optimize jobs from the broker and runs them
+
+    Each job is executed by the regular WebSocketManager handlers, so the
+    progress/result/error messages it publishes follow the same protocol the
+    client would get from a direct WebSocket session. Running jobs have
+    their lease renewed every third of JOB_LEASE_SECONDS, and every worker
+    also re-queues jobs of dead workers and purges old finished jobs.
+    """
+
+    def __init__(self, broker: JobBroker, ws_manager: WebSocketManager = None, concurrency: int = 1, poll_interval: float = 0.2):
+        self.broker = broker
+        self.ws_manager = ws_manager or WebSocketManager()
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.handlers = {
+            'parse': self.ws_manager.handle_parse,
+            'optimize': self.ws_manager.handle_optimize,
+        }
+
+    async def run(self):
+        """Run `concurrency` claim loops and the maintenance loop until cancelled"""
+        await asyncio.gather(self._maintenance_loop(), *(self._claim_loop() for _ in range(self.concurrency)))
+
+    async def _maintenance_loop(self):
+        while True:
+            requeued = await asyncio.to_thread(self.broker.requeue_expired)
+            if requeued:
+                print(f"Recovered {requeued} job(s) whose worker stopped renewing its lease")
+            await asyncio.to_thread(self.broker.purge, JOB_RETENTION_SECONDS)
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+
+    async def _claim_loop(self):
+        while True:
+            job = await asyncio.to_thread(self.broker.claim, self.worker_id)
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self.run_job(job)
+
+    async def run_job(self, job):
+        channel = BrokerChannel(self.broker, job.id)
+        handler = self.handlers.get(job.kind)
+
+        if handler is None:
+            await channel.send_json({"type": "error", "message": f"Unknown job type: {job.kind}"})
+        else:
+            handler_task = asyncio.create_task(handler(channel, job.payload))
+            renewed = time.monotonic()
+            # Poll for cancellation (client disconnected) while the job runs,
+            # cancelling the handler aborts its in-flight AI request
+            while not handler_task.done():
+                await asyncio.wait({handler_task}, timeout=self.poll_interval)
+                if handler_task.done():
+                    break
+                if await asyncio.to_thread(self.broker.is_cancelled, job.id):
+                    print(f"Job {job.id} cancelled by client")
+                    handler_task.cancel()
+                elif time.monotonic() - renewed >= JOB_LEASE_SECONDS / 3:
+                    renewed = time.monotonic()
+                    if not await asyncio.to_thread(self.broker.renew, job.id, self.worker_id):
+                        print(f"Job {job.id} lease lost, dropping it")
+                        handler_task.cancel()
+            if handler_task.cancelled():
+                return
+            try:
+                await handler_task
+            except Exception as e:
+                print(f"Job {job.id} failed: {e}")
+                await channel.send_json({"type": "error", "message": str(e)})
+
+        status = 'completed' if channel.last_message_type == 'result' else 'failed'
+        await asyncio.to_thread(self.broker.finish, job.id, status)
+
+def _run_worker_process(db_path: str, concurrency: int):
+    load_dotenv()
+    worker = JobWorker(SQLiteJobBroker(db_path), concurrency=concurrency)
+    print(f"👷 Worker {worker.worker_id} started (concurrency={concurrency})")
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run job-queue worker processes")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("JOB_WORKERS", 2)))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("JOB_WORKER_CONCURRENCY", 4)))
+    parser.add_argument("--db", default=os.getenv("JOB_QUEUE_DB", "jobs.db"))
+    args = parser.parse_args()
+
+    # Create the schema once before the workers race to do it
+    SQLiteJobBroker(args.db)
+
+    processes = [
+        multiprocessing.Process(target=_run_worker_process, args=(args.db, args.concurrency))
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
@@ -28,6 +28,8 @@ export default function ChangesSummary({ changes, matchScore, potentialScore }:
         return 'text-green-400 bg-green-500/10 border-green-500/30';
       case 'modified':
         return 'text-blue-400 bg-blue-500/10 border-blue-500/30';
+      case 'removed':
+        return 'text-red-400 bg-red-500/10 border-red-500/30';
       default:
         return 'text-violet-400 bg-violet-500/10 border-violet-500/30';
     }
@@ -151,6 +153,16 @@ export default function ChangesSummary({ changes, matchScore, potentialScore }:
                   <p className="text-sm text-slate-400">
                     {change.description}
                   </p>
+                  {(change.before || change.after) && (
+                    <div className="text-xs mt-2 space-y-1">
+                      {change.before && (
+                        <p className="text-red-400/80 line-through">{change.before}</p>
+                      )}
+                      {change.after && (
+                        <p className="text-green-400/80">{change.after}</p>
+                      )}
+                    </div>
+                  )}
                   {change.confidence === 'inferred' && (
                     <p className="text-xs text-yellow-400/70 mt-1">
                       ℹ️ This was inferred from your actual work - please verify accuracy
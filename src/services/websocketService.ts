@@ -13,6 +13,10 @@ interface ParseResultUpdate {
     resume: Resume;
     extractedText: string;
     warnings: string[];
+    completeness?: {
+      coverage: Record<string, number>;
+      issues: { code: string; section: string; message: string; coverage?: number }[];
+    };
   };
 }
 
@@ -22,6 +26,7 @@ interface OptimizeResultUpdate {
     optimizedResume: OptimizedResume;
     coverLetter: CoverLetter;
     jobKeywords: string[];
+    coverLetterVariants?: { tone: string; coverLetter: CoverLetter }[];
   };
 }
 
@@ -30,7 +35,27 @@ interface ErrorUpdate {
   message: string;
 }
 
-type WebSocketMessage = ProgressUpdate | ParseResultUpdate | OptimizeResultUpdate | ErrorUpdate;
+// Server is at capacity; retry after `retryAfter` seconds
+interface BusyUpdate {
+  type: 'busy';
+  message: string;
+  retryAfter: number;
+}
+
+// Identifies this browser to the server-side history, so returning visits
+// can load earlier parse and optimization results
+const SESSION_STORAGE_KEY = 'resumeOptimizerSessionId';
+
+export const getSessionId = (): string => {
+  let sessionId = localStorage.getItem(SESSION_STORAGE_KEY);
+  if (!sessionId) {
+    sessionId = crypto.randomUUID();
+    localStorage.setItem(SESSION_STORAGE_KEY, sessionId);
+  }
+  return sessionId;
+};
+
+type WebSocketMessage = ProgressUpdate | ParseResultUpdate | OptimizeResultUpdate | ErrorUpdate | BusyUpdate;
 
 export class WebSocketService {
   private ws: WebSocket | null = null;
@@ -91,7 +116,8 @@ export class WebSocketService {
       type: 'parse',
       fileContent,
       fileType: file.type,
-      fileName: file.name
+      fileName: file.name,
+      sessionId: getSessionId()
     }));
   }
 
@@ -105,7 +131,8 @@ export class WebSocketService {
       resume,
       jobDescription,
       jobTitle: jobTitle || 'the position',
-      company: company || 'your company'
+      company: company || 'your company',
+      sessionId: getSessionId()
     }));
   }
 
@@ -58,13 +58,16 @@ export interface OptimizedResume extends Resume {
   matchedKeywords: string[];
   skillGaps?: SkillGap[];
   potentialScore?: number;
+  jobHash?: string;
 }
 
 export interface ResumeChange {
   section: string;
-  type: 'added' | 'modified' | 'reordered';
+  type: 'added' | 'modified' | 'reordered' | 'removed';
   description: string;
   confidence?: 'verified' | 'inferred' | 'suggested';
+  before?: string;
+  after?: string;
 }
 
 export interface SkillGap {